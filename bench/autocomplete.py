@@ -0,0 +1,78 @@
+# bench/autocomplete.py
+# Language autocomplete per keystroke: the old linear scan (label() per language) vs LanguageIndex.
+#   python -m bench.autocomplete [--languages 250] [--repeat 200]
+import argparse, random, string, time
+
+from discord import app_commands
+
+from utils.language_data import SUPPORTED_LANGUAGES, LanguageIndex
+
+def old_label(langs, code):
+    lang = next((x for x in langs if x["code"] == code), None)
+    if not lang:
+        return f"🏳️ {code} — Unknown"
+    return f'{lang["flag"]} {lang["name"]} ({lang["code"]})'
+
+def old_ac_lang(langs, current):
+    cur = (current or "").lower()
+    choices = []
+    for l in langs:
+        disp = old_label(langs, l["code"])
+        if cur in l["code"] or cur in l["name"].lower() or cur in disp.lower():
+            choices.append(app_commands.Choice(name=disp, value=l["code"]))
+        if len(choices) >= 25:
+            break
+    return choices
+
+def languages(n: int, rng: random.Random):
+    langs = list(SUPPORTED_LANGUAGES)
+    seen = {l["code"] for l in langs}
+    while len(langs) < n:
+        code = "".join(rng.choices(string.ascii_lowercase, k=3))
+        if code in seen:
+            continue
+        seen.add(code)
+        name = "".join(rng.choices("aeioulmnrstkgdh", k=rng.randint(5, 10))).capitalize()
+        langs.append({"code": code, "name": name, "flag": "🏳️"})
+    return langs
+
+def keystrokes(langs, rng: random.Random, n: int):
+    """Prefixes of real names as typed, a few with a typo."""
+    out = []
+    while len(out) < n:
+        name = rng.choice(langs)["name"]
+        for i in range(1, len(name) + 1):
+            out.append(name[:i])
+        if len(name) > 4:
+            j = rng.randrange(1, len(name) - 2)
+            out.append(name[:j] + name[j + 1] + name[j] + name[j + 2:])
+    return out[:n]
+
+def per_call_us(fn, queries) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / len(queries) * 1e6
+
+def main(n_langs: int, repeat: int):
+    rng = random.Random(7)
+    for n in (len(SUPPORTED_LANGUAGES), n_langs):
+        langs = languages(n, rng)
+        queries = keystrokes(langs, rng, repeat)
+        t0 = time.perf_counter()
+        index = LanguageIndex(langs)
+        build_ms = (time.perf_counter() - t0) * 1000
+        old = per_call_us(lambda q: old_ac_lang(langs, q), queries)
+        cold = per_call_us(index.search, queries)          # first pass (only repeats within it are cached)
+        warm = per_call_us(index.search, queries)          # repeated keystrokes (cached)
+        label_old = per_call_us(lambda c: old_label(langs, c), [l["code"] for l in langs])
+        label_new = per_call_us(index.label, [l["code"] for l in langs])
+        print(f"{n:>4} languages  build {build_ms:.1f} ms  autocomplete: old {old:8.1f} µs  "
+              f"index {cold:6.1f} µs (cached {warm:4.1f} µs)  label(): old {label_old:5.2f} µs  new {label_new:5.2f} µs")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--languages", type=int, default=250)
+    ap.add_argument("--repeat", type=int, default=2000)
+    args = ap.parse_args()
+    main(args.languages, args.repeat)
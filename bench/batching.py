@@ -0,0 +1,55 @@
+# bench/batching.py
+# Throughput and cost of micro-batching short chat lines against the local fake model.
+#   python -m bench.batching [--n 400] [--rate 200] [--latency 0.3] [--window 15] [--items 16]
+import argparse, asyncio, random, time
+
+from bench.fake_openai import FakeOpenAI
+from utils.translator import TranslationEngine
+from utils.batcher import TranslationBatcher
+
+LINES = [
+    "hey everyone, raid starts in 10 minutes", "gg wp", "who wants to queue?", "brb coffee",
+    "can someone explain the new patch notes?", "lol that was close", "good morning from Berlin!",
+    "does anyone have the link to the rules channel?", "thanks for the help earlier",
+]
+
+async def run(base_url: str, n: int, rate: float, window: int, items: int, concurrency: int):
+    engine = TranslationEngine(api_key="bench", base_url=base_url, concurrency=concurrency)
+    batcher = TranslationBatcher(engine, window_ms=window, max_items=items)
+    rnd = random.Random(7)
+
+    async def one(i):
+        t0 = time.perf_counter()
+        await batcher.translate(f"{LINES[i % len(LINES)]} #{i}", rnd.choice(["de", "fr", "es"]))
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tasks = []
+    for i in range(n):
+        tasks.append(asyncio.create_task(one(i)))
+        await asyncio.sleep(rnd.expovariate(rate))
+    lat = sorted(await asyncio.gather(*tasks))
+    wall = time.perf_counter() - t0
+    await engine.close()
+    return wall, lat, engine.calls, batcher.stats()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=400)
+    ap.add_argument("--rate", type=float, default=200.0, help="arrivals per second")
+    ap.add_argument("--latency", type=float, default=0.3)
+    ap.add_argument("--window", type=int, default=15)
+    ap.add_argument("--items", type=int, default=16)
+    ap.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+
+    for name, window in (("single", 0), ("batched", args.window)):
+        with FakeOpenAI(latency=args.latency) as fake:
+            wall, lat, calls, stats = asyncio.run(
+                run(fake.base_url, args.n, args.rate, window, args.items, args.concurrency))
+            p50, p99 = lat[len(lat) // 2], lat[min(len(lat) - 1, int(len(lat) * 0.99))]
+            print(f"{name:<8} {args.n / wall:7.1f} msg/s | p50 {p50 * 1000:6.0f} ms p99 {p99 * 1000:6.0f} ms | "
+                  f"model calls {calls:4d} | prompt chars {fake.prompt_chars:7d} | {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# bench/database.py
+# Database helpers on the hot paths: a fresh connection per call (the old _connect pattern) vs the pool.
+#   python -m bench.database [--ops 3000] [--concurrency 1,32]
+# One "op" is what Translate.on_message + Events.on_message cost per message: the XP write and the
+# channel / emote / speculation reads.
+import argparse, asyncio, os, tempfile, time
+
+import aiosqlite
+
+async def _old_conn(path):
+    db = await aiosqlite.connect(path)
+    await db.execute("PRAGMA journal_mode=WAL;")
+    await db.execute("PRAGMA synchronous=NORMAL;")
+    await db.execute("PRAGMA foreign_keys=ON;")
+    return db
+
+async def old_message(path, gid, uid):
+    db = await _old_conn(path)
+    try:
+        await db.execute("INSERT OR IGNORE INTO xp(guild_id, user_id) VALUES(?, ?)", (gid, uid))
+        await db.execute("UPDATE xp SET xp = xp + ?, messages = messages + 1 WHERE guild_id = ? AND user_id = ?",
+                         (5, gid, uid))
+        await db.commit()
+    finally:
+        await db.close()
+    for sql in ("SELECT channel_id FROM translate_channels WHERE guild_id = ?",
+                "SELECT bot_emote FROM guild_meta WHERE guild_id = ?",
+                "SELECT speculate FROM guild_meta WHERE guild_id = ?"):
+        db = await _old_conn(path)
+        try:
+            cur = await db.execute(sql, (gid,))
+            await cur.fetchall()
+            await cur.close()
+        finally:
+            await db.close()
+
+async def new_message(_path, gid, uid):
+    from utils import database
+    await database.add_message_xp(gid, uid, 5)
+    await database.get_translation_channels(gid)
+    await database.get_bot_emote(gid)
+    await database.get_speculation(gid)
+
+async def drive(fn, path, ops: int, concurrency: int):
+    """(ops per second, errors)"""
+    errors = 0
+    queue = iter(range(ops))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            try:
+                await fn(path, i % 5, i % 500)
+            except Exception:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ops / (time.perf_counter() - t0), errors
+
+async def main(ops: int, levels):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BOT_DB_PATH"] = path = os.path.join(tmp, "bench.db")
+        from utils import database
+        await database.ensure_schema()
+        for gid in range(5):
+            await database.allow_translation_channel(gid, 100 + gid)
+            await database.set_bot_emote(gid, "🔃")
+        for c in levels:
+            old, old_err = await drive(old_message, path, ops, c)
+            new, new_err = await drive(new_message, path, ops, c)
+            print(f"concurrency {c:>3}: per call {old:7.0f} ops/s ({old_err} errors)   "
+                  f"pool {new:7.0f} ops/s ({new_err} errors)   x{new / old:.1f}")
+        print("pool:", database.stats())
+        await database.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", type=int, default=3000)
+    ap.add_argument("--concurrency", default="1,32")
+    args = ap.parse_args()
+    asyncio.run(main(args.ops, [int(c) for c in args.concurrency.split(",")]))
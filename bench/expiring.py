@@ -0,0 +1,87 @@
+# bench/expiring.py
+# Reaction dedup keys: set + one sleeping task per key (old) vs. utils.expiring.ExpiringSet.
+#   python -m bench.expiring [--keys 100000]
+import argparse, asyncio, gc, time, tracemalloc
+
+from utils.expiring import ExpiringSet
+
+TTL = 300
+
+async def tick_lag(samples: int = 50) -> float:
+    """Median extra delay of a 1 ms sleep — how busy the loop's scheduler is."""
+    lags = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - t0 - 0.001)
+    return sorted(lags)[len(lags) // 2] * 1000
+
+async def sleepers(n: int, trace: bool):
+    sent = set()
+
+    async def _clear(key, delay=TTL):
+        await asyncio.sleep(delay)
+        sent.discard(key)
+
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    tasks = []
+    for i in range(n):
+        key = (i, i)
+        sent.add(key)
+        tasks.append(asyncio.create_task(_clear(key)))
+    await asyncio.sleep(0)   # let every task reach its sleep
+    insert = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0] if trace else 0
+    tracemalloc.stop()
+    lag = await tick_lag()
+    t0 = time.perf_counter()
+    hits = sum((i, i) in sent for i in range(n))
+    lookup = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    teardown = time.perf_counter() - t0
+    return insert, mem, lag, lookup, hits, teardown, "cancel all tasks"
+
+async def expiring(n: int, trace: bool):
+    now = [0.0]
+    sent = ExpiringSet(TTL, max_items=n * 2, clock=lambda: now[0])
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    for i in range(n):
+        sent.add((i, i))
+    insert = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0] if trace else 0
+    tracemalloc.stop()
+    lag = await tick_lag()
+    t0 = time.perf_counter()
+    hits = sum((i, i) in sent for i in range(n))
+    lookup = time.perf_counter() - t0
+    now[0] = TTL + 1
+    t0 = time.perf_counter()
+    sent.add(("late", 0))    # one write expires the whole batch
+    teardown = time.perf_counter() - t0
+    assert len(sent) == 1
+    return insert, mem, lag, lookup, hits, teardown, "expire all keys"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--keys", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.keys
+    print(f"{n} dedup keys, TTL {TTL}s")
+    for name, fn in (("set + sleeper tasks", sleepers), ("ExpiringSet", expiring)):
+        mem = asyncio.run(fn(n, True))[1]           # tracemalloc slows everything down:
+        insert, _, lag, lookup, hits, teardown, what = asyncio.run(fn(n, False))   # time a clean run
+        print(f"  {name:<20} insert {insert * 1e9 / n:7.0f} ns/key   memory {mem / n:6.0f} B/key "
+              f"({mem / 2**20:5.1f} MiB)   lookup {lookup * 1e9 / n:4.0f} ns   loop tick lag {lag:.3f} ms   "
+              f"{what} {teardown * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# bench/fake_openai.py
+# Minimal chat-completions server for offline benchmarks. Runs in its own thread + loop.
+#   python -m bench.fake_openai [--port 8089] [--latency 0.3]   then OPENAI_BASE_URL=http://127.0.0.1:8089/v1
+import argparse, json, time, random, asyncio, threading
+from aiohttp import web
+
+from utils.backends import local_reply
+
+class FakeOpenAI:
+    """
+    Answers POST /v1/chat/completions after `latency` seconds with a JSON translation reply
+    (single-text, multi-segment or multi-target prompts), or streams it word by word as SSE
+    when the request sets "stream": true.
+    Fault injection: `error_rate` of requests fail with `error_status` (plus a Retry-After header when
+    `retry_after` is set), `slow_rate` of them take `slow_latency` instead, and outage(seconds) fails
+    every request for a while. All knobs can be changed while the server runs.
+    Usage:
+        with FakeOpenAI(latency=0.5) as fake:
+            engine = TranslationEngine(api_key="x", base_url=fake.base_url)
+    """
+    def __init__(self, latency: float = 0.5, token_delay: float = 0.02, host: str = "127.0.0.1", port: int = 0,
+                 error_rate: float = 0.0, error_status: int = 503, retry_after: float = None,
+                 slow_rate: float = 0.0, slow_latency: float = 2.0, seed: int = 1):
+        self.latency = latency          # time to first byte
+        self.token_delay = token_delay  # gap between streamed words
+        self.host, self.port = host, port
+        self.error_rate, self.error_status, self.retry_after = error_rate, error_status, retry_after
+        self.slow_rate, self.slow_latency = slow_rate, slow_latency
+        self.rng = random.Random(seed)
+        self.down_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.prompt_chars = 0
+        self._loop = None
+        self._runner = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def reply_for(self, messages: list) -> str:
+        return local_reply(messages[-1]["content"])
+
+    async def _stream(self, request: web.Request, body: dict):
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        words = self.reply_for(body.get("messages", [])).split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": f"fake-{self.requests}", "object": "chat.completion.chunk", "created": 0,
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": None,
+                             "delta": {"content": word if i == 0 else " " + word}}],
+            }
+            await resp.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(self.token_delay)
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+    def outage(self, seconds: float):
+        """Fail every request for the next `seconds` (thread-safe enough: a float store)."""
+        self.down_until = time.monotonic() + seconds
+
+    def _error(self):
+        self.errors += 1
+        headers = {"retry-after": f"{self.retry_after:g}"} if self.retry_after is not None else None
+        return web.json_response(
+            {"error": {"message": "injected fault", "type": "server_error", "code": None}},
+            status=self.error_status, headers=headers,
+        )
+
+    async def _chat(self, request: web.Request):
+        body = await request.json()
+        self.requests += 1
+        self.prompt_chars += sum(len(m.get("content") or "") for m in body.get("messages", []))
+        if time.monotonic() < self.down_until or self.rng.random() < self.error_rate:
+            await asyncio.sleep(self.latency / 10)
+            return self._error()
+        await asyncio.sleep(self.slow_latency if self.rng.random() < self.slow_rate else self.latency)
+        if body.get("stream"):
+            return await self._stream(request, body)
+        content = self.reply_for(body.get("messages", []))
+        # a non-streamed reply still takes the model's generation time
+        await asyncio.sleep(self.token_delay * len(content.split()))
+        return web.json_response({
+            "id": f"fake-{self.requests}", "object": "chat.completion", "created": 0,
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start())
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=float, default=0.3)
+    ap.add_argument("--token-delay", type=float, default=0.02)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    args = ap.parse_args()
+    with FakeOpenAI(latency=args.latency, token_delay=args.token_delay, port=args.port,
+                    error_rate=args.error_rate) as fake:
+        print(f"fake chat-completions server on {fake.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
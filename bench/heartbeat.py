@@ -0,0 +1,65 @@
+# bench/heartbeat.py
+# Event-loop responsiveness while N translations are in flight.
+#   python -m bench.heartbeat [--n 50] [--latency 0.5]
+# A ticker stands in for the gateway heartbeat; we report how late its ticks fire.
+import argparse, asyncio, time, statistics
+
+from bench.fake_openai import FakeOpenAI
+from utils.translator import TranslationEngine
+
+TICK = 0.05
+
+async def ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append((time.perf_counter() - t0 - TICK) * 1000)
+
+def report(name: str, lags: list, elapsed: float):
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(f"{name:<10} wall {elapsed:6.2f}s | tick lag ms: median {statistics.median(lags):7.1f} "
+          f"p99 {p99:7.1f} max {lags[-1]:7.1f}")
+
+async def run_async(base_url: str, n: int):
+    engine = TranslationEngine(api_key="bench", base_url=base_url, concurrency=n)
+    await engine.translate("warm-up", "de")
+    stop, lags = asyncio.Event(), []
+    t = asyncio.create_task(ticker(stop, lags))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(engine.translate(f"hello {i}", "de") for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    stop.set(); await t
+    await engine.close()
+    report("async", lags, elapsed)
+
+async def run_blocking(base_url: str, n: int):
+    # the old code path: sync client called inside a coroutine
+    from openai import OpenAI
+    client = OpenAI(api_key="bench", base_url=base_url)
+
+    async def one(i):
+        client.chat.completions.create(model="fake", messages=[{"role": "user", "content": f"Text:\nhello {i}"}])
+
+    stop, lags = asyncio.Event(), []
+    t = asyncio.create_task(ticker(stop, lags))
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    stop.set(); await t
+    report("blocking", lags, elapsed)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50)
+    ap.add_argument("--latency", type=float, default=0.2)
+    ap.add_argument("--skip-blocking", action="store_true")
+    args = ap.parse_args()
+    with FakeOpenAI(latency=args.latency) as fake:
+        asyncio.run(run_async(fake.base_url, args.n))
+        if not args.skip_blocking:
+            asyncio.run(run_blocking(fake.base_url, args.n))
+
+if __name__ == "__main__":
+    main()
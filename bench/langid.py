@@ -0,0 +1,57 @@
+# bench/langid.py
+# Speed and accuracy of utils.langdetect on the bundled sample corpus; exits non-zero on any confident mistake.
+#   python -m bench.langid [--rounds 200]
+import argparse, os, time
+from collections import Counter
+
+from utils.langdetect import detect
+
+CORPUS = os.path.join(os.path.dirname(__file__), "langid_corpus.tsv")
+
+def load():
+    rows = []
+    with open(CORPUS, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            code, text = line.rstrip("\n").split("\t", 1)
+            rows.append((code, text))
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+    rows = load()
+
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for _code, text in rows:
+            detect(text)
+    us = (time.perf_counter() - t0) / (args.rounds * len(rows)) * 1e6
+
+    right = confident = confident_right = 0
+    misses = Counter()
+    wrong = []   # confident and wrong: the bot would skip the model or mislabel the message
+    for code, text in rows:
+        g = detect(text)
+        right += g.lang == code
+        if g.confident:
+            confident += 1
+            confident_right += g.lang == code
+            if g.lang != code:
+                wrong.append(f"{code}->{g.lang}: {text}")
+        if g.lang != code:
+            misses[f"{code}->{g.lang}"] += 1
+
+    print(f"messages          {len(rows)}")
+    print(f"speed             {us:.1f} µs/message")
+    print(f"top-1 accuracy    {right / len(rows):.1%}")
+    print(f"confident         {confident / len(rows):.1%} of messages, precision {confident_right / max(1, confident):.1%}")
+    if misses:
+        print("confusions       ", ", ".join(f"{k} ×{v}" for k, v in misses.most_common()))
+    if wrong:
+        raise SystemExit("confident mistakes:\n  " + "\n  ".join(wrong))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench/leaderboard.py
+# /leaderboard queries on a synthetic xp table: no index + OFFSET (the old query), idx_xp_rank + OFFSET,
+# idx_xp_rank + keyset (database.get_xp_leaderboard).
+#   python -m bench.leaderboard [--rows 1000000] [--guilds 4] [--page 10] [--repeat 20]
+# Most rows go to one guild (rows / 2), the page timings are for that guild.
+import argparse, asyncio, os, random, sqlite3, statistics, tempfile, time
+
+OLD = """SELECT user_id, xp, messages, translations, voice_seconds FROM xp WHERE guild_id = ?
+          ORDER BY xp DESC, messages DESC LIMIT ? OFFSET ?"""
+OFFSET = """SELECT user_id, xp, messages, translations, voice_seconds FROM xp WHERE guild_id = ?
+             ORDER BY xp DESC, messages DESC, user_id LIMIT ? OFFSET ?"""
+
+def populate(path: str, rows: int, guilds: int, seed: int):
+    rng = random.Random(seed)
+    big = rows // 2
+    con = sqlite3.connect(path)
+    con.execute("""CREATE TABLE xp(guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, xp INTEGER NOT NULL DEFAULT 0,
+                   messages INTEGER NOT NULL DEFAULT 0, translations INTEGER NOT NULL DEFAULT 0,
+                   voice_seconds INTEGER NOT NULL DEFAULT 0, PRIMARY KEY(guild_id, user_id))""")
+
+    def gen():
+        for i in range(rows):
+            gid = 0 if i < big else 1 + i % max(1, guilds - 1)
+            msgs = int(rng.paretovariate(1.2) * 3)   # a few very active users, a long tail
+            yield gid, i, msgs * 5 + rng.randrange(50), msgs, msgs // 10, rng.randrange(3600)
+    con.executemany("INSERT INTO xp VALUES(?, ?, ?, ?, ?, ?)", gen())
+    con.commit()
+    con.close()
+    return big
+
+def timed_ms(fn, repeat: int) -> float:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(out)
+
+def plan(con, sql, params) -> str:
+    return "; ".join(r[-1] for r in con.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        t0 = time.perf_counter()
+        big = populate(path, args.rows, args.guilds, args.seed)
+        print(f"{args.rows:,} rows ({big:,} in the largest guild) built in {time.perf_counter() - t0:.1f} s")
+        depths = [0, 100, big // args.page // 2, big // args.page - 1]
+
+        con = sqlite3.connect(path)
+        old = {d: timed_ms(lambda: con.execute(OLD, (0, args.page, d * args.page)).fetchall(), args.repeat)
+               for d in depths}
+        print("plan without index:", plan(con, OLD, (0, args.page, 0)))
+        con.close()
+
+        os.environ["BOT_DB_PATH"] = path
+        from utils import database
+        t0 = time.perf_counter()
+        await database.ensure_schema()   # the migration builds idx_xp_rank
+        print(f"migration (CREATE INDEX idx_xp_rank) {time.perf_counter() - t0:.1f} s")
+
+        con = sqlite3.connect(path)
+        print("plan with index:   ", plan(con, OFFSET, (0, args.page, 0)))
+        offset = {d: timed_ms(lambda: con.execute(OFFSET, (0, args.page, d * args.page)).fetchall(), args.repeat)
+                  for d in depths}
+        # keyset cursors for each depth: the last row of the page before it
+        cursors = {0: None}
+        for d in depths[1:]:
+            uid, xp, msgs = con.execute(OFFSET, (0, 1, d * args.page - 1)).fetchone()[:3]
+            cursors[d] = (xp, msgs, uid)
+        con.close()
+
+        keyset = {}
+        for d in depths:
+            out = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                page = await database.get_xp_leaderboard(0, limit=args.page, after=cursors[d])
+                out.append((time.perf_counter() - t0) * 1000)
+            keyset[d] = statistics.median(out)
+            # same rows as the OFFSET query
+            assert [tuple(r) for r in page] == [tuple(r) for r in sqlite3.connect(path).execute(
+                OFFSET, (0, args.page, d * args.page)).fetchall()]
+        await database.close()
+
+        print(f"median ms per page of {args.page} ({args.repeat} runs; keyset goes through the async pool)")
+        print(f"  {'page':>8}  {'no index+OFFSET':>16}  {'index+OFFSET':>13}  {'index+keyset':>13}")
+        for d in depths:
+            print(f"  {d + 1:>8}  {old[d]:>16.2f}  {offset[d]:>13.2f}  {keyset[d]:>13.2f}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--guilds", type=int, default=4)
+    ap.add_argument("--page", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,57 @@
+# bench/masking.py
+# Tokens kept away from the model by utils.masking on a sample of typical Discord messages.
+#   python -m bench.masking [--rounds 2000]
+import argparse, time
+
+from utils.masking import mask, unmask, only_protected
+from utils.translator import estimate_tokens
+
+CSV = "\n".join(f"{i},{i * 37 % 1000},{i * 1.5:.2f},2024-05-{i % 28 + 1:02d}" for i in range(1, 41))
+
+CORPUS = [
+    "hey <@482913746518237184> did you see the patch notes? https://store.steampowered.com/news/app/570/view/4178682918473",
+    "Guten Morgen zusammen <:wave:912345678901234567> <:coffee:912345678901234568>",
+    "<@482913746518237184> <@&771122334455667788>",
+    "<:kekw:812345678901234567><:kekw:812345678901234567><:kekw:812345678901234567>",
+    "No sé por qué falla esto:\n```python\nfor i in range(10):\n    print(items[i].name)\n```\n¿Alguien me ayuda?",
+    "Try `pip install -U discord.py` and restart the bot, it fixed it for me.",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "La réunion commence <t:1718035200:R>, lien ici : https://meet.google.com/abc-defg-hij",
+    "Les résultats de la semaine :\n" + CSV + "\nMerci à tous !",
+    CSV,
+    "Check </rank:1087654321098765432> to see your level, and read <#771122334455667701> first.",
+    "今日のイベントはこちら https://example.jp/events/2024/summer?ref=discord&utm_source=bot",
+    "Ich habe den Fehler gefunden:\n```\nTraceback (most recent call last):\n  File \"bot.py\", line 42, in on_message\n    await channel.send(msg)\ndiscord.errors.Forbidden: 403 Forbidden (error code: 50013): Missing Permissions\n```",
+    "ok 👍",
+    "Can someone translate this for me please, I don't understand what they are saying in general chat.",
+    "Привет всем! Сегодня в 20:00 турнир, регистрация: https://forms.gle/x8Yk2LmNpQr7StUv9",
+]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=2000)
+    args = ap.parse_args()
+
+    before = after = skipped = 0
+    for text in CORPUS:
+        masked, spans = mask(text)
+        assert unmask(masked, spans) == (text, 0)
+        before += estimate_tokens(text)
+        if spans and only_protected(masked):
+            skipped += 1
+            continue
+        after += estimate_tokens(masked)
+
+    t0 = time.perf_counter()
+    for _ in range(args.rounds):
+        for text in CORPUS:
+            mask(text)
+    us = (time.perf_counter() - t0) / (args.rounds * len(CORPUS)) * 1e6
+
+    print(f"messages          {len(CORPUS)}")
+    print(f"est. tokens       {before} → {after} sent to the model ({1 - after / before:.1%} saved)")
+    print(f"model skipped     {skipped} messages are protected content only")
+    print(f"mask cost         {us:.1f} µs/message")
+
+if __name__ == "__main__":
+    main()
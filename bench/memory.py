@@ -0,0 +1,107 @@
+# bench/memory.py
+# Sentence-level translation memory vs. a whole-text cache on a synthetic guild chat stream.
+#   python -m bench.memory [--messages 5000] [--seed 7]
+import argparse, random, time
+
+from utils.segment import split_sentences
+from utils.translation_memory import TranslationMemory
+from utils.translator import estimate_tokens
+
+RULES = [
+    "Please read the rules in <#{ch}> before posting.",
+    "No spam, no self-promotion and no NSFW content.",
+    "Be respectful to everyone, including the moderators.",
+    "Use English in the general channel, other languages go to <#{ch2}>.",
+]
+GREETINGS = [
+    "Welcome to the server, <@{u}>!",
+    "Hey <@{u}>, glad you made it.",
+    "Good morning everyone!",
+]
+EVENTS = [
+    "The tournament starts at {h}:00 UTC.",
+    "Sign-ups close in {n} hours, don't miss it.",
+    "Prize pool this week is {n}0 dollars.",
+]
+WORDS = ("game stream match team build patch update map rank queue friend voice server bot "
+         "tonight tomorrow really maybe think want play need know").split()
+
+def typo(s: str, rng: random.Random) -> str:
+    words = s.split(" ")
+    i = rng.randrange(len(words))
+    w = words[i]
+    if len(w) >= 5 and w.isalpha():
+        j = rng.randrange(1, len(w) - 1)
+        words[i] = w[:j] + w[j + 1] + w[j] + w[j + 2:]
+    return " ".join(words)
+
+def chatter(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))).capitalize() + rng.choice(".!?")
+
+def message(rng: random.Random) -> str:
+    fill = dict(ch=rng.choice([101, 102]), ch2=103, u=rng.randrange(10**17, 10**18),
+                h=rng.randrange(10, 23), n=rng.randrange(2, 9))
+    kind = rng.random()
+    if kind < 0.15:
+        sents = [r.format(**fill) for r in rng.sample(RULES, rng.randint(2, 4))]
+    elif kind < 0.35:
+        sents = [rng.choice(GREETINGS).format(**fill)] + [chatter(rng) for _ in range(rng.randint(0, 1))]
+    elif kind < 0.5:
+        sents = [e.format(**fill) for e in rng.sample(EVENTS, rng.randint(1, 2))] + [chatter(rng)]
+    else:
+        sents = [chatter(rng) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.1:
+        sents[0] = typo(sents[0], rng)
+    return " ".join(sents)
+
+def fake_translate(text: str) -> str:
+    """Stands in for the model: keeps the sentence structure, like real translations mostly do."""
+    return "".join(f"[de] {s}" + sep for s, sep in split_sentences(text))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+    stream = [message(rng) for _ in range(args.messages)]
+
+    whole, whole_hits, whole_saved = set(), 0, 0
+    tm = TranslationMemory()
+    total = sent_tokens = 0
+    t_tm = 0.0
+    for text in stream:
+        tokens = estimate_tokens(text)
+        total += tokens
+
+        key = " ".join(text.split()).casefold()
+        if key in whole:
+            whole_hits += 1
+            whole_saved += tokens
+        whole.add(key)
+
+        t0 = time.perf_counter()
+        segments, hits = tm.match(text, "de")
+        t_tm += time.perf_counter() - t0
+        if all(h is not None for h in hits):
+            continue
+        if not any(h is not None for h in hits):
+            sent_tokens += tokens
+            tm.learn(text, "de", fake_translate(text), "en")
+            continue
+        # only the uncovered sentences go to the model
+        for (s, _sep), h in zip(segments, hits):
+            if h is None:
+                sent_tokens += estimate_tokens(s)
+                tm.learn(s, "de", fake_translate(s), "en")
+
+    st = tm.stats()
+    print(f"messages            {len(stream)}  ({total} est. source tokens)")
+    print(f"whole-text cache    {whole_hits / len(stream):.1%} hits, {whole_saved / total:.1%} tokens saved")
+    print(f"translation memory  {st['hit_ratio']:.1%} of sentences covered "
+          f"(exact {st['exact']}, template {st['template']}, fuzzy {st['fuzzy']}, passthrough {st['passthrough']})")
+    print(f"                    {1 - sent_tokens / total:.1%} tokens saved, {st['entries']} sentences stored")
+    print(f"lookup cost         {t_tm / len(stream) * 1e6:.0f} µs/message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench/pipeline.py
+# The whole translation pipeline (masking, caches, memory, single-flight, batching, engine) fully offline.
+#   python -m bench.pipeline [--messages 2000] [--rate 100] [--targets de,fr,es] [--concurrency 32]
+#                            [--latency-ms 300] [--error-pct 0]
+import argparse, asyncio, os, random, time
+
+async def run(args):
+    # utils.config reads the environment once, so everything bot-side is imported after this
+    os.environ.update({
+        "TRANSLATE_BACKEND": "local", "L2_CACHE": "0",
+        "TRANSLATE_CONCURRENCY": str(args.concurrency), "LOCAL_LATENCY_MS": str(args.latency_ms),
+        "LOCAL_TOKEN_MS": "2", "LOCAL_ERROR_PCT": str(args.error_pct),
+    })
+    import cogs.translate as tr
+    from bench.memory import message
+    from utils.metrics import LatencyHistogram
+
+    cog = tr.Translate(bot=None)
+    rng = random.Random(args.seed)
+    stream = [message(rng) for _ in range(args.messages)]
+    targets = args.targets.split(",")
+    hist = LatencyHistogram()
+    failed = 0
+
+    async def one(text, target):
+        nonlocal failed
+        t0 = time.perf_counter()
+        try:
+            await cog.translate_long(text, target)
+        except Exception:
+            failed += 1
+            return
+        hist.record(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    tasks = []
+    for text in stream:
+        tasks.append(asyncio.create_task(one(text, rng.choice(targets))))
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - t0
+
+    h = hist.stats()
+    st = cog.engine.stats()
+    print(f"requests        {len(stream)} in {wall:.1f}s ({len(stream) / wall:.0f}/s), failed {failed}")
+    print(f"latency         p50 {h['p50_ms']} ms, p99 {h['p99_ms']} ms")
+    print(f"model calls     {st['requests']} ({st['requests'] / len(stream):.2f} per request), "
+          f"retried {st['retried']}")
+    print(f"tokens          prompt {st['prompt_tokens']}, completion {st['completion_tokens']}")
+    for name in ("l1_cache", "memory", "batching", "singleflight"):
+        section = cog.stats().get(name)
+        if section:
+            print(f"{name:<15} " + ", ".join(f"{k} {v}" for k, v in section.items()))
+    await cog.engine.close()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=2000)
+    ap.add_argument("--rate", type=float, default=100)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--targets", default="de,fr,es")
+    ap.add_argument("--latency-ms", type=int, default=300)
+    ap.add_argument("--error-pct", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(ap.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench/rank.py
+# /profile rank: COUNT(*) of the rows above a member (even with idx_xp_rank it walks them) vs RankIndex,
+# plus the index's build time, update cost and memory.
+#   python -m bench.rank [--members 100000] [--lookups 2000]
+import argparse, asyncio, os, random, sqlite3, tempfile, time, tracemalloc
+
+from utils.rank_index import RankIndex
+
+COUNT_ABOVE = """SELECT COUNT(*) FROM xp WHERE guild_id = ? AND (xp > ? OR (xp = ? AND messages > ?))"""
+
+def members(n: int, rng: random.Random):
+    for uid in range(n):
+        msgs = int(rng.paretovariate(1.2) * 3)
+        yield uid, msgs * 5 + rng.randrange(50), msgs
+
+def memory(rows) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    idx = RankIndex(rows)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del idx
+    return used
+
+async def main(n: int, lookups: int):
+    rng = random.Random(3)
+    rows = list(members(n, rng))
+    probe = [rng.randrange(n) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BOT_DB_PATH"] = path = os.path.join(tmp, "bench.db")
+        from utils import database
+        await database.ensure_schema()
+        await database.apply_xp_deltas([(1, u, xp, m, 0, 0) for u, xp, m in rows])
+
+        con = sqlite3.connect(path)
+        by_uid = {u: (xp, m) for u, xp, m in rows}
+        t0 = time.perf_counter()
+        sql_ranks = []
+        for u in probe:
+            xp, m = by_uid[u]
+            sql_ranks.append(con.execute(COUNT_ABOVE, (1, xp, xp, m)).fetchone()[0] + 1)
+        sql_us = (time.perf_counter() - t0) / lookups * 1e6
+        con.close()
+
+        t0 = time.perf_counter()
+        idx = RankIndex(await database.get_rank_rows(1))
+        build_ms = (time.perf_counter() - t0) * 1000
+        await database.close()
+
+    t0 = time.perf_counter()
+    idx_ranks = [idx.rank(u)[0] for u in probe]
+    rank_us = (time.perf_counter() - t0) / lookups * 1e6
+    assert idx_ranks == sql_ranks
+
+    t0 = time.perf_counter()
+    for u in probe:
+        idx.update(u, rng.randrange(1, 30), 1)
+    update_us = (time.perf_counter() - t0) / lookups * 1e6
+
+    per_100k = memory(rows) / n * 100_000
+    print(f"{n:,} members")
+    print(f"  rank lookup   COUNT(*) {sql_us:9.1f} µs   RankIndex {rank_us:6.2f} µs   x{sql_us / rank_us:,.0f}")
+    print(f"  index build   {build_ms:.0f} ms (read + sort)   update {update_us:.1f} µs per member")
+    print(f"  memory        {per_100k / 2**20:.1f} MiB per 100k members "
+          f"(array {8 * 100_000 / 2**20:.1f} MiB, the rest is the user_id -> key dict)")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--members", type=int, default=100_000)
+    ap.add_argument("--lookups", type=int, default=2000)
+    args = ap.parse_args()
+    asyncio.run(main(args.members, args.lookups))
@@ -0,0 +1,232 @@
+# bench/replay.py
+# Replays a gateway trace (owner /trace, utils/trace.py) through the real Events, Translate and XPSystem
+# cogs with stub Discord objects, the offline model backend and a scratch database.
+#   python -m bench.replay TRACE [--speed 1] [--latency-ms 300] [--error-pct 0] [--quotas] [--json out.json]
+#   python -m bench.replay --synthetic [--events 5000] [--rate 50] [--save trace.jsonl.gz]
+# --speed 0 replays as fast as the handlers allow. Quotas are per minute of wall time, so they are off
+# unless --quotas is given (a 10x replay would otherwise throttle users who never hit a limit).
+import argparse, asyncio, json, os, random, tempfile, time
+from collections import Counter
+
+def _setup_env(args, db_path: str):
+    # utils.config / utils.database read the environment once, so bot modules are imported after this
+    os.environ.update({
+        "BOT_DB_PATH": db_path, "TRANSLATE_BACKEND": "local",
+        "LOCAL_LATENCY_MS": str(args.latency_ms), "LOCAL_ERROR_PCT": str(args.error_pct),
+    })
+    if not args.quotas:
+        for scope in ("USER", "GUILD", "GLOBAL"):
+            os.environ[f"QUOTA_{scope}_REQ_PER_MIN"] = os.environ[f"QUOTA_{scope}_TOKENS_PER_MIN"] = "0"
+
+# ---------- synthetic trace (no capture needed) ----------
+async def synthesize(path: str, n: int, rate: float, seed: int):
+    """Three guilds of chat with translation channels, reactions on recent messages and voice sessions."""
+    from bench.memory import message
+    from bench.stubs import StubChannel, StubGuild, StubMessage, StubReaction, StubUser, StubVoiceState
+    from utils import database
+    from utils.trace import TraceRecorder
+
+    rng = random.Random(seed)
+    clock = [0.0]
+    rec = TraceRecorder(clock=lambda: clock[0])
+    await database.ensure_schema()
+    guilds = []
+    for g in range(3):
+        guild = StubGuild(10**17 + g)
+        chans = [StubChannel(2 * 10**17 + g * 10 + c) for c in range(4)]
+        await database.allow_translation_channel(guild.id, chans[0].id)
+        await database.set_server_lang(guild.id, ["en", "de", "es"][g])
+        if g == 0:
+            await database.set_speculation(guild.id, True)
+        users = [StubUser(3 * 10**17 + g * 1000 + u, guild) for u in range(100)]
+        for u in users[::2]:
+            await database.set_user_lang(u.id, rng.choice(["de", "fr", "es", "pt"]))
+        guilds.append((guild, chans, users, []))
+
+    in_voice = set()
+    for i in range(n):
+        clock[0] += rng.expovariate(rate)
+        guild, chans, users, recent = rng.choice(guilds)
+        kind = rng.random()
+        if kind < 0.8 or not recent:
+            chan = chans[0] if rng.random() < 0.4 else rng.choice(chans[1:])
+            msg = StubMessage(i + 1, guild, chan, rng.choice(users), message(rng))
+            rec.message(msg)
+            if chan is chans[0]:
+                recent.append(msg)
+                del recent[:-30]
+        elif kind < 0.95:
+            emoji = "🔃" if rng.random() < 0.9 else "👍"
+            rec.reaction(StubReaction(rng.choice(recent), emoji), rng.choice(users))
+        else:
+            member = rng.choice(users)
+            if member.id in in_voice:
+                in_voice.discard(member.id)
+                rec.voice(member, StubVoiceState(chans[3]), StubVoiceState())
+            else:
+                in_voice.add(member.id)
+                rec.voice(member, StubVoiceState(), StubVoiceState(chans[3]))
+    await rec.save(path)
+
+# ---------- replay ----------
+def _emoji(k: int) -> str:
+    """Emoji pseudonym -> a custom emoji string; the guild's configured emote maps to the same string."""
+    return f"<:e{k}:{900000 + k}>"
+
+async def _apply_config(header: dict):
+    from utils import database
+    for gid, cfg in header["guilds"].items():
+        for cid in cfg["channels"]:
+            await database.allow_translation_channel(gid, cid)
+        if cfg.get("server_lang"):
+            await database.set_server_lang(gid, cfg["server_lang"])
+        if cfg.get("emoji"):
+            await database.set_bot_emote(gid, _emoji(cfg["emoji"]))
+        if cfg.get("speculate"):
+            await database.set_speculation(gid, True)
+    for uid, lang in header["users"].items():
+        await database.set_user_lang(uid, lang)
+
+async def replay(path: str, args) -> dict:
+    from bench.stubs import StubBot, StubChannel, StubGuild, StubMessage, StubReaction, StubUser, StubVoiceState
+    from cogs.events import Events
+    from cogs.translate import Translate
+    from cogs.xp_system import XPSystem
+    from utils import database
+    from utils.metrics import LatencyHistogram
+    from utils.trace import read_trace, synth_text
+
+    header, events = read_trace(path)
+    await database.ensure_schema()
+    await _apply_config(header)
+
+    bot = StubBot()
+    cogs = [Events(bot), Translate(bot), XPSystem(bot)]
+    for cog in cogs:
+        bot.add_cog(cog)
+    translate = bot.get_cog("Translate")
+    await translate.cog_load()
+    listeners = {k: bot.listeners(name) for k, name in
+                 (("m", "on_message"), ("r", "on_reaction_add"), ("v", "on_voice_state_update"))}
+
+    guilds, channels, users, messages = {}, {}, {}, {}
+    guild = lambda g: guilds.setdefault(g, StubGuild(g))
+    channel = lambda c: channels.setdefault(c, StubChannel(c)) if c else None
+    user = lambda u, g: users.setdefault(u, StubUser(u, guild(g)))
+
+    def msg_for(e):
+        g, c, u, mid, lang, protected, sents = e[2], e[3], e[4], e[5], e[-3], e[-2], e[-1]
+        if mid not in messages:
+            author = user(u, g) if e[0] == "m" else StubUser(0, guild(g))   # reaction on an unseen message
+            messages[mid] = StubMessage(mid, guild(g), channel(c), author, synth_text(lang, protected, sents))
+        return messages[mid]
+
+    hist = {k: LatencyHistogram(size=20000) for k in ("all", "m", "r", "v")}
+    counts = dict.fromkeys(("m", "r", "v"), 0)
+    errors = Counter()
+
+    async def handle(kind: str, *event_args):
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(fn(*event_args) for fn in listeners[kind]), return_exceptions=True)
+        errors.update(type(r).__name__ for r in results if isinstance(r, Exception))
+        dt = time.perf_counter() - t0
+        hist[kind].record(dt)
+        hist["all"].record(dt)
+
+    db0, model0 = database.stats(), translate.engine.stats()
+    tasks, virtual = [], 0.0
+    start = time.perf_counter()
+    for e in events:
+        virtual += e[1] / 1000
+        if args.speed > 0:
+            delay = start + virtual / args.speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        kind = e[0]
+        counts[kind] += 1
+        if kind == "m":
+            tasks.append(asyncio.create_task(handle("m", msg_for(e))))
+        elif kind == "r":
+            reaction = StubReaction(msg_for(e), _emoji(e[6]))
+            tasks.append(asyncio.create_task(handle("r", reaction, user(e[4], e[2]))))
+        else:
+            member = user(e[3], e[2])
+            tasks.append(asyncio.create_task(
+                handle("v", member, StubVoiceState(channel(e[4])), StubVoiceState(channel(e[5])))))
+        if len(tasks) >= 1000:
+            tasks = [t for t in tasks if not t.done()]
+        if args.speed <= 0:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+
+    db1, model1 = database.stats(), translate.engine.stats()
+    n = max(1, sum(counts.values()))
+    for cog in cogs:
+        if hasattr(cog, "cog_unload"):
+            result = cog.cog_unload()
+            if asyncio.iscoroutine(result):
+                await result
+    return {
+        "trace": os.path.basename(path), "events": sum(counts.values()), "by_kind": counts,
+        "wall_s": round(wall, 2), "events_per_s": round(n / wall, 1), "handler_errors": dict(errors),
+        "latency": {k: h.stats() for k, h in hist.items()},
+        "db_statements_per_event": round((db1["statements"] - db0["statements"]) / n, 2),
+        "db_connects_per_event": round((db1["connects"] - db0["connects"]) / n, 2),
+        "model_calls_per_event": round((model1["requests"] - model0["requests"]) / n, 3),
+        "model_tokens_per_event": round((model1["prompt_tokens"] + model1["completion_tokens"]
+                                         - model0["prompt_tokens"] - model0["completion_tokens"]) / n, 1),
+        "dms_sent": sum(u.dms for u in users.values()),
+        "config_cache": database.cache_stats(),
+    }
+
+def report(r: dict):
+    print(f"trace           {r['trace']}: {r['events']} events "
+          f"({r['by_kind']['m']} messages, {r['by_kind']['r']} reactions, {r['by_kind']['v']} voice)")
+    errors = ", ".join(f"{name} {n}" for name, n in r["handler_errors"].items()) or "none"
+    print(f"throughput      {r['events_per_s']} events/s over {r['wall_s']} s, handler errors: {errors}")
+    for kind, name in (("all", "all"), ("m", "messages"), ("r", "reactions"), ("v", "voice")):
+        h = r["latency"][kind]
+        if h["count"]:
+            print(f"  {name:<13} p50 {h['p50_ms']:>8} ms   p99 {h['p99_ms']:>8} ms")
+    print(f"db / event      {r['db_statements_per_event']} statements, {r['db_connects_per_event']} connections")
+    print(f"model / event   {r['model_calls_per_event']} calls, {r['model_tokens_per_event']} tokens "
+          f"({r['dms_sent']} DMs sent)")
+    cache = r["config_cache"]
+    print(f"config cache    guild hit rate {cache['guild_config']['hit_rate']}, "
+          f"user prefs hit rate {cache['user_prefs']['hit_rate']}")
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        _setup_env(args, os.path.join(tmp, "replay.db"))
+        from utils import database
+        path = args.trace
+        if args.synthetic:
+            path = args.save or os.path.join(tmp, "synthetic.jsonl.gz")
+            database.DB_PATH = os.path.join(tmp, "synthetic.db")   # the recorder snapshots settings from here
+            await synthesize(path, args.events, args.rate, args.seed)
+            database.DB_PATH = os.path.join(tmp, "replay.db")
+        result = await replay(path, args)
+        await database.close()
+        report(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("trace", nargs="?")
+    ap.add_argument("--synthetic", action="store_true")
+    ap.add_argument("--events", type=int, default=5000)
+    ap.add_argument("--rate", type=float, default=50, help="synthetic events per second")
+    ap.add_argument("--save", help="keep the synthetic trace here")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--speed", type=float, default=1.0)
+    ap.add_argument("--latency-ms", type=int, default=300)
+    ap.add_argument("--error-pct", type=int, default=0)
+    ap.add_argument("--quotas", action="store_true")
+    ap.add_argument("--json")
+    args = ap.parse_args()
+    if not args.trace and not args.synthetic:
+        ap.error("give a trace file or --synthetic")
+    asyncio.run(main(args))
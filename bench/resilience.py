@@ -0,0 +1,82 @@
+# bench/resilience.py
+# Retries, circuit breaker and hedging against the fault-injecting fake server.
+#   python -m bench.resilience [--scenario all|flaky|ratelimit|outage|tail]
+import argparse, asyncio, time
+
+from bench.fake_openai import FakeOpenAI
+from utils.metrics import LatencyHistogram
+from utils.resilience import CircuitBreaker, ProviderUnavailable
+from utils.translator import TranslationEngine
+
+async def drive(engine, n: int, rate: float):
+    """n translations arriving at `rate` per second. Returns (ok, fast_failed, failed, latency histogram)."""
+    hist = LatencyHistogram()
+    ok = fast = failed = 0
+
+    async def one(i):
+        nonlocal ok, fast, failed
+        t0 = time.perf_counter()
+        try:
+            await engine.translate(f"message number {i}", "de")
+        except ProviderUnavailable:
+            fast += 1
+            return
+        except Exception:
+            failed += 1
+            return
+        ok += 1
+        hist.record(time.perf_counter() - t0)
+
+    tasks = []
+    for i in range(n):
+        tasks.append(asyncio.create_task(one(i)))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+    return ok, fast, failed, hist
+
+def report(name, fake, engine, result):
+    ok, fast, failed, hist = result
+    h = hist.stats()
+    print(f"  {name:<22} ok {ok:>4}  failed {failed:>3}  fast-failed {fast:>3}  "
+          f"server calls {fake.requests:>4}  p50 {h['p50_ms']:>6} ms  p99 {h['p99_ms']:>6} ms  "
+          f"retried {engine.retried}  hedges {engine.hedges}/{engine.hedge_wins} won")
+
+async def run(name, fake_kw, engine_kw, n=200, rate=50, during=None, warmup=0):
+    with FakeOpenAI(latency=0.1, token_delay=0.0, **fake_kw) as fake:
+        engine = TranslationEngine(api_key="x", base_url=fake.base_url, concurrency=32, **engine_kw)
+        try:
+            if warmup:   # latency samples for the hedge threshold; not part of the result
+                await drive(engine, warmup, rate)
+                fake.requests = engine.hedges = engine.hedge_wins = 0
+            if during:
+                asyncio.get_running_loop().call_later(during[0], fake.outage, during[1])
+            result = await drive(engine, n, rate)
+            report(name, fake, engine, result)
+        finally:
+            await engine.close()
+
+async def main(scenario: str):
+    if scenario in ("all", "flaky"):
+        print("flaky provider: 20% of calls fail with 503")
+        await run("no retries", dict(error_rate=0.2), dict(retries=0, breaker=CircuitBreaker(cooldown=0)))
+        await run("retries + backoff", dict(error_rate=0.2), dict(retries=2, breaker=CircuitBreaker(cooldown=0)))
+    if scenario in ("all", "ratelimit"):
+        print("rate limited: 30% of calls get 429 with Retry-After: 0.5")
+        kw = dict(error_rate=0.3, error_status=429, retry_after=0.5)
+        await run("no retries", kw, dict(retries=0, breaker=CircuitBreaker(cooldown=0)))
+        await run("honour Retry-After", kw, dict(retries=2, breaker=CircuitBreaker(cooldown=0)))
+    if scenario in ("all", "outage"):
+        print("outage: every call fails for 2 s in the middle of a 4 s run")
+        await run("retries, no breaker", {}, dict(retries=2, breaker=CircuitBreaker(cooldown=0)), during=(1, 2))
+        await run("retries + breaker", {}, dict(retries=2, breaker=CircuitBreaker(failures=5, cooldown=0.5)),
+                  during=(1, 2))
+    if scenario in ("all", "tail"):
+        print("tail latency: 5% of calls take 1.5 s instead of 0.1 s")
+        kw = dict(slow_rate=0.05, slow_latency=1.5)
+        await run("no hedging", kw, dict(hedge_pct=0), n=400, warmup=50)
+        await run("hedge after p90", kw, dict(hedge_pct=90), n=400, warmup=50)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenario", default="all")
+    asyncio.run(main(ap.parse_args().scenario))
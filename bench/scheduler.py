@@ -0,0 +1,136 @@
+# bench/scheduler.py
+# Behaviour checks for utils/scheduler.py (cancellation, shutdown, shedding) and a fairness run.
+#   python -m bench.scheduler [--guilds 8] [--jobs 400]
+import argparse, asyncio, time
+from collections import Counter
+
+from utils.scheduler import TranslationScheduler, SchedulerBusy
+
+async def check_stop_while_running():
+    """stop() with a job mid-flight returns promptly and cancels that job's submitter."""
+    s = TranslationScheduler(workers=2)
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(30)
+
+    sub = asyncio.create_task(s.submit("reaction", 1, slow))
+    await started.wait()
+    await asyncio.wait_for(s.stop(), timeout=2)
+    assert not s._tasks and s.running == 0
+    try:
+        await asyncio.wait_for(sub, timeout=1)
+        raise AssertionError("submitter got a result from a stopped scheduler")
+    except asyncio.CancelledError:
+        pass
+
+async def check_submitter_cancel():
+    """A submitter giving up cancels its job; the worker survives and serves the next one."""
+    s = TranslationScheduler(workers=1)
+    started, ran = asyncio.Event(), asyncio.Event()
+
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            ran.set()
+            raise
+
+    sub = asyncio.create_task(s.submit("reaction", 1, slow))
+    await started.wait()
+    sub.cancel()
+    await asyncio.wait_for(ran.wait(), timeout=1)
+    assert await asyncio.wait_for(s.submit("reaction", 1, lambda: asyncio.sleep(0, "ok")), timeout=1) == "ok"
+    await asyncio.wait_for(s.stop(), timeout=2)
+
+async def check_errors_and_shedding():
+    s = TranslationScheduler(workers=1, max_queue=2)
+
+    async def boom():
+        raise ValueError("x")
+    try:
+        await s.submit("interactive", 1, boom)
+        raise AssertionError("job error was not raised to the submitter")
+    except ValueError:
+        pass
+    gate = asyncio.Event()
+    held = [asyncio.create_task(s.submit("reaction", 1, gate.wait))]
+    await asyncio.sleep(0.01)   # running
+    held += [asyncio.create_task(s.submit("reaction", 1, gate.wait)) for _ in range(2)]
+    await asyncio.sleep(0.01)   # two queued: the queue is full
+    try:
+        await s.submit("reaction", 2, gate.wait)
+        raise AssertionError("full queue accepted a job")
+    except SchedulerBusy:
+        pass
+    try:
+        await s.submit("speculative", 2, gate.wait)
+        raise AssertionError("background job ran on a busy scheduler")
+    except SchedulerBusy:
+        pass
+    gate.set()
+    await asyncio.gather(*held)
+    await asyncio.wait_for(s.stop(), timeout=2)
+
+async def check_shutdown_while_running():
+    """Cancelling the workers directly (asyncio.run's shutdown does) also ends them mid-job."""
+    s = TranslationScheduler(workers=1)
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(30)
+
+    sub = asyncio.create_task(s.submit("reaction", 1, slow))
+    await started.wait()
+    for t in s._tasks:
+        t.cancel()
+    done, _ = await asyncio.wait(s._tasks, timeout=2)
+    assert len(done) == len(s._tasks), "worker swallowed its own cancellation"
+    await s.stop()
+    sub.cancel()
+
+CHECKS = [check_stop_while_running, check_shutdown_while_running, check_submitter_cancel, check_errors_and_shedding]
+
+async def fairness(guilds: int, jobs: int):
+    """One noisy guild floods the reaction lane (~150-token jobs); the others still get an even share early on."""
+    s = TranslationScheduler(workers=2, max_queue=jobs * 2)
+    order = []
+
+    def job(gid):
+        async def run():
+            order.append(gid)
+            await asyncio.sleep(0.001)
+        return run
+
+    subs = [s.submit("reaction", 0, job(0), cost=150) for _ in range(jobs)]
+    subs += [s.submit("reaction", g, job(g), cost=150) for g in range(1, guilds) for _ in range(jobs // guilds)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*subs)
+    elapsed = time.perf_counter() - t0
+    await s.stop()
+    first = Counter(order[:len(order) // 4])
+    print(f"\nfairness: {len(order)} jobs in {elapsed:.2f} s; share of the first quarter per guild:")
+    print("  " + "  ".join(f"g{g} {first[g] / max(1, len(order) // 4):.0%}" for g in range(guilds)))
+
+async def main(args):
+    failed = 0
+    for check in CHECKS:
+        try:
+            await check()
+            status = "ok"
+        except (AssertionError, asyncio.TimeoutError) as e:
+            failed += 1
+            status = f"FAILED {type(e).__name__} {e}"
+        print(f"  {check.__name__:<28} {status}")
+    if failed:
+        raise SystemExit(f"{failed} check(s) failed")
+    await fairness(args.guilds, args.jobs)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--guilds", type=int, default=8)
+    ap.add_argument("--jobs", type=int, default=400)
+    asyncio.run(main(ap.parse_args()))
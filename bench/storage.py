@@ -0,0 +1,183 @@
+# bench/storage.py
+# Conformance checks and a benchmark, run the same way against every storage backend.
+#   python -m bench.storage [--backends sqlite,memory] [--ops 5000] [--members 20000]
+# Conformance: fixed expectations per area, plus a randomized run compared against a plain-dict model.
+import argparse, asyncio, os, random, tempfile, time
+
+from utils.config_cache import DEFAULT_GUILD_CONFIG
+
+def _open(name: str, tmp: str):
+    from utils.database import make_storage
+    return make_storage(name, os.path.join(tmp, f"{name}.db"))
+
+# ---------- conformance ----------
+async def check_xp(s):
+    assert await s.get_xp(1, 1) == (0, 0, 0, 0)
+    await s.add_message_xp(1, 1, 5)
+    await s.add_message_xp(1, 1, -3)                 # negative deltas are clamped, the message still counts
+    await s.add_translation_xp(1, 1, 7)
+    await s.add_voice_seconds(1, 1, 30)
+    await s.add_voice_seconds(1, 1, 0)               # no-op
+    assert await s.get_xp(1, 1) == (12, 2, 1, 30)
+    await s.apply_xp_deltas([(1, 2, 12, 5, 0, 0), (1, 3, 12, 2, 0, 0), (2, 1, 99, 1, 0, 0)])
+    assert await s.get_xp(2, 1) == (99, 1, 0, 0)
+    top = await s.get_xp_leaderboard(1, limit=10)
+    assert [r[0] for r in top] == [2, 1, 3], top     # xp, then messages, then user_id
+    assert sorted(await s.get_rank_rows(1)) == [(1, 12, 2), (2, 12, 5), (3, 12, 2)]
+    page = await s.get_xp_leaderboard(1, limit=1, after=(12, 5, 2))
+    assert [tuple(r) for r in page] == [(1, 12, 2, 1, 30)]
+    assert await s.get_xp_leaderboard(1, limit=5, after=(12, 2, 3)) == []
+    assert await s.get_xp_leaderboard(9) == []
+
+async def check_prefs(s):
+    assert await s.get_user_lang(5) is None
+    await s.set_user_lang(5, "de")
+    await s.set_user_lang(5, "fr")
+    assert await s.get_user_lang(5) == "fr"
+
+async def check_guild(s):
+    assert await s.load_guild_config(7) == DEFAULT_GUILD_CONFIG
+    await s.set_server_lang(7, "es")
+    await s.allow_translation_channel(7, 70)
+    await s.allow_translation_channel(7, 71)
+    await s.allow_translation_channel(7, 71)
+    await s.remove_translation_channel(7, 70)
+    await s.remove_translation_channel(7, 999)
+    await s.set_error_channel(7, 77)
+    await s.set_bot_emote(7, "🔃")
+    await s.set_speculation(7, True)
+    cfg = await s.load_guild_config(7)
+    assert cfg == DEFAULT_GUILD_CONFIG._replace(channels=frozenset({71}), server_lang="es", error_channel=77,
+                                                emote="🔃", speculate=True), cfg
+    await s.set_error_channel(7, None)
+    await s.set_speculation(7, False)
+    await s.allow_translation_channel(8, 80)
+    configs = await s.load_guild_configs()
+    assert configs[7] == cfg._replace(error_channel=None, speculate=False)
+    assert configs[8] == DEFAULT_GUILD_CONFIG._replace(channels=frozenset({80}))
+
+async def check_roles(s):
+    assert await s.get_role_table(3) == []
+    await s.upsert_role_table(3, [(11, 20, 2), (1, 10, 1)])
+    assert await s.get_role_table(3) == [(1, 10, 1), (11, 20, 2)]
+    await s.upsert_role_table(3, [(1, 10, 5)])
+    assert await s.get_role_table(3) == [(1, 10, 5)]
+    assert await s.delete_role_table(3) == 1
+    assert await s.delete_role_table(3) == 0
+
+async def check_translation_cache(s):
+    assert await s.get_cached_translation("a") is None
+    await s.put_cached_translation("a", "en", "m", "fr", b"x" * 100)
+    await s.put_cached_translation("b", "en", "m", None, b"y" * 100)
+    assert await s.get_cached_translation("a") == (b"x" * 100, "fr")
+    await s.put_cached_translation("c", "en", "m", None, b"z")
+    await s.delete_cached_translation("c")
+    await s.delete_cached_translation("missing")
+    assert await s.get_cached_translation("c") is None
+    assert await s.prune_translation_cache(max_bytes=150, max_age=3600) == 1   # one of the two goes
+    assert await s.prune_translation_cache(max_bytes=10**6, max_age=-10) == 1  # everything is "expired"
+
+async def check_random(s, seed: int = 5, steps: int = 3000):
+    """Random XP writes and leaderboard walks, checked against a dict."""
+    rng = random.Random(seed)
+    model = {}
+    for _ in range(steps // 100):
+        batch = {}
+        for _ in range(100):
+            key = (rng.randrange(3), rng.randrange(200))
+            d = batch.setdefault(key, [0, 0, 0, 0])
+            d[0] += rng.randrange(0, 20)
+            d[1] += rng.randrange(0, 2)
+        await s.apply_xp_deltas([(g, u, *d) for (g, u), d in batch.items()])
+        for key, d in batch.items():
+            m = model.setdefault(key, [0, 0, 0, 0])
+            for i in range(4):
+                m[i] += d[i]
+    for gid in range(3):
+        expect = sorted(((u, *v) for (g, u), v in model.items() if g == gid), key=lambda r: (-r[1], -r[2], r[0]))
+        got, after = [], None
+        while True:
+            page = await s.get_xp_leaderboard(gid, limit=7, after=after)
+            if not page:
+                break
+            got += [tuple(r) for r in page]
+            after = (page[-1][1], page[-1][2], page[-1][0])
+        assert got == expect, f"guild {gid}: keyset walk differs from the model"
+
+CHECKS = [check_xp, check_prefs, check_guild, check_roles, check_translation_cache, check_random]
+
+async def conformance(name: str, tmp: str) -> int:
+    failed = 0
+    for check in CHECKS:
+        s = _open(name, os.path.join(tmp, check.__name__))
+        os.makedirs(os.path.dirname(s.path) or ".", exist_ok=True)
+        await s.ensure_schema()
+        try:
+            await check(s)
+            status = "ok"
+        except AssertionError as e:
+            failed += 1
+            status = f"FAILED {e}"
+        finally:
+            await s.close()
+        print(f"  {name:<7} {check.__name__:<24} {status}")
+    return failed
+
+# ---------- benchmark ----------
+async def bench(name: str, tmp: str, ops: int, members: int) -> dict:
+    s = _open(name, os.path.join(tmp, "bench"))
+    os.makedirs(os.path.dirname(s.path) or ".", exist_ok=True)
+    await s.ensure_schema()
+    rng = random.Random(1)
+    out = {}
+
+    async def timed(label, fn, n):
+        t0 = time.perf_counter()
+        for i in range(n):
+            await fn(i)
+        out[label] = n / (time.perf_counter() - t0)
+
+    rows = [(1, u, rng.randrange(10000), rng.randrange(500), 0, 0) for u in range(members)]
+    t0 = time.perf_counter()
+    for i in range(0, members, 500):                         # XPAggregator-sized flushes
+        await s.apply_xp_deltas(rows[i:i + 500])
+    out["xp rows/s (500-row flushes)"] = members / (time.perf_counter() - t0)
+    for g in range(50):
+        await s.allow_translation_channel(g, g)
+        await s.set_bot_emote(g, "🔃")
+    for u in range(1000):
+        await s.set_user_lang(u, "de")
+
+    await timed("get_xp", lambda i: s.get_xp(1, i % members), ops)
+    await timed("leaderboard page 1", lambda i: s.get_xp_leaderboard(1, limit=10), ops // 10)
+    await timed("leaderboard deep page", lambda i: s.get_xp_leaderboard(1, limit=10, after=(5000, 250, 0)), ops // 10)
+    await timed("load_guild_config", lambda i: s.load_guild_config(i % 50), ops)
+    await timed("get_user_lang", lambda i: s.get_user_lang(i % 2000), ops)
+    await timed("put_cached_translation", lambda i: s.put_cached_translation(f"k{i}", "en", "m", None, b"v" * 200), ops)
+    await timed("get_cached_translation", lambda i: s.get_cached_translation(f"k{i}"), ops)
+    await timed("get_rank_rows", lambda i: s.get_rank_rows(1), 5)
+    await s.close()
+    return out
+
+async def main(args):
+    backends = args.backends.split(",")
+    with tempfile.TemporaryDirectory() as tmp:
+        print("conformance")
+        failed = 0
+        for name in backends:
+            failed += await conformance(name, os.path.join(tmp, "conf"))
+        if failed:
+            raise SystemExit(f"{failed} conformance check(s) failed")
+
+        print(f"\nbenchmark: ops/s ({args.ops} ops, {args.members:,} xp rows in one guild)")
+        results = {name: await bench(name, os.path.join(tmp, name), args.ops, args.members) for name in backends}
+        print("  " + f"{'':<30}" + "".join(f"{n:>12}" for n in backends))
+        for label in results[backends[0]]:
+            print(f"  {label:<30}" + "".join(f"{results[n][label]:>12,.0f}" for n in backends))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", default="sqlite,memory")
+    ap.add_argument("--ops", type=int, default=5000)
+    ap.add_argument("--members", type=int, default=20000)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,75 @@
+# bench/streaming.py
+# Time to first visible text in the DM: streamed + coalesced edits vs waiting for the full completion.
+#   python -m bench.streaming [--n 20] [--latency 0.4] [--token-delay 0.03]
+import argparse, asyncio, os, time
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("L2_CACHE", "0")
+
+from bench.fake_openai import FakeOpenAI
+
+TEXT = ("Heads up everyone: the maintenance window moves to Saturday 18:00 UTC. Servers will be offline "
+        "for about two hours, queued matches are cancelled and rewards will be sent out afterwards.")
+
+class StubMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(time.perf_counter())
+
+async def run(n: int, interval: float):
+    import cogs.translate as tr
+
+    cog = tr.Translate(bot=None)
+    cog.cache = cog.memory = None  # every message goes to the model
+    full, first, edits = [], [], []
+    for i in range(n):
+        text = f"{TEXT} (#{i})"
+        t0 = time.perf_counter()
+        await cog.engine.translate(text, "de")
+        full.append(time.perf_counter() - t0)
+
+        msg = StubMessage()
+        live = tr._LiveEdit(msg, "bench", interval)
+        t0 = time.perf_counter()
+        await cog.ai_translate_stream(text + " stream", "de", live.update)
+        await live.close()
+        if live.first_shown_at is not None:
+            first.append(msg.edits[0] - t0)
+        edits.append(len(msg.edits))
+
+    # a second DM for the same text joins the stream in flight: one model call, and it still gets edits
+    calls = cog.engine.calls
+    lead, late = StubMessage(), StubMessage()
+    edits_a, edits_b = tr._LiveEdit(lead, "bench", interval), tr._LiveEdit(late, "bench", interval)
+
+    async def joined():
+        await asyncio.sleep(0.05)
+        return await cog.ai_translate_stream(f"{TEXT} joined", "de", edits_b.update)
+    a, b = await asyncio.gather(cog.ai_translate_stream(f"{TEXT} joined", "de", edits_a.update), joined())
+    await edits_a.close()
+    await edits_b.close()
+    assert a == b and cog.engine.calls - calls == 1, "joined stream made its own model call"
+    assert edits_b.first_shown_at is not None and len(late.edits) > 1, "joined stream got no progressive edits"
+    await cog.engine.close()
+    return full, first, edits, (len(lead.edits), len(late.edits))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.4)
+    ap.add_argument("--token-delay", type=float, default=0.03)
+    ap.add_argument("--interval", type=float, default=1.2)
+    args = ap.parse_args()
+    with FakeOpenAI(latency=args.latency, token_delay=args.token_delay) as fake:
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        full, first, edits, joined = asyncio.run(run(args.n, args.interval))
+    med = lambda xs: sorted(xs)[len(xs) // 2] * 1000 if xs else 0.0
+    print(f"full completion     median {med(full):7.0f} ms")
+    print(f"streamed first text median {med(first):7.0f} ms")
+    print(f"DM edits per message       {sum(edits) / max(1, len(edits)):.1f} (interval {args.interval}s)")
+    print(f"joined stream              1 model call, edits {joined[0]} (leader) / {joined[1]} (joined)")
+
+if __name__ == "__main__":
+    main()
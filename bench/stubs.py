@@ -0,0 +1,86 @@
+# bench/stubs.py
+# Just enough of discord.py's objects to drive the cogs' listeners without a gateway connection.
+import asyncio
+from contextlib import nullcontext
+
+class StubGuild:
+    def __init__(self, id: int):
+        self.id = id
+        self.name = f"guild {id}"
+
+    def get_member(self, _uid):
+        return None
+
+    def get_channel(self, _cid):
+        return None
+
+class StubChannel:
+    def __init__(self, id: int):
+        self.id = id
+
+    def typing(self):
+        return nullcontext()
+
+class StubUser:
+    def __init__(self, id: int, guild: StubGuild = None, bot: bool = False):
+        self.id, self.guild, self.bot = id, guild, bot
+        self.display_name = f"user {id}"
+        self.dms = 0
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def send(self, **_kwargs):
+        self.dms += 1
+        return StubMessage(0, None, None, self)
+
+    def typing(self):
+        return nullcontext()
+
+class StubMessage:
+    def __init__(self, id: int, guild, channel, author, content: str = ""):
+        self.id, self.guild, self.channel, self.author = id, guild, channel, author
+        self.content = content
+        self.embeds, self.attachments = [], []
+        self.edits = 0
+
+    async def add_reaction(self, _emoji):
+        pass
+
+    async def edit(self, **_kwargs):
+        self.edits += 1
+
+class StubReaction:
+    def __init__(self, message: StubMessage, emoji: str):
+        self.message, self.emoji = message, emoji
+
+    async def remove(self, _user):
+        pass
+
+class StubVoiceState:
+    def __init__(self, channel=None):
+        self.channel = channel
+
+class StubBot:
+    """Dispatches custom events (e.g. xp_gain) to the added cogs' listeners, like commands.Bot does."""
+    def __init__(self):
+        self.cogs = {}
+        self.guilds = []
+        self.latency = 0.0
+
+    def add_cog(self, cog):
+        self.cogs[type(cog).__name__] = cog
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def get_guild(self, _gid):
+        return None
+
+    def listeners(self, event: str):
+        return [fn for cog in self.cogs.values() for name, fn in cog.get_listeners() if name == event]
+
+    def dispatch(self, event: str, *args):
+        for fn in self.listeners(f"on_{event}"):
+            asyncio.create_task(fn(*args))
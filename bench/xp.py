@@ -0,0 +1,53 @@
+# bench/xp.py
+# Message XP: one awaited transaction per message (database.add_message_xp) vs the write-behind aggregator.
+#   python -m bench.xp [--messages 20000] [--users 2000] [--concurrency 32]
+import argparse, asyncio, os, random, tempfile, time
+
+async def drive(add, n: int, users: int, concurrency: int) -> float:
+    rng = random.Random(1)
+    work = iter([(rng.randrange(3), rng.randrange(users)) for _ in range(n)])
+
+    async def worker():
+        for gid, uid in work:
+            await add(gid, uid)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return n / (time.perf_counter() - t0)
+
+async def main(n: int, users: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BOT_DB_PATH"] = os.path.join(tmp, "bench.db")
+        from utils import database
+        from utils.xp_aggregator import XPAggregator
+        await database.ensure_schema()
+
+        before = database.stats()["writes"]
+        direct = await drive(lambda g, u: database.add_message_xp(g, u, 5), n, users, concurrency)
+        direct_tx = database.stats()["writes"] - before
+
+        agg = XPAggregator()
+        before = database.stats()["writes"]
+
+        async def buffered(g, u):
+            agg.add(g, u, xp=5, messages=1)
+            await asyncio.sleep(0)   # a real handler yields; lets size-triggered flushes run
+        t0 = time.perf_counter()
+        await drive(buffered, n, users, concurrency)
+        await agg.close()   # count the final write too
+        buffered_rate = n / (time.perf_counter() - t0)
+        buffered_tx = database.stats()["writes"] - before
+
+        print(f"{n} messages from {users} users, {concurrency} handlers in flight")
+        print(f"  awaited per message  {direct:9.0f} msg/s   {direct_tx} transactions")
+        print(f"  write-behind         {buffered_rate:9.0f} msg/s   {buffered_tx} transactions "
+              f"({agg.rows} upserted rows, last flush {agg.last_flush_ms} ms)")
+        await database.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=20000)
+    ap.add_argument("--users", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+    asyncio.run(main(args.messages, args.users, args.concurrency))
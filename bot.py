@@ -7,6 +7,7 @@ from discord.ext import commands
 
 from utils.brand import NAME, COLOR
 from utils import database
+from utils.xp_aggregator import xp_aggregator
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +35,7 @@ COGS = [
     "cogs.invite_command",
     "cogs.welcome",
     "cogs.owner_commands",
+    "cogs.trace_capture",
     "cogs.context_menu",
     "cogs.xp_system",
 ]
@@ -69,6 +71,9 @@ async def main():
         else:
             await database.ensure_schema()
         log.info("🗃 Ensuring database tables exist...")
+        if database.STORAGE == "memory":
+            log.warning("🗃 STORAGE_BACKEND=memory: XP and settings are lost when the bot stops")
+        log.info("🗃 Cached config for %d guilds", await database.preload_guild_configs())
     except Exception as e:
         log.error("❌ Fatal error preparing database: %s", e)
         raise
@@ -81,7 +86,11 @@ async def main():
     except Exception:
         pass
 
-    await bot.start(DISCORD_TOKEN)
+    try:
+        await bot.start(DISCORD_TOKEN)
+    finally:
+        await xp_aggregator.close()
+        await database.close()
 
 if __name__ == "__main__":
     try:
@@ -4,7 +4,7 @@ from discord.ext import commands
 from discord import app_commands
 
 from utils import database
-from utils.language_data import SUPPORTED_LANGUAGES, label
+from utils.language_data import is_supported, label, search_choices
 
 try:
     from utils.brand import COLOR
@@ -15,19 +15,8 @@ try:
 except Exception:
     BRAND_FOOTER = "Zephyra • /help for commands"
 
-def _lang_codes():
-    return [l["code"] for l in SUPPORTED_LANGUAGES]
-
 async def ac_lang(interaction: discord.Interaction, current: str):
-    cur = (current or "").lower()
-    choices = []
-    for l in SUPPORTED_LANGUAGES:
-        disp = label(l["code"])
-        if cur in l["code"] or cur in l["name"].lower() or cur in disp.lower():
-            choices.append(app_commands.Choice(name=f"{disp} ({l['code']})", value=l["code"]))
-        if len(choices) >= 25:
-            break
-    return choices
+    return search_choices(current)
 
 class AdminCommands(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -39,7 +28,7 @@ class AdminCommands(commands.Cog):
     @app_commands.autocomplete(code=ac_lang)
     async def defaultlang(self, interaction: discord.Interaction, code: str):
         code = (code or "").lower()
-        if code not in _lang_codes():
+        if not is_supported(code):
             e = discord.Embed(description=f"❌ Unsupported language code `{code}`.", color=COLOR)
             e.set_footer(text=BRAND_FOOTER)
             return await interaction.response.send_message(embed=e, ephemeral=True)
@@ -56,18 +45,18 @@ class AdminCommands(commands.Cog):
     @app_commands.command(name="settings", description="Show translation & bot settings.")
     async def settings(self, interaction: discord.Interaction):
         gid = interaction.guild.id
-        server_lang = await database.get_server_lang(gid)
-        allowed = await database.get_translation_channels(gid)
-        emote = await database.get_bot_emote(gid)
-        err_ch = await database.get_error_channel(gid)
+        cfg = await database.get_guild_config(gid)
+        server_lang, emote, err_ch, speculate = cfg.server_lang, cfg.emote, cfg.error_channel, cfg.speculate
 
-        chans = "All channels (no allow-list)" if not allowed else ", ".join(f"<#{cid}>" for cid in allowed)
+        chans = ("All channels (no allow-list)" if not cfg.channels
+                 else ", ".join(f"<#{cid}>" for cid in sorted(cfg.channels)))
         lang_disp = label(server_lang) if server_lang else "Not set"
 
         e = discord.Embed(title="⚙️ Server Settings", color=COLOR)
         e.add_field(name="Server Language", value=f"{lang_disp} `{server_lang or ''}`", inline=False)
         e.add_field(name="Translate Emote", value=emote or "🔃", inline=True)
         e.add_field(name="Error Channel", value=f"<#{err_ch}>" if err_ch else "None", inline=True)
+        e.add_field(name="Pre-translate", value="On" if speculate else "Off", inline=True)
         e.add_field(name="Allowed Channels", value=chans, inline=False)
         e.set_footer(text=BRAND_FOOTER)
         await interaction.response.send_message(embed=e, ephemeral=True)
@@ -89,5 +78,14 @@ class AdminCommands(commands.Cog):
         e.set_footer(text=BRAND_FOOTER)
         await interaction.response.send_message(embed=e, ephemeral=True)
 
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.command(name="speculate", description="Pre-translate busy translation channels before anyone reacts.")
+    @app_commands.describe(enabled="On: frequently translated messages are translated in advance (uses spare capacity).")
+    async def speculate(self, interaction: discord.Interaction, enabled: bool):
+        await database.set_speculation(interaction.guild.id, enabled)
+        e = discord.Embed(description=f"✅ Pre-translation {'enabled' if enabled else 'disabled'}.", color=COLOR)
+        e.set_footer(text=BRAND_FOOTER)
+        await interaction.response.send_message(embed=e, ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(AdminCommands(bot))
@@ -2,8 +2,10 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.brand import COLOR, footer
-from utils.language_data import codes, label
+from utils.language_data import is_supported, label
 from utils import database
+from cogs.translate import render_translation
+from utils.scheduler import SchedulerBusy
 
 # helper: call Translate cog
 async def _translate_via_cog(interaction: discord.Interaction, message: discord.Message, target: str):
@@ -12,25 +14,29 @@ async def _translate_via_cog(interaction: discord.Interaction, message: discord.
     if not cog:
         e = discord.Embed(description="❌ Translator not loaded.", color=COLOR); e.set_footer(text=footer())
         return await interaction.response.send_message(embed=e, ephemeral=True)
+    throttled = cog.check_quota(interaction.guild_id, interaction.user.id, message.content or "")
+    if throttled:
+        return await interaction.response.send_message(embed=throttled, ephemeral=True)
     await interaction.response.defer(ephemeral=True)
     try:
-        translated, detected = await cog.ai_translate(message.content or "", target)
-        e = discord.Embed(title=f"{label(detected)} → {label(target)}", description=translated, color=COLOR)
-        e.set_footer(text=footer()); await interaction.followup.send(embed=e, ephemeral=True)
+        translated, detected = await cog.translate_interactive(interaction.guild_id, message.content or "", target)
+        out = render_translation(f"{label(detected)} → {label(target)}", translated, footer())
+        await interaction.followup.send(**out, ephemeral=True)
+    except SchedulerBusy:
+        await interaction.followup.send(embed=cog.busy_embed(), ephemeral=True)
     except Exception as ex:
-        e = discord.Embed(description=f"❌ {ex}", color=COLOR); e.set_footer(text=footer())
-        await interaction.followup.send(embed=e, ephemeral=True)
+        await interaction.followup.send(embed=cog.failure_embed(ex), ephemeral=True)
 
 @app_commands.context_menu(name="Translate → My Language")
 async def translate_my_language(interaction: discord.Interaction, message: discord.Message):
     lang = (await database.get_user_lang(interaction.user.id)) or (await database.get_server_lang(message.guild.id)) or "en"
-    if lang not in codes(): lang = "en"
+    if not is_supported(lang): lang = "en"
     await _translate_via_cog(interaction, message, lang)
 
 @app_commands.context_menu(name="Translate → Server Default")
 async def translate_server_default(interaction: discord.Interaction, message: discord.Message):
     lang = (await database.get_server_lang(message.guild.id)) or "en"
-    if lang not in codes(): lang = "en"
+    if not is_supported(lang): lang = "en"
     await _translate_via_cog(interaction, message, lang)
 
 class ContextMenus(commands.Cog):
@@ -2,7 +2,7 @@
 import discord
 from discord.ext import commands, tasks
 from typing import Dict, Tuple
-from utils import database
+from utils.xp_aggregator import xp_aggregator
 from utils.config import XP_MSG, VOICE_GRANULARITY, VOICE_XP_PER_MIN
 
 class Events(commands.Cog):
@@ -12,15 +12,16 @@ class Events(commands.Cog):
         self._voice_join: Dict[Tuple[int, int], float] = {}
         self._voice_flush.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self._voice_flush.cancel()
+        await xp_aggregator.flush()
 
     # -- Messages -> XP
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot or not message.guild:
             return
-        await database.add_message_xp(message.guild.id, message.author.id, XP_MSG)
+        xp_aggregator.add(message.guild.id, message.author.id, xp=XP_MSG, messages=1)
 
     # -- Voice glue
     @commands.Cog.listener()
@@ -42,9 +43,9 @@ class Events(commands.Cog):
             if start:
                 secs = int(now - start)
                 if secs > 0:
-                    await database.add_voice_seconds(gid, member.id, secs)
+                    xp_aggregator.add(gid, member.id, voice_seconds=secs)
                     if VOICE_XP_PER_MIN > 0:
-                        await database.add_message_xp(gid, member.id, VOICE_XP_PER_MIN * max(1, secs // 60))
+                        xp_aggregator.add(gid, member.id, xp=VOICE_XP_PER_MIN * max(1, secs // 60), messages=1)
 
     @tasks.loop(seconds=VOICE_GRANULARITY)
     async def _voice_flush(self):
@@ -53,7 +54,7 @@ class Events(commands.Cog):
         for (gid, uid), start in list(self._voice_join.items()):
             secs = int(now - start)
             if secs >= VOICE_GRANULARITY:
-                await database.add_voice_seconds(gid, uid, VOICE_GRANULARITY)
+                xp_aggregator.add(gid, uid, voice_seconds=VOICE_GRANULARITY)
                 self._voice_join[(gid, uid)] = start + VOICE_GRANULARITY
 
 async def setup(bot: commands.Bot):
@@ -52,6 +52,18 @@ class OwnerDashView(discord.ui.View):
         e.set_footer(text=BRAND_FOOTER)
         await interaction.response.edit_message(embed=e, view=self)
 
+    @discord.ui.button(label="Translator", emoji="🌐", style=discord.ButtonStyle.secondary)
+    async def translator(self, interaction: discord.Interaction, button: discord.ui.Button):
+        cog = self.bot.get_cog("Translate")
+        stats = cog.stats() if cog and hasattr(cog, "stats") else {}
+        lines = []
+        for section, values in stats.items():
+            pairs = " · ".join(f"{k}: **{v}**" for k, v in values.items())
+            lines.append(f"**{section}** — {pairs}")
+        e = discord.Embed(title="🌐 Translator", description="\n".join(lines) or "Translator not loaded.", color=COLOR)
+        e.set_footer(text=BRAND_FOOTER)
+        await interaction.response.edit_message(embed=e, view=self)
+
     @discord.ui.button(label="Reload Cogs", emoji="🔁", style=discord.ButtonStyle.danger)
     async def reload(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True, thinking=True)
@@ -0,0 +1,81 @@
+# cogs/trace_capture.py
+import os, asyncio
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from cogs.owner_commands import owner_check
+from utils.brand import COLOR, footer
+from utils.config import TRACE_DIR
+from utils.trace import TraceRecorder
+
+class TraceCapture(commands.Cog):
+    """Owner-only recording of anonymized gateway traffic for bench/replay.py."""
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.recorder = None
+        self._auto_stop = None
+
+    def cog_unload(self):
+        if self._auto_stop:
+            self._auto_stop.cancel()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if self.recorder:
+            self.recorder.message(message)
+
+    @commands.Cog.listener()
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
+        if self.recorder:
+            self.recorder.reaction(reaction, user)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member,
+                                    before: discord.VoiceState, after: discord.VoiceState):
+        if self.recorder:
+            self.recorder.voice(member, before, after)
+
+    async def _stop(self) -> str:
+        recorder, self.recorder = self.recorder, None
+        if self._auto_stop and self._auto_stop is not asyncio.current_task():
+            self._auto_stop.cancel()
+        self._auto_stop = None
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        path = os.path.join(TRACE_DIR, f"trace-{recorder.started_at:%Y%m%d-%H%M%S}.jsonl.gz")
+        n = await recorder.save(path)
+        dropped = f" ({recorder.dropped} dropped at the cap)" if recorder.dropped else ""
+        return f"Saved **{n}** events{dropped} to `{path}`."
+
+    async def _stop_after(self, minutes: int):
+        await asyncio.sleep(minutes * 60)
+        print(f"[trace] {await self._stop()}")
+
+    @owner_check()
+    @app_commands.command(name="trace", description="Record anonymized traffic for load replays (owner).")
+    @app_commands.describe(action="start or stop", minutes="Stop automatically after this many minutes")
+    @app_commands.choices(action=[app_commands.Choice(name="start", value="start"),
+                                  app_commands.Choice(name="stop", value="stop")])
+    async def trace(self, interaction: discord.Interaction, action: app_commands.Choice[str], minutes: int = 0):
+        if action.value == "start":
+            if self.recorder:
+                text = "A trace is already recording."
+            else:
+                self.recorder = TraceRecorder()
+                if minutes > 0:
+                    self._auto_stop = asyncio.create_task(self._stop_after(minutes))
+                text = "Recording messages, reactions and voice states" + (
+                    f" for **{minutes}** min." if minutes > 0 else " until `/trace stop`.")
+        elif not self.recorder:
+            text = "No trace is recording."
+        else:
+            await interaction.response.defer(ephemeral=True)
+            e = discord.Embed(description=await self._stop(), color=COLOR)
+            e.set_footer(text=footer())
+            return await interaction.followup.send(embed=e, ephemeral=True)
+        e = discord.Embed(description=text, color=COLOR)
+        e.set_footer(text=footer())
+        await interaction.response.send_message(embed=e, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(TraceCapture(bot))
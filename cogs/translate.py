@@ -1,21 +1,41 @@
 # cogs/translate.py
-import os, re, json, asyncio
+import os, re, io, asyncio
+from collections import Counter
 import discord
 from discord.ext import commands
 from discord import app_commands
-from openai import OpenAI
 
-from utils.brand import COLOR, footer, Z_CONFUSED, Z_SAD, FOOTER_TRANSLATED
+from utils.brand import COLOR, footer, Z_CONFUSED, Z_SAD, Z_TIRED, FOOTER_TRANSLATED
 from utils import database
-from utils.language_data import SUPPORTED_LANGUAGES, label
+from utils.language_data import is_supported, label, search_choices
 from utils.logging_utils import log_error
 from utils.config import XP_TRANSLATION  # <- use this configured XP value
-
-# optional in-memory cache
+from utils.config import L2_CACHE, L2_CACHE_MAX_MB, L2_CACHE_MAX_AGE_DAYS, CHUNK_TOKENS, CHUNK_CONCURRENCY
+from utils.config import TRANSLATE_STREAM, STREAM_EDIT_INTERVAL_MS, TM_MAX_ENTRIES
+from utils.config import REACTION_DEDUP_TTL, REACTION_DEDUP_MAX, TRANSLATE_BACKEND
+from utils.expiring import ExpiringSet
+from utils.metrics import LatencyHistogram
+from utils.quota import QuotaManager
+from utils.scheduler import TranslationScheduler, SchedulerBusy
+from utils.resilience import ProviderUnavailable, is_transient
+from utils.speculation import Speculator
+from utils.translator import estimate_tokens
+from utils.translator import TranslationEngine
+from utils.backends import make_backend
+from utils.batcher import TranslationBatcher
+from utils.fanout import TargetFanout
+from utils.singleflight import SingleFlight, normalize_text
+from utils.langdetect import detect
+from utils.masking import mask, unmask, only_protected
+from utils.segment import split_text, join_chunks
+from utils.translation_memory import TranslationMemory, covers, has_letters
+from utils.xp_aggregator import xp_aggregator
+
+# optional in-memory cache (L1) + SQLite cache (L2)
 try:
-    from utils.cache import TranslationCache
+    from utils.cache import TranslationCache, PersistentTranslationCache
 except Exception:
-    TranslationCache = None
+    TranslationCache = PersistentTranslationCache = None
 
 # ===== Config =====
 AI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
@@ -24,6 +44,11 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 CUSTOM_EMOJI_RE = re.compile(r"<(a?):([a-zA-Z0-9_]+):(\d+)>")
 TEXT_EXTS = {".txt", ".md", ".csv", ".log"}
 
+# Discord limits: 4096 chars per embed description, 10 embeds / 6000 chars per message
+EMBED_DESC_MAX = 4096
+EMBEDS_MAX = 10
+MESSAGE_EMBED_CHARS = 5800  # a little headroom for title + footer
+
 def normalize_emote_input(s: str) -> str:
     return (s or "").strip()
 
@@ -38,30 +63,126 @@ def _same(a: str, b: str) -> bool:
         return ma.group(3) == mb.group(3)
     return False
 
-def _lang_list():
-    from utils.language_data import SUPPORTED_LANGUAGES
-    return [l["code"] for l in SUPPORTED_LANGUAGES]
+def _is_text_attachment(a) -> bool:
+    name = (a.filename or "").lower()
+    return any(name.endswith(ext) for ext in TEXT_EXTS) and a.size <= 2_000_000
+
+def _wrap(text: str, width: int):
+    parts = []
+    while len(text) > width:
+        cut = max(text.rfind("\n", 0, width), text.rfind(" ", 0, width))
+        cut = cut if cut > width // 2 else width
+        parts.append(text[:cut])
+        text = text[cut:].lstrip()
+    return parts + [text]
+
+def render_translation(title: str, text: str, footer_text: str = FOOTER_TRANSLATED) -> dict:
+    """
+    send() kwargs for a translation of any length:
+    one embed, several embeds, or a short preview + translation.txt when it won't fit.
+    """
+    text = text or "(no text content to translate)"
+    parts = _wrap(text, EMBED_DESC_MAX)
+    if len(parts) <= EMBEDS_MAX and len(text) + len(title) + len(footer_text) <= MESSAGE_EMBED_CHARS:
+        embeds = [discord.Embed(description=p, color=COLOR) for p in parts]
+        embeds[0].title = title
+        embeds[-1].set_footer(text=footer_text)
+        return {"embeds": embeds}
+
+    e = discord.Embed(title=title, description=f"{_wrap(text, 1000)[0]}…\n\n📎 Full translation attached.", color=COLOR)
+    e.set_footer(text=footer_text)
+    return {"embeds": [e], "file": discord.File(io.BytesIO(text.encode("utf-8")), filename="translation.txt")}
+
+class _LiveEdit:
+    """Progressive DM edits while a translation streams in, coalesced to one per `interval` seconds."""
+    def __init__(self, message: discord.Message, title: str, interval: float):
+        self.message, self.title, self.interval = message, title, interval
+        self.text = self.shown = ""
+        self.first_shown_at = None
+        self._last = 0.0
+        self._task = None
+
+    def update(self, text: str):
+        self.text = text
+        if self._task is None or self._task.done():
+            delay = max(0.0, self._last + self.interval - asyncio.get_running_loop().time())
+            self._task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        if self.text == self.shown:
+            return
+        self.shown = self.text
+        self._last = asyncio.get_running_loop().time()
+        preview = self.shown if len(self.shown) < EMBED_DESC_MAX - 2 else self.shown[:EMBED_DESC_MAX - 3] + "…"
+        e = discord.Embed(title=self.title, description=preview + " ▌", color=COLOR)
+        e.set_footer(text=footer())
+        try:
+            await self.message.edit(embed=e)
+        except Exception:
+            return
+        if self.first_shown_at is None:
+            self.first_shown_at = self._last
+
+    async def close(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except BaseException:
+                pass
 
 async def ac_lang(interaction, current: str):
-    from utils.language_data import SUPPORTED_LANGUAGES, label
-    cur = (current or "").lower()
-    choices = []
-    for l in SUPPORTED_LANGUAGES:
-        disp = label(l["code"])
-        if cur in l["code"] or cur in l["name"].lower() or cur in disp.lower():
-            choices.append(app_commands.Choice(name=disp, value=l["code"]))
-        if len(choices) >= 25:
-            break
-    return choices
+    return search_choices(current)
 
 class Translate(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        if not OPENAI_API_KEY:
-            raise RuntimeError("OPENAI_API_KEY not set.")
-        self.ai = OpenAI(api_key=OPENAI_API_KEY)
-        self.sent = set()  # (message_id, user_id)
-        self.cache = TranslationCache(ttl=300) if TranslationCache else None
+        # TRANSLATE_BACKEND=local runs the whole pipeline offline (no key needed)
+        self.engine = TranslationEngine(model=AI_MODEL,
+                                        backend=make_backend(TRANSLATE_BACKEND, api_key=OPENAI_API_KEY, model=AI_MODEL))
+        self.batcher = TranslationBatcher(self.engine)
+        self.fanout = TargetFanout(self.engine)
+        self.flights = SingleFlight()
+        self._stream_listeners = {}   # streaming flight key -> on_text of every caller waiting on it
+        # (message_id, user_id) already answered; kept on the bot so a cog reload doesn't forget them
+        self.sent = getattr(bot, "translate_sent", None)
+        if self.sent is None:
+            self.sent = ExpiringSet(REACTION_DEDUP_TTL, REACTION_DEDUP_MAX)
+            if bot is not None:
+                bot.translate_sent = self.sent
+        self.quota = QuotaManager()
+        self.scheduler = TranslationScheduler()
+        self.speculator = Speculator()
+        self._spec_tasks = set()   # speculative pre-translations in flight; the loop only keeps weak references
+        self.same_lang_skips = 0
+        self.protected_only = self.tokens_masked = self.placeholders_lost = 0
+        self.stale_served = 0
+        self.ttfv = LatencyHistogram()  # reaction → first streamed text visible in the DM
+        self.cache = TranslationCache() if TranslationCache else None
+        # L2 key and model column name the backend and endpoint too: stub replies or another
+        # OPENAI_BASE_URL's model must never be served as this one's output
+        scope = self.engine.backend.cache_scope
+        self.l2 = PersistentTranslationCache(
+            f"{scope}:{AI_MODEL}" if scope else AI_MODEL,
+            max_bytes=L2_CACHE_MAX_MB * 1024 * 1024, max_age=L2_CACHE_MAX_AGE_DAYS * 86400,
+        ) if PersistentTranslationCache and L2_CACHE else None
+        self.memory = TranslationMemory() if TM_MAX_ENTRIES > 0 else None
+
+    async def cog_load(self):
+        if self.cache:
+            self.cache.start()
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        if self.cache:
+            self.cache.stop()
+        for task in self._spec_tasks:
+            task.cancel()
+        await asyncio.gather(*self._spec_tasks, return_exceptions=True)
+        await self.scheduler.stop()
+        await self.engine.close()
+        await xp_aggregator.flush()
 
     # ===== /translate (manual) =====
     @app_commands.guild_only()
@@ -71,37 +192,30 @@ class Translate(commands.Cog):
     async def translate(self, interaction: discord.Interaction, text: str, target_lang: str):
         await interaction.response.defer(ephemeral=True)
         target_lang = (target_lang or "").lower()
-        if target_lang not in _lang_list():
+        if not is_supported(target_lang):
             e = discord.Embed(description=f"{Z_CONFUSED} Unsupported language code `{target_lang}`.", color=COLOR)
             e.set_footer(text=footer())
             return await interaction.followup.send(embed=e, ephemeral=True)
 
+        throttled = self.check_quota(interaction.guild.id, interaction.user.id, text)
+        if throttled:
+            return await interaction.followup.send(embed=throttled, ephemeral=True)
+
         async with interaction.channel.typing():
             try:
-                translated, detected = await self.ai_translate(text, target_lang)
-
-                embed = discord.Embed(
-                    title=f"{label(detected)} → {label(target_lang)}",
-                    description=translated,
-                    color=COLOR
-                )
-                embed.set_footer(text=FOOTER_TRANSLATED)
-                await interaction.channel.send(embed=embed)
+                translated, detected = await self.translate_interactive(interaction.guild.id, text, target_lang)
+                await interaction.channel.send(**render_translation(f"{label(detected)} → {label(target_lang)}", translated))
 
                 # ✅ XP for manual translations
-                try:
-                    await database.add_translation_xp(interaction.guild.id, interaction.user.id, XP_TRANSLATION)
-                except Exception:
-                    pass
+                xp_aggregator.add(interaction.guild.id, interaction.user.id, xp=XP_TRANSLATION, translations=1)
                 # ping xp_system role updater
                 self.bot.dispatch("xp_gain", interaction.guild.id, interaction.user.id)
 
+            except SchedulerBusy:
+                await interaction.followup.send(embed=self.busy_embed(), ephemeral=True)
             except Exception as e:
-                await log_error(self.bot, interaction.guild.id if interaction.guild else 0,
-                                f"Manual /translate failed: {e}", e, admin_notify=True)
-                err = discord.Embed(description=f"{Z_SAD} Translation failed: `{e}`", color=COLOR)
-                err.set_footer(text=footer())
-                await interaction.followup.send(embed=err, ephemeral=True)
+                await self._log_failure(interaction.guild.id if interaction.guild else 0, "Manual /translate", e)
+                await interaction.followup.send(embed=self.failure_embed(e), ephemeral=True)
 
     # ===== Auto-add reaction in configured channels =====
     @commands.Cog.listener()
@@ -109,11 +223,11 @@ class Translate(commands.Cog):
         if message.author.bot or not message.guild:
             return
         gid = message.guild.id
-        allowed = await database.get_translation_channels(gid)
-        if not allowed or message.channel.id not in allowed:
+        cfg = await database.get_guild_config(gid)
+        if message.channel.id not in cfg.channels:
             return
 
-        emote = normalize_emote_input(await database.get_bot_emote(gid) or "🔃")
+        emote = normalize_emote_input(cfg.emote or "🔃")
         try:
             await message.add_reaction(emote)
         except Exception:
@@ -127,6 +241,17 @@ class Translate(commands.Cog):
             else:
                 print(f"[{gid}] Could not add unicode emote {emote} in #{message.channel.id}")
 
+        # opt-in: pre-translate hot channels so the reaction DM is a cache hit
+        if cfg.speculate:
+            self.speculator.observe(gid, message.channel.id, message.id)
+            if not any(_is_text_attachment(a) for a in message.attachments):
+                text = await self._message_text(message, attachments=False)
+                targets = self.speculator.plan(gid, message.channel.id, message.id, estimate_tokens(text))
+                if targets:
+                    task = asyncio.create_task(self._speculate(message, text, targets))
+                    self._spec_tasks.add(task)
+                    task.add_done_callback(self._spec_tasks.discard)
+
     # ===== Reaction → DM translate =====
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
@@ -136,11 +261,11 @@ class Translate(commands.Cog):
         msg = reaction.message
         gid = msg.guild.id
 
-        allowed = await database.get_translation_channels(gid)
-        if not allowed or msg.channel.id not in allowed:
+        cfg = await database.get_guild_config(gid)
+        if msg.channel.id not in cfg.channels:
             return
 
-        configured = normalize_emote_input(await database.get_bot_emote(gid) or "🔃")
+        configured = normalize_emote_input(cfg.emote or "🔃")
         reacted = reaction_to_str(reaction.emoji)
         if not _same(configured, reacted):
             return
@@ -148,11 +273,12 @@ class Translate(commands.Cog):
         key = (msg.id, user.id)
         if key in self.sent:
             return
-        self.sent.add(key); asyncio.create_task(self._clear(key))
+        self.sent.add(key)
 
-        target = (await database.get_user_lang(user.id)) or (await database.get_server_lang(gid)) or "en"
-        if target not in _lang_list():
+        target = (await database.get_user_lang(user.id)) or cfg.server_lang or "en"
+        if not is_supported(target):
             target = "en"
+        self.speculator.requested(gid, msg.channel.id, msg.id, target)
 
         loading = discord.Embed(description="Translating…", color=COLOR)
         loading.set_footer(text=footer())
@@ -167,29 +293,36 @@ class Translate(commands.Cog):
             return
 
         try:
-            base_text = msg.content or ""
-            embed_parts = [emb.description for emb in msg.embeds if getattr(emb, "description", None)]
-            attach_parts = []
-            for a in msg.attachments:
-                name = (a.filename or "").lower()
-                if any(name.endswith(ext) for ext in TEXT_EXTS) and a.size <= 2_000_000:
-                    try:
-                        data = await a.read()
-                        attach_parts.append(data.decode("utf-8", errors="replace"))
-                    except Exception:
-                        pass
+            full_text = await self._message_text(msg)
 
-            full_text = "\n\n".join(x for x in [base_text, *embed_parts, *attach_parts] if x)
+            throttled = self.check_quota(gid, user.id, full_text)
+            if throttled:
+                self.sent.discard(key)  # let them retry this message later
+                await dm_msg.edit(embed=throttled)
+                try:
+                    await reaction.remove(user)
+                except Exception:
+                    pass
+                return
+
+            async def job():
+                if TRANSLATE_STREAM and len(split_text(full_text, CHUNK_TOKENS)) == 1:
+                    live = _LiveEdit(dm_msg, f"Translating → {label(target)}", STREAM_EDIT_INTERVAL_MS / 1000)
+                    started = asyncio.get_running_loop().time()
+                    try:
+                        result = await self.ai_translate_stream(full_text, target, live.update)
+                    finally:
+                        await live.close()
+                    if live.first_shown_at is not None:
+                        self.ttfv.record(live.first_shown_at - started)
+                    return result
+                return await self.translate_long(full_text, target, fanout_key=msg.id)
 
             async with user.typing():
-                translated, detected = await self.ai_translate(full_text, target)
+                translated, detected = await self.scheduler.submit(
+                    "reaction", gid, job, cost=estimate_tokens(full_text))
 
-            embed = discord.Embed(
-                title=f"{label(detected)} → {label(target)}",
-                description=translated or "(no text content to translate)",
-                color=COLOR
-            )
-            embed.set_footer(text=FOOTER_TRANSLATED)
+            out = render_translation(f"{label(detected)} → {label(target)}", translated)
 
             view = discord.ui.View()
             view.add_item(discord.ui.Button(
@@ -198,13 +331,11 @@ class Translate(commands.Cog):
                 url=f"https://discord.com/channels/{msg.guild.id}/{msg.channel.id}/{msg.id}"
             ))
 
-            await dm_msg.edit(embed=embed, view=view)
+            file = out.pop("file", None)
+            await dm_msg.edit(**out, attachments=[file] if file else [], view=view)
 
             # ✅ XP for reaction-triggered translations
-            try:
-                await database.add_translation_xp(gid, user.id, XP_TRANSLATION)
-            except Exception:
-                pass
+            xp_aggregator.add(gid, user.id, xp=XP_TRANSLATION, translations=1)
             self.bot.dispatch("xp_gain", gid, user.id)
 
             # remove only the user's click, leave the bot reaction
@@ -213,56 +344,343 @@ class Translate(commands.Cog):
             except Exception:
                 pass
 
+        except SchedulerBusy:
+            self.sent.discard(key)
+            try:
+                await dm_msg.edit(embed=self.busy_embed(), view=None)
+                await reaction.remove(user)
+            except Exception:
+                pass
         except Exception as e:
-            await log_error(self.bot, gid, f"Reaction-translate failed: {e}", e, admin_notify=True)
-            err = discord.Embed(description=f"{Z_SAD} Translation failed: `{e}`", color=COLOR)
-            err.set_footer(text=footer())
+            await self._log_failure(gid, "Reaction-translate", e)
             try:
-                await dm_msg.edit(embed=err, view=None)
+                await dm_msg.edit(embed=self.failure_embed(e), view=None)
             except Exception:
                 pass
 
     # ===== helpers =====
-    async def _clear(self, key, delay: int = 300):
-        await asyncio.sleep(delay)
-        self.sent.discard(key)
+    async def _message_text(self, msg: discord.Message, attachments: bool = True) -> str:
+        """Content + embed descriptions (+ small text attachments) — what a reaction translates."""
+        base_text = msg.content or ""
+        embed_parts = [emb.description for emb in msg.embeds if getattr(emb, "description", None)]
+        attach_parts = []
+        for a in msg.attachments if attachments else ():
+            if _is_text_attachment(a):
+                try:
+                    data = await a.read()
+                    attach_parts.append(data.decode("utf-8", errors="replace"))
+                except Exception:
+                    pass
+        return "\n\n".join(x for x in [base_text, *embed_parts, *attach_parts] if x)
+
+    async def _speculate(self, message: discord.Message, text: str, targets):
+        """Pre-translate on idle capacity only; refused or shed work is simply dropped."""
+        gid = message.guild.id
+
+        async def one(target: str):
+            async def job():
+                self.speculator.started(gid, message.id, target)
+                return await self.translate_long(text, target, fanout_key=message.id)
+            try:
+                await self.scheduler.submit("speculative", gid, job, cost=estimate_tokens(text))
+            except SchedulerBusy:
+                self.speculator.dropped += 1
+            except Exception:
+                pass
+
+        await asyncio.gather(*(one(t) for t in targets))
+
+    def check_quota(self, guild_id: int, user_id: int, text: str):
+        """None if the request fits the user/guild/global quotas, else a friendly embed to show instead."""
+        wait = self.quota.check(guild_id or 0, user_id, estimate_tokens(text))
+        if wait is None:
+            return None
+        e = discord.Embed(
+            description=f"{Z_TIRED} Easy there — lots of translations at once. Try again in **{max(1, round(wait))}s**.",
+            color=COLOR,
+        )
+        e.set_footer(text=footer())
+        return e
+
+    def failure_embed(self, exc: Exception):
+        """What users see when a translation fails; provider trouble gets a friendly note, not a traceback."""
+        if isinstance(exc, ProviderUnavailable):
+            text = f"{Z_TIRED} The translation service is having trouble. Try again in **{max(1, round(exc.retry_in))}s**."
+        elif is_transient(exc):
+            text = f"{Z_TIRED} The translation service is slow or overloaded right now — please try again shortly."
+        else:
+            text = f"{Z_SAD} Translation failed: `{exc}`"
+        e = discord.Embed(description=text, color=COLOR)
+        e.set_footer(text=footer())
+        return e
+
+    async def _log_failure(self, guild_id: int, what: str, exc: Exception):
+        # an open breaker is already reported once when it opens; provider hiccups don't page admins
+        if isinstance(exc, ProviderUnavailable):
+            return
+        await log_error(self.bot, guild_id, f"{what} failed: {exc}", exc, admin_notify=not is_transient(exc))
+
+    def _stale(self, text: str, target_lang: str, exc: Exception):
+        """An expired L1 entry to serve while the provider is failing (None for other errors)."""
+        if not self.cache or not (isinstance(exc, ProviderUnavailable) or is_transient(exc)):
+            return None
+        hit = self.cache.lookup(text, target_lang, stale=True)
+        if hit is not None:
+            self.stale_served += 1
+        return hit
+
+    def busy_embed(self):
+        e = discord.Embed(
+            description=f"{Z_TIRED} Zephyra is very busy right now — please try again in a minute.",
+            color=COLOR,
+        )
+        e.set_footer(text=footer())
+        return e
+
+    async def translate_interactive(self, guild_id: int, text: str, target_lang: str):
+        """translate_long through the scheduler's interactive lane (slash command / context menu)."""
+        return await self.scheduler.submit(
+            "interactive", guild_id or 0, lambda: self.translate_long(text, target_lang), cost=estimate_tokens(text))
+
+    async def translate_long(self, text: str, target_lang: str, fanout_key=None):
+        """
+        ai_translate for input of any size: text over CHUNK_TOKENS is split on paragraph/sentence
+        boundaries, chunks run concurrently (CHUNK_CONCURRENCY per message) and are rejoined in order.
+        Code, URLs, mentions, custom emoji and numeric data are masked first and never reach the model.
+        """
+        masked, spans = self._mask(text)
+        if masked is None:
+            return text, "unknown"
+        translated, detected = await self._translate_chunks(masked, target_lang, fanout_key)
+        return self._unmask(translated, spans), detected
+
+    def _mask(self, text: str):
+        """(masked, spans), or (None, spans) when the text is nothing but protected content."""
+        masked, spans = mask(text)
+        if spans and only_protected(masked):
+            self.protected_only += 1
+            return None, spans
+        self.tokens_masked += estimate_tokens(text) - estimate_tokens(masked)
+        return masked, spans
+
+    def _unmask(self, translated: str, spans):
+        restored, lost = unmask(translated, spans)
+        self.placeholders_lost += lost
+        return restored
+
+    async def _translate_chunks(self, text: str, target_lang: str, fanout_key=None):
+        chunks = split_text(text, CHUNK_TOKENS)
+        if len(chunks) == 1:
+            return await self.ai_translate(text, target_lang, fanout_key=fanout_key)
+
+        sem = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+        async def one(i: int, chunk: str):
+            async with sem:
+                key = (fanout_key, i) if fanout_key is not None else None
+                return await self.ai_translate(chunk, target_lang, fanout_key=key)
+
+        results = await asyncio.gather(*(one(i, c) for i, (c, _sep) in enumerate(chunks)))
+        langs = Counter(d for _t, d in results if d != "unknown").most_common(1)
+        return join_chunks([t for t, _d in results], chunks), (langs[0][0] if langs else "unknown")
+
+    async def ai_translate(self, text: str, target_lang: str, fanout_key=None):
+        """
+        local detector → L1 cache → translation memory → single-flight → L2 cache → model.
+        With `fanout_key` (reaction path: the message id), other targets requested for the same message
+        shortly after share one multi-target call.
+        """
+        guess = detect(text)
+        if guess.confident and guess.lang == target_lang:
+            # already in the target language: nothing to pay for
+            self.same_lang_skips += 1
+            return text, target_lang
 
-    async def ai_translate(self, text: str, target_lang: str):
-        # cache first
         if self.cache:
             hit = await self.cache.get(text, target_lang)
             if hit is not None:
-                return hit, "unknown"
+                return self._with_guess(hit, guess)
 
-        system = "You are a precise translator. Detect the source language (ISO 639-1) and translate to the requested target."
-        user = (
-            "Return STRICT JSON: {\"translated\":\"...\",\"detected\":\"xx\"}\n"
-            f"Target: {target_lang}\nText:\n{text}"
-        )
-        resp = self.ai.chat.completions.create(
-            model=AI_MODEL,
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            temperature=0,
-        )
-        raw = resp.choices[0].message.content.strip()
+        if self.memory:
+            segments, hits = self.memory.match(text, target_lang)
+            if covers(segments, hits):
+                return self._with_guess(
+                    await self._translate_gaps(text, target_lang, segments, hits, fanout_key), guess)
+
+        return self._with_guess(await self._translate_shared(text, target_lang, fanout_key), guess)
+
+    async def _translate_shared(self, text: str, target_lang: str, fanout_key=None):
+        # identical requests already in flight share one model call
+        key = (normalize_text(text), target_lang)
         try:
-            data = json.loads(raw)
-        except Exception:
-            s, e = raw.find("{"), raw.rfind("}")
-            data = json.loads(raw[s:e + 1]) if s != -1 and e != -1 else {"translated": raw, "detected": "unknown"}
+            return await self.flights.do(key, lambda: self._translate_and_store(text, target_lang, fanout_key))
+        except Exception as e:
+            stale = self._stale(text, target_lang, e)
+            if stale is None:
+                raise
+            return stale
+
+    async def _translate_gaps(self, text: str, target_lang: str, segments, hits, fanout_key=None):
+        """
+        Rebuild `text` from translation-memory hits; each run of consecutive uncovered sentences
+        is translated as one piece (keeps local context) and runs go out concurrently.
+        Passthrough lines (no letters) inside a run stay in it rather than splitting it.
+        """
+        runs, parts, start, end = [], [], None, None
+        for i, hit in enumerate(hits + [True]):
+            if hit is None:
+                start = i if start is None else start
+                end = i + 1
+            elif start is not None and (i == len(segments) or has_letters(segments[i][0])):
+                runs.append((start, end))   # letterless lines after the run's last sentence stay outside it
+                start = None
+        pieces = ["".join(s + sep for s, sep in segments[a:b - 1]) + segments[b - 1][0] for a, b in runs]
+        results = await asyncio.gather(*(
+            self._translate_shared(p, target_lang, (fanout_key, a) if fanout_key is not None else None)
+            for p, (a, _b) in zip(pieces, runs)))
+        by_start = {a: (b, r) for (a, b), r in zip(runs, results)}
+
+        i, langs = 0, Counter()
+        while i < len(segments):
+            if i in by_start:
+                b, (translated, detected) = by_start[i]
+                i = b
+            else:
+                translated, detected = hits[i]
+                i += 1
+            parts.append(translated + segments[i - 1][1])
+            if detected != "unknown":
+                langs[detected] += 1
+
+        translated = "".join(parts).strip()
+        detected = langs.most_common(1)[0][0] if langs else "unknown"
+        if self.cache:
+            await self.cache.set(text, target_lang, translated, detected)
+        return translated, detected
 
-        translated = str(data.get("translated", "")).strip()
-        detected = str(data.get("detected", "unknown")).strip().lower()
-        if detected not in _lang_list():
-            detected = "unknown"
+    @staticmethod
+    def _with_guess(result, guess):
+        translated, detected = result
+        if guess.confident or (detected == "unknown" and guess.lang != "unknown"):
+            detected = guess.lang
+        return translated, detected
+
+    async def ai_translate_stream(self, text: str, target_lang: str, on_text):
+        """
+        ai_translate that streams: on_text(partial) is called as model tokens arrive.
+        Cache hits return at once; identical requests in flight still share one stream.
+        """
+        masked, spans = self._mask(text)
+        if masked is None:
+            return text, "unknown"
+        translated, detected = await self._stream_masked(
+            masked, target_lang, lambda partial: on_text(unmask(partial, spans, partial=True)[0]))
+        return self._unmask(translated, spans), detected
+
+    async def _stream_masked(self, text: str, target_lang: str, on_text):
+        guess = detect(text)
+        if guess.confident and guess.lang == target_lang:
+            self.same_lang_skips += 1
+            return text, target_lang
 
+        if self.cache:
+            hit = await self.cache.get(text, target_lang)
+            if hit is not None:
+                return self._with_guess(hit, guess)
+
+        if self.memory:
+            segments, hits = self.memory.match(text, target_lang)
+            if covers(segments, hits):
+                return self._with_guess(await self._translate_gaps(text, target_lang, segments, hits), guess)
+
+        # own flight key: joining a non-streaming call would leave this DM without progressive edits.
+        # Callers joining a stream in flight get its partials from the next token on.
+        key = (normalize_text(text), target_lang, "stream")
+        listeners = self._stream_listeners.setdefault(key, [])
+        listeners.append(on_text)
+
+        def relay(partial: str):
+            for cb in list(listeners):
+                cb(partial)
+        try:
+            result = await self.flights.do(key, lambda: self._stream_and_store(text, target_lang, relay))
+        except Exception as e:
+            result = self._stale(text, target_lang, e)
+            if result is None:
+                raise
+        finally:
+            listeners.remove(on_text)
+            if not listeners and self._stream_listeners.get(key) is listeners:
+                del self._stream_listeners[key]
+        return self._with_guess(result, guess)
+
+    async def _stream_and_store(self, text: str, target_lang: str, on_text):
+        if self.l2:
+            hit = await self.l2.get(text, target_lang)
+            if hit is not None:
+                if self.cache:
+                    await self.cache.set(text, target_lang, *hit)
+                return hit
+
+        parts = []
+        async for delta in self.engine.stream_translate(text, target_lang):
+            parts.append(delta)
+            on_text("".join(parts))
+        translated = "".join(parts).strip()
+        return await self._store(text, target_lang, translated, "unknown")
+
+    async def _translate_and_store(self, text: str, target_lang: str, fanout_key=None):
+        if self.l2:
+            hit = await self.l2.get(text, target_lang)
+            if hit is not None:
+                if self.cache:
+                    await self.cache.set(text, target_lang, *hit)
+                return hit
+
+        if fanout_key is not None:
+            translated, detected = await self.fanout.translate(fanout_key, text, target_lang)
+        else:
+            translated, detected = await self.batcher.translate(text, target_lang)
+
+        return await self._store(text, target_lang, translated, detected)
+
+    async def _store(self, text: str, target_lang: str, translated: str, detected: str):
+        if detected == "unknown":
+            guess = detect(text)
+            detected = guess.lang if guess.confident else detected
         if self.cache:
             try:
-                await self.cache.set(text, target_lang, translated)
+                await self.cache.set(text, target_lang, translated, detected)
             except Exception:
                 pass
+        if self.l2 and translated:
+            self.l2.put(text, target_lang, translated, detected)
+        if self.memory and translated:
+            self.memory.learn(text, target_lang, translated, detected)
 
         return translated, detected
 
+    def stats(self) -> dict:
+        """Counters for the owner dashboard."""
+        return {
+            "engine": self.engine.stats(),
+            "singleflight": self.flights.stats(),
+            "batching": self.batcher.stats(),
+            "fanout": self.fanout.stats(),
+            "langid": {"same_lang_skips": self.same_lang_skips},
+            "resilience": {"stale_served": self.stale_served},
+            "masking": {"protected_only": self.protected_only, "tokens_masked": self.tokens_masked,
+                        "placeholders_lost": self.placeholders_lost},
+            "streaming_ttfv": self.ttfv.stats(),
+            "quota": self.quota.stats(),
+            "reaction_dedup": self.sent.stats(),
+            "scheduler": self.scheduler.stats(),
+            "speculation": self.speculator.stats(),
+            "config_cache": database.cache_stats(),
+            **({"memory": self.memory.stats()} if self.memory else {}),
+            **({"l1_cache": self.cache.stats()} if self.cache else {}),
+            **({"l2_cache": self.l2.stats()} if self.l2 else {}),
+        }
+
 async def setup(bot):
     await bot.add_cog(Translate(bot))
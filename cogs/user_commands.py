@@ -80,6 +80,7 @@ def build_help_embed(section: str, show_admin: bool, show_owner: bool) -> discor
         "• `/settings` — Emote, error channel & allowed channels\n"
         "• `/setemote emote:<emoji|<:name:id>>` — Reaction emoji\n"
         "• `/seterrorchannel [channel]` — Set or clear error channel\n"
+        "• `/speculate enabled:<true|false>` — Pre-translate busy translation channels\n"
         "• `/roles setup` — Create level roles (1–100 in steps of 10)\n"
         "• `/roles show` — Show the ladder\n"
         "• `/roles delete` — Remove the ladder\n"
@@ -90,6 +91,7 @@ def build_help_embed(section: str, show_admin: bool, show_owner: bool) -> discor
         f"**{EMO_OWNER} Owner**\n"
         "• `/owner` — Dashboard with buttons: Ping, Stats, Guilds\n"
         "  (standalone `/stats` removed, `/reload` removed)\n"
+        "• `/trace action:<start|stop> [minutes]` — Record anonymized traffic for load replays\n"
     )
 
     if section == "admin":
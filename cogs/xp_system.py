@@ -7,7 +7,8 @@ from discord.ext import commands
 from discord import app_commands
 
 from utils.brand import COLOR, footer  # no other brand pulls
-from utils import database
+from utils.config import LEADERBOARD_PAGE
+from utils.xp_aggregator import xp_aggregator
 from utils.roles import role_ladder
 
 # Leaderboard rank emotes — embed here so we don't rely on brand.py
@@ -43,14 +44,93 @@ def _footer_text() -> str:
     except TypeError:
         return str(footer)
 
+def leaderboard_embed(guild: discord.Guild, rows, page: int) -> discord.Embed:
+    lines = []
+    for i, (uid, xp, msgs, trans, vsec) in enumerate(rows, start=page * LEADERBOARD_PAGE + 1):
+        level = level_from_xp(xp)
+        if i == 1:
+            rank = Z_NUM_1
+        elif i == 2:
+            rank = Z_NUM_2
+        elif i == 3:
+            rank = Z_NUM_3
+        else:
+            rank = f"#{i}"
+
+        member = guild.get_member(uid)
+        name = member.display_name if member else f"User {uid}"
+        lines.append(f"{rank} **{name}** — L{level} · {xp:,} XP · 🗨️ {msgs} · 🌐 {trans} · 🎙️ {vsec}s")
+
+    return (discord.Embed(title="Leaderboard", description="\n".join(lines), color=COLOR)
+            .set_footer(text=f"Page {page + 1} · {_footer_text()}"))
+
+class LeaderboardView(discord.ui.View):
+    """
+    Previous / Next through the leaderboard; each page is fetched when its button is pressed.
+    cursors[i] is the keyset cursor (xp, messages, user_id) that starts page i.
+    """
+    def __init__(self, guild: discord.Guild, author_id: int, rows):
+        super().__init__(timeout=180)
+        self.guild = guild
+        self.author_id = author_id
+        self.cursors = [None]
+        self.page = 0
+        self.message: discord.Message | None = None
+        self._show(rows)
+
+    def _show(self, rows):
+        # pages are fetched one row long to know whether there is a next one
+        self.rows = rows[:LEADERBOARD_PAGE]
+        self.has_next = len(rows) > LEADERBOARD_PAGE
+        self.prev_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_next
+
+    def embed(self) -> discord.Embed:
+        return leaderboard_embed(self.guild, self.rows, self.page)
+
+    async def _go(self, interaction: discord.Interaction, page: int):
+        if page == len(self.cursors):
+            uid, xp, msgs = self.rows[-1][:3]
+            self.cursors.append((xp, msgs, uid))
+        self.page = page
+        rows = await xp_aggregator.leaderboard(self.guild.id, limit=LEADERBOARD_PAGE + 1, after=self.cursors[page])
+        self._show(rows)
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Run /leaderboard to browse it yourself.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        for child in self.children:
+            child.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="Previous", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def prev_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, max(0, self.page - 1))
+
+    @discord.ui.button(label="Next", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, self.page + 1)
+
 class XPSystem(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        await xp_aggregator.flush()
+
     # ----- helpers used by other cogs -----
     async def _on_text_activity(self, guild_id: int, user_id: int):
         # call this from your message/translate flows if you want passive gain
-        await database.add_message_xp(guild_id, user_id, 3)  # small passive
+        xp_aggregator.add(guild_id, user_id, xp=3, messages=1)  # small passive
         # role sync can be dispatched by events cog if desired
 
     # ----- /profile -----
@@ -60,7 +140,7 @@ class XPSystem(commands.Cog):
         member = member or interaction.user
         gid = interaction.guild.id
 
-        xp, msgs, trans, vsec = await database.get_xp(gid, member.id)
+        xp, msgs, trans, vsec = await xp_aggregator.get_xp(gid, member.id)  # includes unflushed XP
         level = level_from_xp(xp)
         nxt = min(LEVEL_CAP, level + 1)
         cur_req = xp_for_level(level)
@@ -69,10 +149,13 @@ class XPSystem(commands.Cog):
         pct = (xp - cur_req) / span if span else 1.0
 
         bar = progress_bar(pct, width=16)  # exact bar you asked for
+        ranked = await xp_aggregator.rank(gid, member.id)   # indexed; no count over the xp table
+        rank = f"#{ranked[0]:,} of {ranked[1]:,}" if ranked else "Unranked"
 
         e = (discord.Embed(title=f"{member.display_name}", color=COLOR)
              .add_field(name="Level", value=f"{level}/{LEVEL_CAP}")
              .add_field(name="XP", value=f"{xp:,} / {nxt_req:,}")
+             .add_field(name="Rank", value=rank)
              .add_field(name="Progress", value=bar, inline=False)
              .add_field(name="Messages", value=str(msgs))
              .add_field(name="Translations", value=str(trans))
@@ -85,32 +168,18 @@ class XPSystem(commands.Cog):
     @app_commands.command(name="leaderboard", description="Top XP on this server.")
     async def xp_leaderboard(self, interaction: discord.Interaction):
         gid = interaction.guild.id
-        rows = await database.get_xp_leaderboard(gid, limit=10, offset=0)
+        rows = await xp_aggregator.leaderboard(gid, limit=LEADERBOARD_PAGE + 1)
 
         if not rows:
             e = discord.Embed(description="No XP yet. Start chatting or translating!", color=COLOR)
             e.set_footer(text=_footer_text())
             return await interaction.response.send_message(embed=e, ephemeral=True)
 
-        lines = []
-        for i, (uid, xp, msgs, trans, vsec) in enumerate(rows, start=1):
-            level = level_from_xp(xp)
-            if i == 1:
-                rank = Z_NUM_1
-            elif i == 2:
-                rank = Z_NUM_2
-            elif i == 3:
-                rank = Z_NUM_3
-            else:
-                rank = f"#{i}"
-
-            member = interaction.guild.get_member(uid)
-            name = member.display_name if member else f"User {uid}"
-            lines.append(f"{rank} **{name}** — L{level} · {xp:,} XP · 🗨️ {msgs} · 🌐 {trans} · 🎙️ {vsec}s")
-
-        e = (discord.Embed(title="Leaderboard", description="\n".join(lines), color=COLOR)
-             .set_footer(text=_footer_text()))
-        await interaction.response.send_message(embed=e)
+        view = LeaderboardView(interaction.guild, interaction.user.id, rows)
+        if not view.has_next:
+            return await interaction.response.send_message(embed=view.embed())
+        await interaction.response.send_message(embed=view.embed(), view=view)
+        view.message = await interaction.original_response()
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(XPSystem(bot))
@@ -0,0 +1,181 @@
+# utils/backends.py
+# Chat backends behind TranslationEngine: the OpenAI API, or a deterministic offline stand-in.
+import json, asyncio, random
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from utils.config import (
+    OPENAI_MODEL, OPENAI_BASE_URL, TRANSLATE_TIMEOUT, TRANSLATE_POOL_SIZE,
+    LOCAL_LATENCY_MS, LOCAL_TOKEN_MS, LOCAL_ERROR_PCT, LOCAL_SEED,
+)
+from utils.langdetect import detect
+from utils.resilience import BackendError
+
+def _tokens(text: str) -> int:
+    return len(text or "") // 4 + 1   # same estimate as translator.estimate_tokens (no import cycle)
+
+class ChatBackend(ABC):
+    """
+    One system + user message in, the assistant's text out (chat) or as deltas (stream).
+    Backends do no retries, timeouts or concurrency limiting — TranslationEngine owns those.
+    """
+    name = "base"
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    @abstractmethod
+    async def chat(self, system: str, user: str) -> str:
+        ...
+
+    @abstractmethod
+    def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        ...
+
+    @property
+    def cache_scope(self) -> str:
+        """Which replies this backend gives, for persistent cache keys: same scope, interchangeable replies."""
+        return self.name
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens}
+
+class OpenAIBackend(ChatBackend):
+    """Chat completions over one shared keep-alive HTTP pool (any OpenAI-compatible base_url)."""
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str = OPENAI_MODEL, base_url: Optional[str] = OPENAI_BASE_URL,
+                 timeout: float = TRANSLATE_TIMEOUT, pool_size: int = TRANSLATE_POOL_SIZE):
+        super().__init__()
+        self.model = model
+        self.base_url = base_url
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=60),
+            timeout=httpx.Timeout(float(timeout), connect=10.0),
+        )
+        # retries are TranslationEngine's job; the SDK's own would double them
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http,
+                                  timeout=float(timeout), max_retries=0)
+
+    @property
+    def cache_scope(self) -> str:
+        # the default endpoint keeps the bare scope so existing cache rows stay valid
+        return f"openai@{self.base_url}" if self.base_url else ""
+
+    def _messages(self, system: str, user: str):
+        return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+    async def chat(self, system: str, user: str) -> str:
+        self.requests += 1
+        resp = await self.client.chat.completions.create(
+            model=self.model, messages=self._messages(system, user), temperature=0,
+        )
+        text = (resp.choices[0].message.content or "").strip()
+        usage = getattr(resp, "usage", None)
+        self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or _tokens(system + user)
+        self.completion_tokens += getattr(usage, "completion_tokens", 0) or _tokens(text)
+        return text
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        self.requests += 1
+        self.prompt_tokens += _tokens(system + user)
+        resp = await self.client.chat.completions.create(
+            model=self.model, messages=self._messages(system, user), temperature=0, stream=True,
+        )
+        chars = 0
+        try:
+            async for chunk in resp:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chars += len(delta)
+                    yield delta
+        finally:
+            self.completion_tokens += chars // 4 + 1
+
+    async def close(self):
+        await self.http.aclose()
+
+# ---------- deterministic replies (shared with bench/fake_openai.py) ----------
+def _detected(text: str) -> str:
+    guess = detect(text)
+    return guess.lang if guess.lang != "unknown" else "en"
+
+def local_reply(user: str) -> str:
+    """What a perfectly obedient model would answer to our prompts: "[target] text" in the expected JSON."""
+    if "Segments:\n" in user:
+        segments = json.loads(user.split("Segments:\n", 1)[1])
+        return json.dumps({"items": [
+            {"id": seg["id"], "translated": f"[{seg['target']}] {seg['text']}", "detected": _detected(seg["text"])}
+            for seg in segments
+        ]}, ensure_ascii=False)
+    text = user.split("Text:\n", 1)[-1]
+    if "Targets: " in user:
+        targets = user.split("Targets: ", 1)[1].split("\n", 1)[0].split(", ")
+        return json.dumps({"detected": _detected(text), "translations": {t: f"[{t}] {text}" for t in targets}},
+                          ensure_ascii=False)
+    if "Translate the text to " in user:   # plain-text streaming prompt
+        target = user.split("Translate the text to ", 1)[1].split(".", 1)[0]
+        return f"[{target}] {text}"
+    target = user.split("Target: ", 1)[-1].split("\n", 1)[0]
+    return json.dumps({"translated": f"[{target}] {text}", "detected": _detected(text)}, ensure_ascii=False)
+
+class LocalBackend(ChatBackend):
+    """
+    Offline, deterministic backend for load tests and benchmarks: replies come from local_reply() after
+    `latency` + `token_delay` per output token; `error_rate` of calls raise a transient BackendError.
+    Token accounting uses the same ~4 chars/token estimate as the rest of the bot.
+    """
+    name = "local"
+
+    def __init__(self, latency: float = LOCAL_LATENCY_MS / 1000.0, token_delay: float = LOCAL_TOKEN_MS / 1000.0,
+                 error_rate: float = LOCAL_ERROR_PCT / 100.0, error_status: int = 503, seed: int = LOCAL_SEED):
+        super().__init__()
+        self.latency, self.token_delay = latency, token_delay
+        self.error_rate, self.error_status = error_rate, error_status
+        self.rng = random.Random(seed)
+        self.errors = 0
+
+    def _call(self, system: str, user: str) -> str:
+        self.requests += 1
+        self.prompt_tokens += _tokens(system + user)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            raise BackendError(self.error_status, "injected fault")
+        reply = local_reply(user)
+        self.completion_tokens += _tokens(reply)
+        return reply
+
+    async def chat(self, system: str, user: str) -> str:
+        reply = self._call(system, user)
+        await asyncio.sleep(self.latency + self.token_delay * _tokens(reply))
+        return reply
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        reply = self._call(system, user)
+        await asyncio.sleep(self.latency)
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+            await asyncio.sleep(self.token_delay * _tokens(word))
+
+    def stats(self) -> dict:
+        return {**super().stats(), "injected_errors": self.errors}
+
+def make_backend(name: str, api_key: Optional[str] = None, model: str = OPENAI_MODEL, **kwargs) -> ChatBackend:
+    """"openai" (needs api_key) or "local"."""
+    if name == "local":
+        return LocalBackend(**kwargs)
+    if name == "openai":
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY not set.")
+        return OpenAIBackend(api_key=api_key, model=model, **kwargs)
+    raise ValueError(f"unknown TRANSLATE_BACKEND {name!r} (expected 'openai' or 'local')")
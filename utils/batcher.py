@@ -0,0 +1,129 @@
+# utils/batcher.py
+# Micro-batching: short translations arriving within a few ms share one model call.
+import json, asyncio
+from typing import List, Tuple
+
+from utils.config import BATCH_WINDOW_MS, BATCH_MAX_ITEMS, BATCH_MAX_TOKENS, BATCH_ITEM_MAX_TOKENS
+from utils.masking import PLACEHOLDER_HINT
+from utils.translator import TranslationEngine, estimate_tokens, parse_reply, clean_detected
+
+BATCH_SYSTEM = (
+    "You are a precise translator. For every segment, detect its source language (ISO 639-1) "
+    "and translate it to that segment's target. Translate each segment independently. " + PLACEHOLDER_HINT
+)
+
+class _Item:
+    __slots__ = ("text", "target", "tokens", "future")
+
+    def __init__(self, text: str, target: str, future: asyncio.Future):
+        self.text, self.target, self.future = text, target, future
+        self.tokens = estimate_tokens(text)
+
+class TranslationBatcher:
+    """
+    translate(text, target) waits up to `window_ms` for other requests, then sends all pending
+    segments as one structured prompt. Segments missing from the JSON reply are retried singly.
+    """
+    def __init__(self, engine: TranslationEngine, window_ms: int = BATCH_WINDOW_MS,
+                 max_items: int = BATCH_MAX_ITEMS, max_tokens: int = BATCH_MAX_TOKENS,
+                 item_max_tokens: int = BATCH_ITEM_MAX_TOKENS):
+        self.engine = engine
+        self.window = max(0, window_ms) / 1000.0
+        self.max_items = max(1, max_items)
+        self.max_tokens = max(1, max_tokens)
+        self.item_max_tokens = item_max_tokens
+        self._pending: List[_Item] = []
+        self._pending_tokens = 0
+        self._timer = None
+        self._tasks = set()   # batch calls in flight; the loop keeps only weak references to tasks
+        self.batches = 0      # multi-segment model calls
+        self.batched = 0      # segments answered by a batch call
+        self.fallbacks = 0    # segments retried singly after a bad reply
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_items > 1
+
+    async def translate(self, text: str, target_lang: str) -> Tuple[str, str]:
+        if not self.enabled or estimate_tokens(text) > self.item_max_tokens:
+            return await self.engine.translate(text, target_lang)
+
+        item = _Item(text, target_lang, asyncio.get_running_loop().create_future())
+        if self._pending and self._pending_tokens + item.tokens > self.max_tokens:
+            self._flush()
+        self._pending.append(item)
+        self._pending_tokens += item.tokens
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await item.future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Item]):
+        if len(batch) == 1:
+            return await self._single(batch[0])
+
+        segments = [{"id": i, "target": it.target, "text": it.text} for i, it in enumerate(batch)]
+        user = (
+            "Return STRICT JSON: {\"items\":[{\"id\":0,\"translated\":\"...\",\"detected\":\"xx\"}]} "
+            "with one item per segment id.\n"
+            f"Segments:\n{json.dumps(segments, ensure_ascii=False)}"
+        )
+        try:
+            raw = await self.engine.complete(BATCH_SYSTEM, user)
+        except asyncio.CancelledError:
+            for it in batch:
+                it.future.cancel()
+            raise
+        except Exception as e:
+            for it in batch:
+                if not it.future.done():
+                    it.future.set_exception(e)
+            return
+        self.batches += 1
+
+        by_id = {}
+        items = parse_reply(raw).get("items")
+        for row in items if isinstance(items, list) else []:
+            try:
+                by_id[int(row["id"])] = row
+            except Exception:
+                continue
+
+        retry = []
+        for i, it in enumerate(batch):
+            row = by_id.get(i)
+            if row is None or not isinstance(row.get("translated"), str):
+                retry.append(it)
+                continue
+            self.batched += 1
+            if not it.future.done():
+                it.future.set_result((row["translated"].strip(), clean_detected(row.get("detected"))))
+
+        if retry:
+            self.fallbacks += len(retry)
+            await asyncio.gather(*(self._single(it) for it in retry))
+
+    async def _single(self, it: _Item):
+        try:
+            result = await self.engine.translate(it.text, it.target)
+        except Exception as e:
+            if not it.future.done():
+                it.future.set_exception(e)
+            return
+        if not it.future.done():
+            it.future.set_result(result)
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "batched": self.batched, "fallbacks": self.fallbacks,
+                "pending": len(self._pending)}
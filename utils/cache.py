@@ -1,29 +1,210 @@
 # utils/cache.py
-import asyncio, time
+import asyncio, time, hashlib, zlib
+from collections import OrderedDict
+from utils import database
+from utils.config import CACHE_TTL, CACHE_MAX_MB, CACHE_STALE_GRACE
+
+ENTRY_OVERHEAD = 160  # rough per-entry bytes for key, tuple and dict slot
+
+def normalize_for_key(text: str) -> str:
+    """Whitespace + case folding so trivially different copies share a cache entry."""
+    return " ".join((text or "").split()).casefold()
+
+_HALVE = bytes(i >> 1 for i in range(256))
+
+class _FrequencySketch:
+    """Count-min sketch (4 rows, 4-bit-ish counters) with periodic halving — TinyLFU admission."""
+    def __init__(self, width: int = 1 << 14):
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in range(4)]
+        self.additions = 0
+        self.reset_at = width * 10
+
+    def _slots(self, key: bytes):
+        for i in range(4):
+            yield self.rows[i], int.from_bytes(key[i * 4:i * 4 + 4], "little") & self.mask
+
+    def increment(self, key: bytes):
+        for row, idx in self._slots(key):
+            if row[idx] < 15:
+                row[idx] += 1
+        self.additions += 1
+        if self.additions >= self.reset_at:
+            for row in self.rows:
+                row[:] = row.translate(_HALVE)
+            self.additions //= 2
+
+    def estimate(self, key: bytes) -> int:
+        return min(row[idx] for row, idx in self._slots(key))
 
 class TranslationCache:
-    def __init__(self, ttl: int = 300):
+    """
+    L1 in-memory cache.
+    - keys are 16-byte blake2b digests of (target, normalized text); source text is never stored
+    - byte budget with LRU eviction and TinyLFU admission (one-off texts can't flush popular ones)
+    - entries larger than 1/8 of the budget are not admitted
+    - expiry runs in a background sweep (start()/stop()); reads also ignore expired entries
+    - expired entries are kept `stale_grace` seconds longer for lookup(stale=True) during provider outages
+    - no lock: every operation is synchronous between awaits
+    """
+    def __init__(self, ttl: int = CACHE_TTL, max_bytes: int = CACHE_MAX_MB * 1024 * 1024,
+                 sweep_every: int = 30, stale_grace: int = CACHE_STALE_GRACE):
         self.ttl = ttl
-        self.cache = {}  # (text, lang) -> (value, ts)
-        self.lock = asyncio.Lock()
+        self.stale_grace = stale_grace
+        self.max_bytes = max_bytes
+        self.sweep_every = sweep_every
+        self.cache: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (value, detected, ts, size)
+        self.bytes = 0
+        self.sketch = _FrequencySketch()
+        self._sweeper = None
+        self.hits = self.misses = self.evictions = self.rejected = self.expired = self.stale = 0
 
-    async def get(self, text: str, target_lang: str):
-        key = (text, target_lang)
-        async with self.lock:
-            v = self.cache.get(key)
-            if not v:
-                return None
-            value, ts = v
-            if time.time() - ts < self.ttl:
-                return value
-            self.cache.pop(key, None)
+    @staticmethod
+    def key(text: str, target_lang: str) -> bytes:
+        return hashlib.blake2b(f"{target_lang}\x1f{normalize_for_key(text)}".encode("utf-8"), digest_size=16).digest()
+
+    def lookup(self, text: str, target_lang: str, stale: bool = False):
+        """
+        (translation, detected) or None. `stale=True` also returns expired entries; it is the fallback
+        after a failed fill, whose first lookup already counted the miss, so it only counts in `stale`.
+        """
+        key = self.key(text, target_lang)
+        v = self.cache.get(key)
+        expired = v is not None and time.time() - v[2] >= self.ttl
+        if stale:
+            if v is not None and expired:
+                self.stale += 1
+            return (v[0], v[1]) if v is not None else None
+        self.sketch.increment(key)
+        if v is None or expired:
+            self.misses += 1
             return None
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return v[0], v[1]
+
+    async def get(self, text: str, target_lang: str):
+        return self.lookup(text, target_lang)
+
+    async def set(self, text: str, target_lang: str, translation: str, detected: str = "unknown"):
+        key = self.key(text, target_lang)
+        size = len(translation.encode("utf-8")) + ENTRY_OVERHEAD
+        if size > self.max_bytes // 8:
+            self.rejected += 1
+            return
+        old = self.cache.pop(key, None)
+        if old is not None:
+            self.bytes -= old[3]
+        else:
+            freq = self.sketch.estimate(key)
+            while self.cache and self.bytes + size > self.max_bytes:
+                victim = next(iter(self.cache))
+                if self.sketch.estimate(victim) > freq:
+                    self.rejected += 1
+                    return
+                self.bytes -= self.cache.pop(victim)[3]
+                self.evictions += 1
+        self.cache[key] = (translation, detected, time.time(), size)
+        self.bytes += size
+
+    def sweep(self) -> int:
+        cutoff = time.time() - self.ttl - self.stale_grace
+        dead = [k for k, v in self.cache.items() if v[2] < cutoff]
+        for k in dead:
+            self.bytes -= self.cache.pop(k)[3]
+        self.expired += len(dead)
+        return len(dead)
 
-    async def set(self, text: str, target_lang: str, translation: str):
-        key = (text, target_lang)
-        async with self.lock:
-            self.cache[key] = (translation, time.time())
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_every)
+            self.sweep()
+
+    def start(self):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
 
     async def clear(self):
-        async with self.lock:
-            self.cache.clear()
+        self.cache.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self.cache), "bytes": self.bytes, "max_bytes": self.max_bytes,
+            "evictions": self.evictions, "rejected": self.rejected, "expired": self.expired,
+            "stale_served": self.stale,
+        }
+
+
+def cache_key(text: str, target_lang: str, model: str) -> str:
+    """Content hash of normalized text + target + model (L2 key)."""
+    return hashlib.sha256(f"{model}\x1f{target_lang}\x1f{normalize_for_key(text)}".encode("utf-8")).hexdigest()
+
+class PersistentTranslationCache:
+    """
+    L2 cache in SQLite (utils.database.translation_cache). Survives restarts.
+    Reads are awaited; writes are fire-and-forget so they never delay a DM.
+    """
+    def __init__(self, model: str, max_bytes: int, max_age: int, prune_every: int = 500):
+        self.model = model
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.prune_every = prune_every
+        self._writes = 0
+        self._tasks = set()
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    async def get(self, text: str, target_lang: str):
+        """Returns (translation, detected) or None. A row that no longer decodes is a miss and is deleted."""
+        key = cache_key(text, target_lang, self.model)
+        try:
+            row = await database.get_cached_translation(key)
+        except Exception:
+            row = None
+        if not row:
+            self.misses += 1
+            return None
+        value, detected = row
+        try:
+            translation = zlib.decompress(value).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError):
+            self.misses += 1
+            self.corrupt += 1
+            try:
+                await database.delete_cached_translation(key)
+            except Exception as e:
+                print(f"[L2 cache] could not drop a corrupt row: {e}")
+            return None
+        self.hits += 1
+        return translation, detected or "unknown"
+
+    def put(self, text: str, target_lang: str, translation: str, detected: str):
+        task = asyncio.create_task(self._write(text, target_lang, translation, detected))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, text: str, target_lang: str, translation: str, detected: str):
+        try:
+            await database.put_cached_translation(
+                cache_key(text, target_lang, self.model), target_lang, self.model, detected,
+                zlib.compress(translation.encode("utf-8"), 6),
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                await database.prune_translation_cache(self.max_bytes, self.max_age)
+        except Exception as e:
+            print(f"[L2 cache] write failed: {e}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "corrupt": self.corrupt, "writes": self._writes,
+                "pending": len(self._tasks)}
@@ -10,12 +10,111 @@ def _int(name: str, default: int) -> int:
 # General
 OWNER_ID = int(os.getenv("OWNER_ID", "0"))
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None   # e.g. a local fake for benchmarks
+
+# Translation backend: "openai" (needs OPENAI_API_KEY) or "local" (offline, deterministic; for load tests)
+TRANSLATE_BACKEND = os.getenv("TRANSLATE_BACKEND", "openai").strip().lower()
+LOCAL_LATENCY_MS = _int("LOCAL_LATENCY_MS", 300)   # local backend: time to first token
+LOCAL_TOKEN_MS = _int("LOCAL_TOKEN_MS", 5)         # local backend: per output token
+LOCAL_ERROR_PCT = _int("LOCAL_ERROR_PCT", 0)       # local backend: share of calls failing with 503
+LOCAL_SEED = _int("LOCAL_SEED", 1)
+
+# Translation engine
+TRANSLATE_CONCURRENCY = _int("TRANSLATE_CONCURRENCY", 8)  # max model calls in flight
+TRANSLATE_TIMEOUT = _int("TRANSLATE_TIMEOUT", 30)          # seconds per model call
+TRANSLATE_POOL_SIZE = _int("TRANSLATE_POOL_SIZE", 20)      # keep-alive HTTP connections
+
+# Provider failures: retries with jittered backoff (Retry-After honoured), circuit breaker, hedging
+TRANSLATE_RETRIES = _int("TRANSLATE_RETRIES", 2)        # extra attempts after a transient error
+RETRY_BASE_MS = _int("RETRY_BASE_MS", 250)              # first backoff step
+RETRY_MAX_WAIT = _int("RETRY_MAX_WAIT", 10)             # seconds; a longer Retry-After fails at once
+BREAKER_FAILURES = _int("BREAKER_FAILURES", 5)          # consecutive transient errors that open the breaker
+BREAKER_COOLDOWN = _int("BREAKER_COOLDOWN", 20)         # seconds to fail fast before probing (0 disables)
+TRANSLATE_HEDGE_PCT = _int("TRANSLATE_HEDGE_PCT", 0)    # e.g. 95: duplicate calls slower than p95 (0 disables)
+HEDGE_MIN_MS = _int("HEDGE_MIN_MS", 300)                # never hedge before this
+
+# Reaction dedup: one DM per (message, user) within this window
+REACTION_DEDUP_TTL = _int("REACTION_DEDUP_TTL", 300)        # seconds
+REACTION_DEDUP_MAX = _int("REACTION_DEDUP_MAX", 200000)     # keys kept at most
+
+# Streaming reaction translations: the DM is edited progressively (opt-in; bypasses fan-out)
+TRANSLATE_STREAM = _int("TRANSLATE_STREAM", 0)
+STREAM_EDIT_INTERVAL_MS = _int("STREAM_EDIT_INTERVAL_MS", 1200)  # Discord allows ~5 edits / 5 s
+
+# Translation scheduler (central job queue)
+SCHED_WORKERS = _int("SCHED_WORKERS", 16)        # concurrent translation jobs
+SCHED_MAX_QUEUE = _int("SCHED_MAX_QUEUE", 500)   # waiting jobs before new ones are shed
+SCHED_MAX_WAIT = _int("SCHED_MAX_WAIT", 60)      # seconds a job may wait before it is shed
+SCHED_QUANTUM = _int("SCHED_QUANTUM", 1000)      # estimated tokens per guild per round-robin turn
+
+# Speculative pre-translation (per guild, opt-in with /speculate)
+SPEC_MAX_TARGETS = _int("SPEC_MAX_TARGETS", 2)            # languages pre-translated per message
+SPEC_MIN_REACT_PCT = _int("SPEC_MIN_REACT_PCT", 30)       # channel must get translation requests on this share of messages
+SPEC_MIN_HIT_PCT = _int("SPEC_MIN_HIT_PCT", 20)           # a language whose pre-translations are used less often is dropped
+SPEC_WARMUP = _int("SPEC_WARMUP", 20)                     # messages / requests observed before speculating
+SPEC_TOKENS_PER_MIN = _int("SPEC_TOKENS_PER_MIN", 20000)  # estimated tokens per guild per minute
+SPEC_MAX_TOKENS = _int("SPEC_MAX_TOKENS", 400)            # longer messages are never pre-translated
+
+# Long texts are split into chunks translated in parallel
+CHUNK_TOKENS = _int("CHUNK_TOKENS", 1500)          # estimated input tokens per chunk
+CHUNK_CONCURRENCY = _int("CHUNK_CONCURRENCY", 4)   # chunks in flight per message
+
+# Micro-batching of short translations (BATCH_WINDOW_MS=0 disables)
+BATCH_WINDOW_MS = _int("BATCH_WINDOW_MS", 15)        # how long to collect a batch
+BATCH_MAX_ITEMS = _int("BATCH_MAX_ITEMS", 16)        # segments per model call
+BATCH_MAX_TOKENS = _int("BATCH_MAX_TOKENS", 1500)    # estimated input tokens per model call
+BATCH_ITEM_MAX_TOKENS = _int("BATCH_ITEM_MAX_TOKENS", 200)  # longer texts skip batching
+
+# In-memory translation cache (L1)
+CACHE_TTL = _int("CACHE_TTL", 300)          # seconds
+CACHE_MAX_MB = _int("CACHE_MAX_MB", 32)     # memory budget
+CACHE_STALE_GRACE = _int("CACHE_STALE_GRACE", 3600)  # expired entries kept for outages (served only then)
+
+# Persistent (SQLite) translation cache
+L2_CACHE = _int("L2_CACHE", 1)                          # 0 disables
+L2_CACHE_MAX_MB = _int("L2_CACHE_MAX_MB", 64)           # compressed bytes kept on disk
+L2_CACHE_MAX_AGE_DAYS = _int("L2_CACHE_MAX_AGE_DAYS", 30)
+
+# Sentence-level translation memory (TM_MAX_ENTRIES=0 disables)
+TM_MAX_ENTRIES = _int("TM_MAX_ENTRIES", 20000)    # sentences kept across all targets
+TM_FUZZY = _int("TM_FUZZY", 0)                    # reuse near matches (typos) via MinHash; off: "note"/"vote" look alike
+TM_FUZZY_MIN_PCT = _int("TM_FUZZY_MIN_PCT", 90)   # minimum character similarity for a near match
+
+# Reaction fan-out: the first target for a message is sent at once; targets requested while that call is in
+# flight share the next call, sent when it returns or after the window, whichever is first (0 disables)
+FANOUT_WINDOW_MS = _int("FANOUT_WINDOW_MS", 750)
+FANOUT_MAX_TARGETS = _int("FANOUT_MAX_TARGETS", 8)
 
 # XP tuning (env overrides)
 XP_MSG = _int("XP_MSG", 5)                    # XP per message
 XP_TRANSLATION = _int("XP_TRANSLATION", 10)   # XP per successful translation
 VOICE_GRANULARITY = _int("VOICE_GRANULARITY", 30)  # seconds per write
 VOICE_XP_PER_MIN = _int("VOICE_XP_PER_MIN", 1)     # XP per minute in voice (0 to disable)
+XP_FLUSH_SECONDS = _int("XP_FLUSH_SECONDS", 5)     # XP is buffered in memory and written this often…
+XP_FLUSH_MAX = _int("XP_FLUSH_MAX", 500)           # …or once this many users have unwritten XP
+
+# Translation quotas (per minute; burst = one minute's worth; 0 disables that limit)
+QUOTA_USER_REQ_PER_MIN = _int("QUOTA_USER_REQ_PER_MIN", 10)
+QUOTA_USER_TOKENS_PER_MIN = _int("QUOTA_USER_TOKENS_PER_MIN", 20000)
+QUOTA_GUILD_REQ_PER_MIN = _int("QUOTA_GUILD_REQ_PER_MIN", 120)
+QUOTA_GUILD_TOKENS_PER_MIN = _int("QUOTA_GUILD_TOKENS_PER_MIN", 200000)
+QUOTA_GLOBAL_REQ_PER_MIN = _int("QUOTA_GLOBAL_REQ_PER_MIN", 1500)
+QUOTA_GLOBAL_TOKENS_PER_MIN = _int("QUOTA_GLOBAL_TOKENS_PER_MIN", 2000000)
+
+# Storage backend (utils/database.py): "sqlite" (BOT_DB_PATH) or "memory" (nothing persisted; benchmarks, tests)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite").strip().lower()
+
+# SQLite connection pool (utils/database.py): one writer + read-only readers, kept open
+DB_READERS = _int("DB_READERS", 4)                  # 0: reads share the writer connection
+DB_BUSY_TIMEOUT_MS = _int("DB_BUSY_TIMEOUT_MS", 5000)
+DB_HEALTH_IDLE = _int("DB_HEALTH_IDLE", 30)         # seconds idle before a connection is pinged on reuse
+USER_PREF_CACHE = _int("USER_PREF_CACHE", 50000)    # user language prefs kept in memory (LRU); guild configs are all kept
+
+# Gateway trace capture (owner /trace; replay with bench/replay.py)
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+TRACE_MAX_EVENTS = _int("TRACE_MAX_EVENTS", 500000)   # recording stops growing past this
 
 # Leaderboard page size
 LEADERBOARD_PAGE = _int("LEADERBOARD_PAGE", 10)
+# Guilds whose /profile rank index stays in memory (utils/rank_index.py; ~9 MiB per 100k members)
+RANK_INDEX_GUILDS = _int("RANK_INDEX_GUILDS", 200)
@@ -0,0 +1,64 @@
+# utils/config_cache.py
+# Read-through caches for settings that are read on every message but change about once a month.
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, FrozenSet, Hashable, NamedTuple, Optional
+
+class GuildConfig(NamedTuple):
+    channels: FrozenSet[int]        # translation channels (empty: none configured)
+    emote: Optional[str]
+    server_lang: Optional[str]
+    error_channel: Optional[int]
+    speculate: bool
+
+DEFAULT_GUILD_CONFIG = GuildConfig(frozenset(), None, None, None, False)
+
+class ReadThroughCache:
+    """
+    key -> value, loaded on a miss (None is cached too, so "no setting" is a hit). Writers call
+    invalidate() after committing; a load that started before the invalidation does not store its
+    (possibly stale) result. With `max_items` the least recently used keys are dropped.
+    """
+    def __init__(self, max_items: Optional[int] = None):
+        self.max_items = max_items
+        self._items: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = self.misses = self.invalidations = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[object]]):
+        if key in self._items:
+            self.hits += 1
+            if self.max_items:
+                self._items.move_to_end(key)
+            return self._items[key]
+        self.misses += 1
+        seen = (self._epoch, self._versions.get(key, 0))
+        value = await load()
+        if seen == (self._epoch, self._versions.get(key, 0)):
+            self.put(key, value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, key: Hashable, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if self.max_items:
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self.invalidations += 1
+        self._items.pop(key, None)
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def clear(self):
+        self._items.clear()
+        self._versions.clear()
+        self._epoch += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"entries": len(self._items), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0, "invalidations": self.invalidations}
@@ -1,319 +1,708 @@
 # utils/database.py
-# Persistent SQLite storage for Zephyra (xp, prefs, guild config, roles)
-import os
-from typing import Optional, List, Tuple
+# Persistent storage for Zephyra (xp, prefs, guild config, roles): SQLite by default, or in memory
+# (STORAGE_BACKEND=memory, utils/storage.py). Callers use the module-level helpers below.
+import os, time, asyncio, sqlite3
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, List, Tuple
 import aiosqlite
 
+from utils.config import DB_READERS, DB_BUSY_TIMEOUT_MS, DB_HEALTH_IDLE, USER_PREF_CACHE, STORAGE_BACKEND
+from utils.config_cache import GuildConfig, ReadThroughCache
+from utils.storage import Storage, MemoryStorage
+
 DB_PATH = os.getenv("BOT_DB_PATH", "/mnt/data/bot_data.db")
+STORAGE = STORAGE_BACKEND   # like DB_PATH, may be repointed (benchmarks); the next call switches
+
+# connections opened and statements run (bench/replay.py reports them per event)
+_ops = {"connects": 0, "statements": 0, "reconnects": 0}
 
 # ---------- low-level ----------
-async def _connect() -> aiosqlite.Connection:
-    db = await aiosqlite.connect(DB_PATH)
+async def _connect(path: Optional[str] = None, readonly: bool = False) -> aiosqlite.Connection:
+    _ops["connects"] += 1
+    # a kept-open connection reuses prepared statements from sqlite3's per-connection cache
+    db = await aiosqlite.connect(path or DB_PATH, cached_statements=256)
     # sensible pragmas for a bot
     await db.execute("PRAGMA journal_mode=WAL;")
     await db.execute("PRAGMA synchronous=NORMAL;")
     await db.execute("PRAGMA foreign_keys=ON;")
+    await db.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)};")
+    if readonly:
+        await db.execute("PRAGMA query_only=ON;")
     return db
 
-async def _exec(db: aiosqlite.Connection, sql: str, params: tuple = ()) -> None:
+def _suspect(exc: BaseException) -> bool:
+    """Errors after which a connection is health-checked before its next use (not constraint/busy errors)."""
+    if isinstance(exc, sqlite3.IntegrityError):
+        return False
+    if isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc):
+        return False
+    return isinstance(exc, (sqlite3.Error, ValueError))
+
+class ConnectionPool:
+    """
+    Long-lived connections for one database file: a single writer (writes are serialized, one transaction
+    per helper call, committed on exit, rolled back on error) and up to `readers` read-only connections,
+    which WAL lets run alongside the writer. A connection idle for `health_idle` seconds, or one that
+    raised a suspicious error, is checked with SELECT 1 before reuse and reopened if that fails.
+    With readers=0 reads share the writer (e.g. for ":memory:").
+    """
+    def __init__(self, path: str, readers: int = DB_READERS, health_idle: float = DB_HEALTH_IDLE):
+        self.path = path
+        self.readers = max(0, readers)
+        self.health_idle = health_idle
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._idle: List[aiosqlite.Connection] = []
+        self._reader_slots = asyncio.Semaphore(max(1, self.readers))
+        self._checked_at = {}   # connection -> monotonic time it was last known good (0 = check it)
+        self.reads = self.writes = self.waits = 0
+        self.closed = False
+
+    async def _ready(self, db: Optional[aiosqlite.Connection], readonly: bool) -> aiosqlite.Connection:
+        if db is not None and time.monotonic() - self._checked_at.get(db, 0) > self.health_idle:
+            try:
+                await asyncio.wait_for(_exec(db, "SELECT 1"), 5)
+            except Exception:
+                _ops["reconnects"] += 1
+                await self._discard(db)
+                db = None
+        if db is None:
+            if self.closed:
+                raise RuntimeError("database pool is closed")
+            db = await _connect(self.path, readonly=readonly)
+        self._checked_at[db] = time.monotonic()
+        return db
+
+    async def _discard(self, db: aiosqlite.Connection):
+        self._checked_at.pop(db, None)
+        try:
+            await db.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def write(self):
+        if self._write_lock.locked():
+            self.waits += 1
+        async with self._write_lock:
+            self._writer = db = await self._ready(self._writer, readonly=False)
+            self.writes += 1
+            try:
+                yield db
+                await db.commit()
+            except BaseException as e:
+                try:
+                    await db.rollback()
+                except Exception:
+                    pass
+                if _suspect(e):
+                    self._checked_at[db] = 0
+                raise
+            self._checked_at[db] = time.monotonic()
+
+    @asynccontextmanager
+    async def read(self):
+        if not self.readers:
+            async with self.write() as db:
+                yield db
+            return
+        if self._reader_slots.locked():
+            self.waits += 1
+        async with self._reader_slots:
+            db = await self._ready(self._idle.pop() if self._idle else None, readonly=True)
+            self.reads += 1
+            try:
+                yield db
+            except BaseException as e:
+                if _suspect(e):
+                    self._checked_at[db] = 0
+                raise
+            finally:
+                if self.closed:
+                    await self._discard(db)
+                else:
+                    self._idle.append(db)
+
+    async def close(self):
+        """Close every connection; in-flight helpers finish first (the writer lock is taken)."""
+        self.closed = True
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._discard(self._writer)
+                self._writer = None
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+    def stats(self) -> dict:
+        return {"reads": self.reads, "writes": self.writes, "pool_waits": self.waits,
+                "readers_idle": len(self._idle)}
+
+async def _exec(db: aiosqlite.Connection, sql: str, params: tuple = ()) -> int:
+    """Run one statement; returns the number of rows it changed."""
+    _ops["statements"] += 1
     cur = await db.execute(sql, params)
+    changed = cur.rowcount
     await cur.close()
+    return changed
+
+async def _many(db: aiosqlite.Connection, sql: str, rows: List[tuple]) -> None:
+    _ops["statements"] += 1
+    await db.executemany(sql, rows)
 
 async def _one(db: aiosqlite.Connection, sql: str, params: tuple = ()):
+    _ops["statements"] += 1
     cur = await db.execute(sql, params)
     row = await cur.fetchone()
     await cur.close()
     return row
 
 async def _all(db: aiosqlite.Connection, sql: str, params: tuple = ()):
+    _ops["statements"] += 1
     cur = await db.execute(sql, params)
     rows = await cur.fetchall()
     await cur.close()
     return rows
 
-# ---------- schema (with migrations) ----------
-async def ensure_schema() -> None:
-    """
-    Creates tables if missing and performs lightweight migrations
-    so older DBs continue working (e.g., add server_lang column).
-    """
-    db = await _connect()
-    try:
-        # XP
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS xp(
-          guild_id      INTEGER NOT NULL,
-          user_id       INTEGER NOT NULL,
-          xp            INTEGER NOT NULL DEFAULT 0,
-          messages      INTEGER NOT NULL DEFAULT 0,
-          translations  INTEGER NOT NULL DEFAULT 0,
-          voice_seconds INTEGER NOT NULL DEFAULT 0,
-          PRIMARY KEY(guild_id, user_id)
-        );
-        """)
-
-        # Guild settings (server_lang may be added later by migration)
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS guild_settings(
-          guild_id   INTEGER PRIMARY KEY,
-          -- server_lang TEXT  -- may be missing in older DBs; migration below adds it
-          created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        );
-        """)
-
-        # Translation channel allow-list
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS translate_channels(
-          guild_id  INTEGER NOT NULL,
-          channel_id INTEGER NOT NULL,
-          PRIMARY KEY(guild_id, channel_id)
-        );
-        """)
-
-        # User language preference
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS user_prefs(
-          user_id   INTEGER PRIMARY KEY,
-          lang_code TEXT
-        );
-        """)
-
-        # Guild meta: error channel + bot emote
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS guild_meta(
-          guild_id         INTEGER PRIMARY KEY,
-          error_channel_id INTEGER,
-          bot_emote        TEXT
-        );
-        """)
-
-        # Level role table mapping (every 10 levels: 1-10, 11-20, ..., 91-100)
-        await _exec(db, """
-        CREATE TABLE IF NOT EXISTS level_roles(
-          guild_id  INTEGER NOT NULL,
-          lvl_start INTEGER NOT NULL,
-          lvl_end   INTEGER NOT NULL,
-          role_id   INTEGER NOT NULL,
-          PRIMARY KEY(guild_id, lvl_start, lvl_end)
-        );
-        """)
-
-        # -------- migrations --------
-        # Add server_lang column if missing (fixes "no such column: server_lang")
-        info = await _all(db, "PRAGMA table_info(guild_settings);")
-        cols = {r[1] for r in info}  # r[1] = column name
-        if "server_lang" not in cols:
-            await _exec(db, "ALTER TABLE guild_settings ADD COLUMN server_lang TEXT;")
-
-        await db.commit()
-    finally:
-        await db.close()
-
-# ---------- XP ----------
 async def _upsert_xp(db: aiosqlite.Connection, gid: int, uid: int) -> None:
     await _exec(db, "INSERT OR IGNORE INTO xp(guild_id, user_id) VALUES(?, ?)", (gid, uid))
 
+def _guild_config(server_lang, error_channel, emote, speculate, channels) -> GuildConfig:
+    return GuildConfig(
+        channels=frozenset(channels),
+        emote=emote or None,
+        server_lang=server_lang or None,
+        error_channel=int(error_channel) if error_channel is not None else None,
+        speculate=bool(speculate),
+    )
+
+class SQLiteStorage(Storage):
+    """The database file at `path`, through a ConnectionPool (one writer, read-only readers)."""
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.pool = ConnectionPool(path, readers=0 if path == ":memory:" else DB_READERS)
+
+    async def close(self) -> None:
+        await super().close()
+        await self.pool.close()
+
+    def stats(self) -> dict:
+        return {**super().stats(), **self.pool.stats()}
+
+    # ---------- schema (with migrations) ----------
+    async def ensure_schema(self) -> None:
+        """
+        Creates tables if missing and performs lightweight migrations
+        so older DBs continue working (e.g., add server_lang column).
+        """
+        async with self.pool.write() as db:
+            # XP
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS xp(
+              guild_id      INTEGER NOT NULL,
+              user_id       INTEGER NOT NULL,
+              xp            INTEGER NOT NULL DEFAULT 0,
+              messages      INTEGER NOT NULL DEFAULT 0,
+              translations  INTEGER NOT NULL DEFAULT 0,
+              voice_seconds INTEGER NOT NULL DEFAULT 0,
+              PRIMARY KEY(guild_id, user_id)
+            );
+            """)
+
+            # Guild settings (server_lang may be added later by migration)
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS guild_settings(
+              guild_id   INTEGER PRIMARY KEY,
+              -- server_lang TEXT  -- may be missing in older DBs; migration below adds it
+              created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            """)
+
+            # Translation channel allow-list
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS translate_channels(
+              guild_id  INTEGER NOT NULL,
+              channel_id INTEGER NOT NULL,
+              PRIMARY KEY(guild_id, channel_id)
+            );
+            """)
+
+            # User language preference
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS user_prefs(
+              user_id   INTEGER PRIMARY KEY,
+              lang_code TEXT
+            );
+            """)
+
+            # Guild meta: error channel + bot emote
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS guild_meta(
+              guild_id         INTEGER PRIMARY KEY,
+              error_channel_id INTEGER,
+              bot_emote        TEXT
+            );
+            """)
+
+            # Level role table mapping (every 10 levels: 1-10, 11-20, ..., 91-100)
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS level_roles(
+              guild_id  INTEGER NOT NULL,
+              lvl_start INTEGER NOT NULL,
+              lvl_end   INTEGER NOT NULL,
+              role_id   INTEGER NOT NULL,
+              PRIMARY KEY(guild_id, lvl_start, lvl_end)
+            );
+            """)
+
+            # Persistent translation cache (L2 behind the in-memory cache)
+            await _exec(db, """
+            CREATE TABLE IF NOT EXISTS translation_cache(
+              key        TEXT PRIMARY KEY,   -- sha256 of normalized text + target + model
+              target     TEXT NOT NULL,
+              model      TEXT NOT NULL,
+              detected   TEXT,
+              value      BLOB NOT NULL,      -- zlib-compressed translation
+              size       INTEGER NOT NULL,   -- len(value), for the size cap
+              created_at INTEGER NOT NULL,
+              used_at    INTEGER NOT NULL
+            );
+            """)
+            await _exec(db, "CREATE INDEX IF NOT EXISTS idx_translation_cache_used ON translation_cache(used_at);")
+
+            # -------- migrations --------
+            # Add server_lang column if missing (fixes "no such column: server_lang")
+            info = await _all(db, "PRAGMA table_info(guild_settings);")
+            cols = {r[1] for r in info}  # r[1] = column name
+            if "server_lang" not in cols:
+                await _exec(db, "ALTER TABLE guild_settings ADD COLUMN server_lang TEXT;")
+
+            # Add speculative pre-translation opt-in to guild_meta
+            info = await _all(db, "PRAGMA table_info(guild_meta);")
+            if "speculate" not in {r[1] for r in info}:
+                await _exec(db, "ALTER TABLE guild_meta ADD COLUMN speculate INTEGER NOT NULL DEFAULT 0;")
+
+            # Covering index for the leaderboard: rows come out already ranked, no sort and no table lookups
+            await _exec(db, """
+            CREATE INDEX IF NOT EXISTS idx_xp_rank
+                ON xp(guild_id, xp DESC, messages DESC, user_id, translations, voice_seconds);
+            """)
+
+    # ---------- XP ----------
+    async def add_message_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        async with self.pool.write() as db:
+            await _upsert_xp(db, guild_id, user_id)
+            await _exec(
+                db,
+                "UPDATE xp SET xp = xp + ?, messages = messages + 1 WHERE guild_id = ? AND user_id = ?",
+                (max(0, int(delta)), guild_id, user_id),
+            )
+
+    async def add_translation_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        async with self.pool.write() as db:
+            await _upsert_xp(db, guild_id, user_id)
+            await _exec(
+                db,
+                "UPDATE xp SET xp = xp + ?, translations = translations + 1 WHERE guild_id = ? AND user_id = ?",
+                (max(0, int(delta)), guild_id, user_id),
+            )
+
+    async def add_voice_seconds(self, guild_id: int, user_id: int, seconds: int) -> None:
+        if seconds <= 0:
+            return
+        async with self.pool.write() as db:
+            await _upsert_xp(db, guild_id, user_id)
+            await _exec(
+                db,
+                "UPDATE xp SET voice_seconds = voice_seconds + ? WHERE guild_id = ? AND user_id = ?",
+                (int(seconds), guild_id, user_id),
+            )
+
+    async def apply_xp_deltas(self, rows: List[Tuple[int, int, int, int, int, int]]) -> None:
+        if not rows:
+            return
+        async with self.pool.write() as db:
+            await _many(
+                db,
+                """
+                INSERT INTO xp(guild_id, user_id, xp, messages, translations, voice_seconds) VALUES(?, ?, ?, ?, ?, ?)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET
+                  xp = xp + excluded.xp, messages = messages + excluded.messages,
+                  translations = translations + excluded.translations,
+                  voice_seconds = voice_seconds + excluded.voice_seconds
+                """,
+                rows,
+            )
+
+    async def get_xp(self, guild_id: int, user_id: int) -> Tuple[int, int, int, int]:
+        async with self.pool.read() as db:
+            row = await _one(
+                db,
+                "SELECT xp, messages, translations, voice_seconds FROM xp WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id),
+            )
+            return (0, 0, 0, 0) if not row else (int(row[0]), int(row[1]), int(row[2]), int(row[3]))
+
+    async def get_rank_rows(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        # covered by idx_xp_rank
+        async with self.pool.read() as db:
+            return await _all(db, "SELECT user_id, xp, messages FROM xp WHERE guild_id = ?", (guild_id,))
+
+    async def get_xp_leaderboard(self, guild_id: int, limit: int = 10,
+                                 after: Optional[Tuple[int, int, int]] = None):
+        # both forms are a seek on idx_xp_rank, whatever the page's depth
+        async with self.pool.read() as db:
+            if after is None:
+                return await _all(
+                    db,
+                    """
+                    SELECT user_id, xp, messages, translations, voice_seconds
+                      FROM xp
+                     WHERE guild_id = ?
+                     ORDER BY xp DESC, messages DESC, user_id
+                     LIMIT ?
+                    """,
+                    (guild_id, int(limit)),
+                )
+            xp, msgs, uid = after
+            return await _all(
+                db,
+                """
+                SELECT user_id, xp, messages, translations, voice_seconds
+                  FROM xp
+                 WHERE guild_id = ? AND xp <= ?
+                   AND (xp < ? OR messages < ? OR (messages = ? AND user_id > ?))
+                 ORDER BY xp DESC, messages DESC, user_id
+                 LIMIT ?
+                """,
+                (guild_id, xp, xp, msgs, msgs, uid, int(limit)),
+            )
+
+    # ---------- user prefs ----------
+    async def set_user_lang(self, user_id: int, code: str) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO user_prefs(user_id, lang_code) VALUES(?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET lang_code = excluded.lang_code
+                """,
+                (user_id, code),
+            )
+
+    async def get_user_lang(self, user_id: int) -> Optional[str]:
+        async with self.pool.read() as db:
+            row = await _one(db, "SELECT lang_code FROM user_prefs WHERE user_id = ?", (user_id,))
+            return row[0] if row else None
+
+    # ---------- guild language / channels / meta ----------
+    async def load_guild_config(self, guild_id: int) -> GuildConfig:
+        async with self.pool.read() as db:
+            row = await _one(
+                db,
+                """
+                SELECT gs.server_lang, gm.error_channel_id, gm.bot_emote, gm.speculate,
+                       (SELECT group_concat(channel_id) FROM translate_channels WHERE guild_id = k.guild_id)
+                  FROM (SELECT ? AS guild_id) AS k
+                  LEFT JOIN guild_settings gs ON gs.guild_id = k.guild_id
+                  LEFT JOIN guild_meta gm ON gm.guild_id = k.guild_id
+                """,
+                (guild_id,),
+            )
+        chans = [int(c) for c in row[4].split(",")] if row[4] else []
+        return _guild_config(row[0], row[1], row[2], row[3], chans)
+
+    async def load_guild_configs(self) -> Dict[int, GuildConfig]:
+        async with self.pool.read() as db:
+            settings = {g: lang for g, lang in await _all(db, "SELECT guild_id, server_lang FROM guild_settings")}
+            meta = {r[0]: r[1:] for r in await _all(
+                db, "SELECT guild_id, error_channel_id, bot_emote, speculate FROM guild_meta")}
+            chans = {}
+            for g, c in await _all(db, "SELECT guild_id, channel_id FROM translate_channels"):
+                chans.setdefault(g, []).append(int(c))
+        out = {}
+        for gid in set(settings) | set(meta) | set(chans):
+            err, emote, spec = meta.get(gid, (None, None, 0))
+            out[gid] = _guild_config(settings.get(gid), err, emote, spec, chans.get(gid, ()))
+        return out
+
+    async def set_server_lang(self, guild_id: int, code: str) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO guild_settings(guild_id, server_lang) VALUES(?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET server_lang = excluded.server_lang
+                """,
+                (guild_id, code),
+            )
+
+    async def allow_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                "INSERT OR IGNORE INTO translate_channels(guild_id, channel_id) VALUES(?, ?)",
+                (guild_id, channel_id),
+            )
+
+    async def remove_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                "DELETE FROM translate_channels WHERE guild_id = ? AND channel_id = ?",
+                (guild_id, channel_id),
+            )
+
+    async def set_error_channel(self, guild_id: int, channel_id: Optional[int]) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO guild_meta(guild_id, error_channel_id) VALUES(?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET error_channel_id = excluded.error_channel_id
+                """,
+                (guild_id, channel_id),
+            )
+
+    async def set_bot_emote(self, guild_id: int, emote: str) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO guild_meta(guild_id, bot_emote) VALUES(?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET bot_emote = excluded.bot_emote
+                """,
+                (guild_id, emote),
+            )
+
+    async def set_speculation(self, guild_id: int, enabled: bool) -> None:
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO guild_meta(guild_id, speculate) VALUES(?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET speculate = excluded.speculate
+                """,
+                (guild_id, 1 if enabled else 0),
+            )
+
+    # ---------- level roles (setup/show/delete) ----------
+    async def upsert_role_table(self, guild_id: int, mapping: List[Tuple[int, int, int]]) -> None:
+        """
+        mapping: list of (lvl_start, lvl_end, role_id)
+        Overwrites existing mapping for the guild.
+        """
+        async with self.pool.write() as db:
+            await _exec(db, "DELETE FROM level_roles WHERE guild_id = ?", (guild_id,))
+            for ls, le, rid in mapping:
+                await _exec(
+                    db,
+                    "INSERT INTO level_roles(guild_id, lvl_start, lvl_end, role_id) VALUES(?, ?, ?, ?)",
+                    (guild_id, int(ls), int(le), int(rid)),
+                )
+
+    async def get_role_table(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        async with self.pool.read() as db:
+            rows = await _all(
+                db,
+                "SELECT lvl_start, lvl_end, role_id FROM level_roles WHERE guild_id = ? ORDER BY lvl_start",
+                (guild_id,),
+            )
+            return [(int(a), int(b), int(c)) for (a, b, c) in rows]
+
+    async def delete_role_table(self, guild_id: int) -> int:
+        async with self.pool.write() as db:
+            return await _exec(db, "DELETE FROM level_roles WHERE guild_id = ?", (guild_id,))
+
+    # ---------- persistent translation cache ----------
+    async def get_cached_translation(self, key: str, touch_after: int = 3600) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Returns (compressed value, detected) or None.
+        used_at is refreshed at most once per `touch_after` seconds to keep reads cheap.
+        """
+        async with self.pool.read() as db:
+            row = await _one(db, "SELECT value, detected, used_at FROM translation_cache WHERE key = ?", (key,))
+        if not row:
+            return None
+        now = int(time.time())
+        if now - int(row[2]) >= touch_after:
+            async with self.pool.write() as db:
+                await _exec(db, "UPDATE translation_cache SET used_at = ? WHERE key = ?", (now, key))
+        return bytes(row[0]), row[1]
+
+    async def put_cached_translation(self, key: str, target: str, model: str, detected: Optional[str], value: bytes) -> None:
+        now = int(time.time())
+        async with self.pool.write() as db:
+            await _exec(
+                db,
+                """
+                INSERT INTO translation_cache(key, target, model, detected, value, size, created_at, used_at)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET detected = excluded.detected, value = excluded.value,
+                                               size = excluded.size, used_at = excluded.used_at
+                """,
+                (key, target, model, detected, value, len(value), now, now),
+            )
+
+    async def delete_cached_translation(self, key: str) -> None:
+        async with self.pool.write() as db:
+            await _exec(db, "DELETE FROM translation_cache WHERE key = ?", (key,))
+
+    async def prune_translation_cache(self, max_bytes: int, max_age: int) -> int:
+        async with self.pool.write() as db:
+            expired = await _exec(db, "DELETE FROM translation_cache WHERE used_at < ?",
+                                  (int(time.time()) - int(max_age),))
+            over = await _exec(
+                db,
+                """
+                DELETE FROM translation_cache WHERE key IN (
+                  SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY used_at DESC, key) AS running FROM translation_cache
+                  ) WHERE running > ?
+                )
+                """,
+                (int(max_bytes),),
+            )
+            return expired + over
+
+def make_storage(name: str, path: str = "") -> Storage:
+    """"sqlite" (the file at `path`) or "memory"."""
+    if name == "sqlite":
+        return SQLiteStorage(path)
+    if name == "memory":
+        return MemoryStorage()
+    raise ValueError(f"unknown STORAGE_BACKEND {name!r} (expected 'sqlite' or 'memory')")
+
+_store: Optional[Storage] = None
+
+def _get_store() -> Storage:
+    global _store
+    if (_store is None or _store.closed or _store.name != STORAGE
+            or (STORAGE == "sqlite" and _store.path != DB_PATH)):
+        # repointed (benchmarks): the old backend is closed in the background and the caches dropped
+        old, _store = _store, make_storage(STORAGE, DB_PATH)
+        if old is not None:
+            _guild_cache.clear()
+            _user_cache.clear()
+            if not old.closed:
+                asyncio.get_running_loop().create_task(old.close())
+    return _store
+
+async def close() -> None:
+    """Shutdown hook: close the backend (bot.py calls this on exit)."""
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+def stats() -> dict:
+    return {**_ops, **(_store.stats() if _store else {})}
+
+async def ensure_schema() -> None:
+    await _get_store().ensure_schema()
+
+# ---------- XP ----------
 async def add_message_xp(guild_id: int, user_id: int, delta: int) -> None:
-    db = await _connect()
-    try:
-        await _upsert_xp(db, guild_id, user_id)
-        await _exec(
-            db,
-            "UPDATE xp SET xp = xp + ?, messages = messages + 1 WHERE guild_id = ? AND user_id = ?",
-            (max(0, int(delta)), guild_id, user_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().add_message_xp(guild_id, user_id, delta)
 
 async def add_translation_xp(guild_id: int, user_id: int, delta: int) -> None:
-    db = await _connect()
-    try:
-        await _upsert_xp(db, guild_id, user_id)
-        await _exec(
-            db,
-            "UPDATE xp SET xp = xp + ?, translations = translations + 1 WHERE guild_id = ? AND user_id = ?",
-            (max(0, int(delta)), guild_id, user_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().add_translation_xp(guild_id, user_id, delta)
 
 async def add_voice_seconds(guild_id: int, user_id: int, seconds: int) -> None:
-    if seconds <= 0:
-        return
-    db = await _connect()
-    try:
-        await _upsert_xp(db, guild_id, user_id)
-        await _exec(
-            db,
-            "UPDATE xp SET voice_seconds = voice_seconds + ? WHERE guild_id = ? AND user_id = ?",
-            (int(seconds), guild_id, user_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().add_voice_seconds(guild_id, user_id, seconds)
+
+async def apply_xp_deltas(rows: List[Tuple[int, int, int, int, int, int]]) -> None:
+    """rows: (guild_id, user_id, xp, messages, translations, voice_seconds) deltas, applied in one transaction."""
+    if rows:
+        await _get_store().apply_xp_deltas(rows)
 
 async def get_xp(guild_id: int, user_id: int) -> Tuple[int, int, int, int]:
-    db = await _connect()
-    try:
-        row = await _one(
-            db,
-            "SELECT xp, messages, translations, voice_seconds FROM xp WHERE guild_id = ? AND user_id = ?",
-            (guild_id, user_id),
-        )
-        return (0, 0, 0, 0) if not row else (int(row[0]), int(row[1]), int(row[2]), int(row[3]))
-    finally:
-        await db.close()
-
-async def get_xp_leaderboard(guild_id: int, limit: int = 10, offset: int = 0):
-    db = await _connect()
-    try:
-        return await _all(
-            db,
-            """
-            SELECT user_id, xp, messages, translations, voice_seconds
-              FROM xp
-             WHERE guild_id = ?
-             ORDER BY xp DESC, messages DESC
-             LIMIT ? OFFSET ?
-            """,
-            (guild_id, int(limit), int(offset)),
-        )
-    finally:
-        await db.close()
+    return await _get_store().get_xp(guild_id, user_id)
+
+async def get_rank_rows(guild_id: int) -> List[Tuple[int, int, int]]:
+    """(user_id, xp, messages) for every member of a guild, to build a rank index."""
+    return await _get_store().get_rank_rows(guild_id)
+
+async def get_xp_leaderboard(guild_id: int, limit: int = 10,
+                             after: Optional[Tuple[int, int, int]] = None):
+    """
+    One page of (user_id, xp, messages, translations, voice_seconds), ranked by xp, then messages,
+    then user_id. `after` is the (xp, messages, user_id) of the previous page's last row (keyset
+    pagination: each page is an index seek, whatever its depth).
+    """
+    return await _get_store().get_xp_leaderboard(guild_id, limit=limit, after=after)
 
 # ---------- guild language / channels / meta ----------
+# Read on every message, written by admins about once a month: served from in-process snapshots.
+# Every setter below invalidates after its commit; this process is the only writer.
+_guild_cache = ReadThroughCache()
+_user_cache = ReadThroughCache(max_items=USER_PREF_CACHE)
+
+def cache_stats() -> dict:
+    return {"guild_config": _guild_cache.stats(), "user_prefs": _user_cache.stats()}
+
+async def get_guild_config(guild_id: int) -> GuildConfig:
+    """Channels, emote, server language, error channel and speculation for a guild, in one (cached) read."""
+    return await _guild_cache.get(guild_id, lambda: _get_store().load_guild_config(guild_id))
+
+async def preload_guild_configs() -> int:
+    """Fill the guild cache for every configured guild (startup); returns how many were loaded."""
+    for gid, cfg in (await _get_store().load_guild_configs()).items():
+        _guild_cache.put(gid, cfg)
+    return len(_guild_cache)
+
 async def set_server_lang(guild_id: int, code: str) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            """
-            INSERT INTO guild_settings(guild_id, server_lang) VALUES(?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET server_lang = excluded.server_lang
-            """,
-            (guild_id, code),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().set_server_lang(guild_id, code)
+    _guild_cache.invalidate(guild_id)
 
 async def get_server_lang(guild_id: int) -> Optional[str]:
-    db = await _connect()
-    try:
-        row = await _one(db, "SELECT server_lang FROM guild_settings WHERE guild_id = ?", (guild_id,))
-        return row[0] if row and row[0] else None
-    finally:
-        await db.close()
+    return (await get_guild_config(guild_id)).server_lang
 
 async def get_translation_channels(guild_id: int) -> Optional[List[int]]:
     """
     Returns a list of allowed channel IDs if any are configured;
     returns None to mean 'allow all channels'.
     """
-    db = await _connect()
-    try:
-        rows = await _all(db, "SELECT channel_id FROM translate_channels WHERE guild_id = ?", (guild_id,))
-        if not rows:
-            return None
-        return [int(r[0]) for r in rows]
-    finally:
-        await db.close()
+    channels = (await get_guild_config(guild_id)).channels
+    return sorted(channels) if channels else None
 
 async def allow_translation_channel(guild_id: int, channel_id: int) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            "INSERT OR IGNORE INTO translate_channels(guild_id, channel_id) VALUES(?, ?)",
-            (guild_id, channel_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().allow_translation_channel(guild_id, channel_id)
+    _guild_cache.invalidate(guild_id)
 
 async def remove_translation_channel(guild_id: int, channel_id: int) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            "DELETE FROM translate_channels WHERE guild_id = ? AND channel_id = ?",
-            (guild_id, channel_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().remove_translation_channel(guild_id, channel_id)
+    _guild_cache.invalidate(guild_id)
 
 async def set_user_lang(user_id: int, code: str) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            """
-            INSERT INTO user_prefs(user_id, lang_code) VALUES(?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET lang_code = excluded.lang_code
-            """,
-            (user_id, code),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().set_user_lang(user_id, code)
+    _user_cache.invalidate(user_id)
 
 async def get_user_lang(user_id: int) -> Optional[str]:
-    db = await _connect()
-    try:
-        row = await _one(db, "SELECT lang_code FROM user_prefs WHERE user_id = ?", (user_id,))
-        return row[0] if row else None
-    finally:
-        await db.close()
+    return await _user_cache.get(user_id, lambda: _get_store().get_user_lang(user_id))
 
 # meta: error channel & emote
 async def set_error_channel(guild_id: int, channel_id: Optional[int]) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            """
-            INSERT INTO guild_meta(guild_id, error_channel_id) VALUES(?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET error_channel_id = excluded.error_channel_id
-            """,
-            (guild_id, channel_id),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().set_error_channel(guild_id, channel_id)
+    _guild_cache.invalidate(guild_id)
 
 async def get_error_channel(guild_id: int) -> Optional[int]:
-    db = await _connect()
-    try:
-        row = await _one(db, "SELECT error_channel_id FROM guild_meta WHERE guild_id = ?", (guild_id,))
-        return int(row[0]) if row and row[0] is not None else None
-    finally:
-        await db.close()
+    return (await get_guild_config(guild_id)).error_channel
 
 async def set_bot_emote(guild_id: int, emote: str) -> None:
-    db = await _connect()
-    try:
-        await _exec(
-            db,
-            """
-            INSERT INTO guild_meta(guild_id, bot_emote) VALUES(?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET bot_emote = excluded.bot_emote
-            """,
-            (guild_id, emote),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().set_bot_emote(guild_id, emote)
+    _guild_cache.invalidate(guild_id)
 
 async def get_bot_emote(guild_id: int) -> Optional[str]:
-    db = await _connect()
-    try:
-        row = await _one(db, "SELECT bot_emote FROM guild_meta WHERE guild_id = ?", (guild_id,))
-        return row[0] if row and row[0] else None
-    finally:
-        await db.close()
+    return (await get_guild_config(guild_id)).emote
+
+async def set_speculation(guild_id: int, enabled: bool) -> None:
+    await _get_store().set_speculation(guild_id, enabled)
+    _guild_cache.invalidate(guild_id)
+
+async def get_speculation(guild_id: int) -> bool:
+    return (await get_guild_config(guild_id)).speculate
 
 # ---------- level roles (setup/show/delete) ----------
 async def upsert_role_table(guild_id: int, mapping: List[Tuple[int, int, int]]) -> None:
@@ -321,37 +710,28 @@ async def upsert_role_table(guild_id: int, mapping: List[Tuple[int, int, int]])
     mapping: list of (lvl_start, lvl_end, role_id)
     Overwrites existing mapping for the guild.
     """
-    db = await _connect()
-    try:
-        await _exec(db, "DELETE FROM level_roles WHERE guild_id = ?", (guild_id,))
-        for ls, le, rid in mapping:
-            await _exec(
-                db,
-                "INSERT INTO level_roles(guild_id, lvl_start, lvl_end, role_id) VALUES(?, ?, ?, ?)",
-                (guild_id, int(ls), int(le), int(rid)),
-            )
-        await db.commit()
-    finally:
-        await db.close()
+    await _get_store().upsert_role_table(guild_id, mapping)
 
 async def get_role_table(guild_id: int) -> List[Tuple[int, int, int]]:
-    db = await _connect()
-    try:
-        rows = await _all(
-            db,
-            "SELECT lvl_start, lvl_end, role_id FROM level_roles WHERE guild_id = ? ORDER BY lvl_start",
-            (guild_id,),
-        )
-        return [(int(a), int(b), int(c)) for (a, b, c) in rows]
-    finally:
-        await db.close()
+    return await _get_store().get_role_table(guild_id)
 
 async def delete_role_table(guild_id: int) -> int:
-    db = await _connect()
-    try:
-        await _exec(db, "DELETE FROM level_roles WHERE guild_id = ?", (guild_id,))
-        changes = db.total_changes
-        await db.commit()
-        return changes
-    finally:
-        await db.close()
+    return await _get_store().delete_role_table(guild_id)
+
+# ---------- persistent translation cache ----------
+async def get_cached_translation(key: str, touch_after: int = 3600) -> Optional[Tuple[bytes, Optional[str]]]:
+    """
+    Returns (compressed value, detected) or None.
+    used_at is refreshed at most once per `touch_after` seconds to keep reads cheap.
+    """
+    return await _get_store().get_cached_translation(key, touch_after)
+
+async def put_cached_translation(key: str, target: str, model: str, detected: Optional[str], value: bytes) -> None:
+    await _get_store().put_cached_translation(key, target, model, detected, value)
+
+async def delete_cached_translation(key: str) -> None:
+    await _get_store().delete_cached_translation(key)
+
+async def prune_translation_cache(max_bytes: int, max_age: int) -> int:
+    """Drops entries unused for `max_age` seconds, then least recently used ones above `max_bytes`."""
+    return await _get_store().prune_translation_cache(max_bytes, max_age)
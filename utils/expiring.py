@@ -0,0 +1,50 @@
+# utils/expiring.py
+# Set whose members expire after a fixed TTL — no timers or tasks per key.
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+class ExpiringSet:
+    """
+    With one TTL for all keys, insertion order is expiry order: an OrderedDict of key -> deadline is a
+    bucketed deque with O(1) add/discard/contains. Expired keys are dropped in batches from the front
+    on every write (and ignored by reads), and at most `max_items` keys are kept (oldest dropped first).
+    """
+    def __init__(self, ttl: float, max_items: int = 200_000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_items = max(1, max_items)
+        self.clock = clock
+        self._items: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.expired = self.evicted = 0
+
+    def add(self, key: Hashable):
+        now = self.clock()
+        self._expire(now)
+        self._items.pop(key, None)
+        self._items[key] = now + self.ttl
+        if len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+            self.evicted += 1
+
+    def discard(self, key: Hashable):
+        self._items.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        deadline = self._items.get(key)
+        return deadline is not None and deadline > self.clock()
+
+    def __len__(self) -> int:
+        self._expire(self.clock())
+        return len(self._items)
+
+    def _expire(self, now: float):
+        items = self._items
+        while items:
+            key, deadline = next(iter(items.items()))
+            if deadline > now:
+                break
+            del items[key]
+            self.expired += 1
+
+    def stats(self) -> dict:
+        return {"size": len(self), "expired": self.expired, "evicted": self.evicted}
@@ -0,0 +1,119 @@
+# utils/fanout.py
+# Target languages requested for one message while its first translation is in flight go out in one call.
+import asyncio
+from typing import Dict, Hashable, Tuple
+
+from utils.config import FANOUT_WINDOW_MS, FANOUT_MAX_TARGETS
+from utils.translator import TranslationEngine
+
+class _Group:
+    __slots__ = ("text", "targets", "timer")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.targets: Dict[str, asyncio.Future] = {}
+        self.timer = None
+
+class TargetFanout:
+    """
+    translate(key, text, target): the first target for `key` (e.g. a message id) goes out at once; targets
+    requested while a call for that key is in flight wait for it to finish (at most `window_ms`) and then
+    share one multi-target model call. Targets the reply misses are retried singly.
+    """
+    def __init__(self, engine: TranslationEngine, window_ms: int = FANOUT_WINDOW_MS,
+                 max_targets: int = FANOUT_MAX_TARGETS):
+        self.engine = engine
+        self.window = max(0, window_ms) / 1000.0
+        self.max_targets = max(1, max_targets)
+        self._groups: Dict[Hashable, _Group] = {}   # key -> targets not sent yet
+        self._busy: Dict[Hashable, int] = {}        # key -> calls in flight
+        self._tasks = set()                         # strong references; the loop only keeps weak ones
+        self.calls = 0        # multi-target model calls
+        self.fanned = 0       # targets answered by a multi-target call
+        self.fallbacks = 0    # targets retried singly
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_targets > 1
+
+    async def translate(self, key: Hashable, text: str, target_lang: str) -> Tuple[str, str]:
+        if not self.enabled:
+            return await self.engine.translate(text, target_lang)
+
+        group = self._groups.get(key)
+        if group is not None and group.text != text:
+            self._release(key)
+            group = None
+        if group is None:
+            group = self._groups[key] = _Group(text)
+            if key in self._busy:
+                group.timer = asyncio.get_running_loop().call_later(self.window, self._release, key)
+
+        fut = group.targets.get(target_lang)
+        if fut is None:
+            fut = group.targets[target_lang] = asyncio.get_running_loop().create_future()
+            if group.timer is None or len(group.targets) >= self.max_targets:
+                self._release(key)
+        return await fut
+
+    def _release(self, key: Hashable):
+        group = self._groups.pop(key, None)
+        if group is None:
+            return
+        if group.timer is not None:
+            group.timer.cancel()
+        self._busy[key] = self._busy.get(key, 0) + 1
+        task = asyncio.create_task(self._send(key, group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Hashable, group: _Group):
+        try:
+            await self._run(group)
+        finally:
+            n = self._busy.pop(key) - 1
+            if n:
+                self._busy[key] = n
+            else:
+                self._release(key)   # targets that queued behind this call go out now
+
+    async def _run(self, group: _Group):
+        targets = list(group.targets)
+        if len(targets) == 1:
+            return await self._single(group, targets[0])
+
+        try:
+            results, detected = await self.engine.translate_many(group.text, targets)
+        except Exception as e:
+            for fut in group.targets.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.calls += 1
+
+        missing = []
+        for target, fut in group.targets.items():
+            if target not in results:
+                missing.append(target)
+            elif not fut.done():
+                self.fanned += 1
+                fut.set_result((results[target], detected))
+
+        if missing:
+            self.fallbacks += len(missing)
+            await asyncio.gather(*(self._single(group, t) for t in missing))
+
+    async def _single(self, group: _Group, target: str):
+        fut = group.targets[target]
+        try:
+            result = await self.engine.translate(group.text, target)
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+            return
+        if not fut.done():
+            fut.set_result(result)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "fanned": self.fanned, "fallbacks": self.fallbacks,
+                "open_groups": len(self._groups), "in_flight": sum(self._busy.values())}
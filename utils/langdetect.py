@@ -0,0 +1,202 @@
+# utils/langdetect.py
+# Offline language identification for SUPPORTED_LANGUAGES.
+# Non-Latin scripts are decided by Unicode block (+ marker letters inside a block);
+# Latin-script languages by character-trigram profiles built from utils/language_samples.
+import re, math, unicodedata
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, NamedTuple
+
+from utils.language_data import CODE_SET
+from utils.language_samples import SEED_TEXT
+
+MAX_CHARS = 1000        # enough signal; keeps 2 MB attachments cheap
+MIN_LETTERS = 12        # below this we never claim confidence
+MIN_TRIGRAMS = 15
+MIN_MARGIN = 0.25       # mean log-prob gap per trigram between best and runner-up
+
+class Guess(NamedTuple):
+    lang: str           # ISO 639-1 code or "unknown"
+    confidence: float   # 0..1
+    confident: bool     # safe to act on (skip the model, fill the title)
+
+UNKNOWN = Guess("unknown", 0.0, False)
+
+# ---------- scripts ----------
+_RANGES = sorted([
+    (0x0041, 0x024F, "latn"), (0x1E00, 0x1EFF, "latn"),
+    (0x0370, 0x03FF, "grek"), (0x1F00, 0x1FFF, "grek"),
+    (0x0400, 0x04FF, "cyrl"),
+    (0x0590, 0x05FF, "hebr"),
+    (0x0600, 0x06FF, "arab"), (0x0750, 0x077F, "arab"), (0xFB50, 0xFDFF, "arab"), (0xFE70, 0xFEFF, "arab"),
+    (0x0900, 0x097F, "deva"), (0x0980, 0x09FF, "beng"), (0x0A00, 0x0A7F, "guru"), (0x0A80, 0x0AFF, "gujr"),
+    (0x0B80, 0x0BFF, "taml"), (0x0C00, 0x0C7F, "telu"), (0x0C80, 0x0CFF, "knda"), (0x0D00, 0x0D7F, "mlym"),
+    (0x0E00, 0x0E7F, "thai"), (0x1200, 0x137F, "ethi"),
+    (0x1100, 0x11FF, "hang"), (0x3130, 0x318F, "hang"), (0xAC00, 0xD7AF, "hang"),
+    (0x3040, 0x30FF, "kana"),
+    (0x3400, 0x4DBF, "hani"), (0x4E00, 0x9FFF, "hani"),
+])
+_STARTS = [r[0] for r in _RANGES]
+
+# scripts that map to exactly one supported language
+_SINGLE = {
+    "grek": "el", "hebr": "he", "beng": "bn", "guru": "pa", "gujr": "gu", "taml": "ta",
+    "telu": "te", "knda": "kn", "mlym": "ml", "thai": "th", "ethi": "am", "hang": "ko", "kana": "ja",
+}
+
+def _script(ch: str):
+    cp = ord(ch)
+    i = bisect_right(_STARTS, cp) - 1
+    if i >= 0 and cp <= _RANGES[i][1]:
+        return _RANGES[i][2]
+    return None
+
+def _has(text: str, letters: str) -> bool:
+    return any(c in text for c in letters)
+
+# letters of Cyrillic languages we don't support (Belarusian ў, Kazakh, Tatar, Tajik, Mongolian, Macedonian):
+# they share і, ы, ј… with the supported ones, so no marker below can settle such text
+_CYRL_OTHER = "ўЎәӘғҒқҚңҢөӨұҰүҮһҺҳҲҷҶӣӢӯӮҗҖҫҪѓЃќЌѕЅ"
+
+# Each returns (lang, settled): settled only when a marker letter or word decides it. Without one
+# the block's most common language is just a fallback (Bulgarian without ъ reads as Russian), so
+# detect() leaves it unconfident and the model decides.
+def _cyrillic(text: str):
+    if _has(text, _CYRL_OTHER):
+        return "ru", False
+    if _has(text, "јљњџЈЉЊЏ"):
+        # shared with Macedonian; ђ/ћ or the copula "је" (Macedonian "е") decide
+        return "sr", _has(text, "ђћЂЋ") or re.search(r"(?<!\w)је(?!\w)", text) is not None
+    if _has(text, "ђћЂЋ"):
+        return "sr", True
+    if _has(text, "їєґЇЄҐ"):
+        return "uk", True
+    if _has(text, "іІ"):
+        # Belarusian writes і and has no и
+        return "uk", _has(text, "иИ")
+    if _has(text, "ыэёЫЭЁ"):
+        return "ru", True
+    if _has(text, "ъЪ"):
+        return "bg", True
+    return "ru", False
+
+def _arabic(text: str):
+    if _has(text, "ٹڈڑںےھ"):
+        return "ur", True
+    if _has(text, "پچژگکی"):
+        return "fa", True
+    # Arabic yeh / kaf / ta marbuta: Persian and Urdu write ی and ک instead
+    return "ar", _has(text, "يكة")
+
+_DEVA_WORD_RE = re.compile(r"[\u0900-\u0963\u0966-\u097F]+")   # Devanagari without the dandas
+_HINDI_WORDS = {"है", "हैं", "था", "थी", "थे", "नहीं", "में", "और", "से", "को", "के", "हूँ"}
+
+def _devanagari(text: str):
+    if "ळ" in text or re.search(r"(आहे|आणि|नाही|आहेत)", text):
+        return "mr", True
+    return "hi", any(w in _HINDI_WORDS for w in _DEVA_WORD_RE.findall(text))
+
+# Simplified-only and Traditional-only forms of common characters, leaving out the ones Japanese
+# also writes (時, 会, 国, 学…): a kanji-only Japanese sentence must not count as either
+_HANS = set("们这个说时为对过还发经见话请让给问题关开长门东车马么书买卖报边从动队风该刚欢记间进块乐离两难鸟农"
+            "钱认实识岁头现样业应园远运种专总吗谢觉听爱")
+_HANT = set("們這說對國沒發經讓關麼兒樂賣邊當點從廣歡會來兩氣錢實歲寫學樣應專總嗎覺聽裡臺灣妳")
+
+def _han(text: str):
+    """("zh", settled): settled only for text that is clearly Simplified Chinese."""
+    hans = sum(c in _HANS for c in text)
+    hant = sum(c in _HANT for c in text)
+    return "zh", hans > hant
+
+# ---------- Latin trigram profiles ----------
+_WORD_RE = re.compile(r"(?:[^\W\d_]|[\u0300-\u036f])+")
+
+def _trigrams(text: str) -> Counter:
+    grams = Counter()
+    for w in _WORD_RE.findall(text.lower()):
+        w = f" {w} "
+        for i in range(len(w) - 2):
+            grams[w[i:i + 3]] += 1
+    return grams
+
+def _build_profiles(alpha: float = 0.5):
+    supported = CODE_SET
+    profiles: Dict[str, Dict[str, float]] = {}
+    unseen: Dict[str, float] = {}
+    for lang, seed in SEED_TEXT.items():
+        if lang not in supported:
+            continue
+        grams = _trigrams(unicodedata.normalize("NFC", seed))
+        denom = sum(grams.values()) + alpha * 4096
+        profiles[lang] = {g: math.log((n + alpha) / denom) for g, n in grams.items()}
+        unseen[lang] = math.log(alpha / denom)
+    return profiles, unseen
+
+_PROFILES, _UNSEEN = _build_profiles()
+_LANGS = list(_PROFILES)
+_BASE = [_UNSEEN[l] for l in _LANGS]
+# sparse: trigram -> ((lang index, log-prob gain over "unseen"), ...)
+_GAIN: Dict[str, tuple] = {}
+for _i, _l in enumerate(_LANGS):
+    for _g, _lp in _PROFILES[_l].items():
+        _GAIN[_g] = _GAIN.get(_g, ()) + ((_i, _lp - _UNSEEN[_l]),)
+
+def _latin(text: str) -> Guess:
+    scores = [0.0] * len(_LANGS)
+    n = 0
+    for g, c in _trigrams(text).items():
+        gains = _GAIN.get(g)
+        if gains is None:
+            continue
+        n += c
+        for i, gain in gains:
+            scores[i] += gain * c
+    if not n:
+        return UNKNOWN
+    ranked = sorted(((scores[i] / n + _BASE[i], i) for i in range(len(_LANGS))), reverse=True)
+    (best, i), second = ranked[0], ranked[1][0]
+    margin = best - second
+    confident = n >= MIN_TRIGRAMS and margin >= MIN_MARGIN
+    return Guess(_LANGS[i], round(min(1.0, margin / (2 * MIN_MARGIN)), 3), confident)
+
+# ---------- public ----------
+def detect(text: str) -> Guess:
+    """Best guess for `text`. Only act on it when `.confident` is True."""
+    text = unicodedata.normalize("NFC", (text or "")[:MAX_CHARS])
+    counts = Counter()
+    for ch in text:
+        if ch.isalpha():
+            s = _script(ch)
+            if s:
+                counts[s] += 1
+    letters = sum(counts.values())
+    if not letters:
+        return UNKNOWN
+
+    script, n = counts.most_common(1)[0]
+    share = n / letters
+    enough = letters >= MIN_LETTERS and share >= 0.8
+
+    if script == "hani" or script == "kana":
+        # Japanese mixes kana into Han text; Chinese has none. Han-only text may still be Traditional
+        # Chinese or kanji-only Japanese, so "zh" needs Simplified forms to be trusted
+        cjk = counts["kana"] + counts["hani"]
+        if counts["kana"] and counts["kana"] >= 0.05 * cjk:
+            lang, settled = "ja", True
+        else:
+            lang, settled = _han(text)
+        share = cjk / letters
+        return Guess(lang, round(share if settled else share / 2, 3), cjk >= 4 and share >= 0.8 and settled)
+    if script == "latn":
+        guess = _latin(text)
+        return guess._replace(confident=guess.confident and enough)
+    settled = True
+    if script == "cyrl":
+        lang, settled = _cyrillic(text)
+    elif script == "arab":
+        lang, settled = _arabic(text)
+    elif script == "deva":
+        lang, settled = _devanagari(text)
+    else:
+        lang = _SINGLE.get(script, "unknown")
+    return Guess(lang, round(share if settled else share / 2, 3), enough and settled and lang != "unknown")
@@ -1,3 +1,11 @@
+# utils/language_data.py
+import re, unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from discord import app_commands
+
 # Country flag + proper ISO 639-1 code + common English name
 SUPPORTED_LANGUAGES = [
     {"code": "en", "name": "English", "flag": "🇬🇧"},
@@ -52,10 +60,114 @@ SUPPORTED_LANGUAGES = [
     {"code": "yo", "name": "Yoruba", "flag": "🇳🇬"},
 ]
 
+# Endonyms, so people can find their language by the name they use for it
+NATIVE_NAMES = {
+    "en": "English", "de": "Deutsch", "fr": "Français", "es": "Español", "pt": "Português",
+    "it": "Italiano", "ru": "Русский", "ja": "日本語", "zh": "中文", "ko": "한국어", "tr": "Türkçe",
+    "pl": "Polski", "sv": "Svenska", "ar": "العربية", "hi": "हिन्दी", "ro": "Română", "nl": "Nederlands",
+    "fi": "Suomi", "el": "Ελληνικά", "cs": "Čeština", "da": "Dansk", "no": "Norsk", "hu": "Magyar",
+    "uk": "Українська", "he": "עברית", "id": "Bahasa Indonesia", "vi": "Tiếng Việt", "th": "ไทย",
+    "fa": "فارسی", "bn": "বাংলা", "ta": "தமிழ்", "mr": "मराठी", "gu": "ગુજરાતી", "pa": "ਪੰਜਾਬੀ",
+    "kn": "ಕನ್ನಡ", "ml": "മലയാളം", "te": "తెలుగు", "ur": "اردو", "sr": "Српски", "hr": "Hrvatski",
+    "bg": "Български", "sk": "Slovenčina", "sl": "Slovenščina", "et": "Eesti", "lv": "Latviešu",
+    "lt": "Lietuvių", "ms": "Bahasa Melayu", "sw": "Kiswahili", "am": "አማርኛ", "yo": "Yorùbá",
+}
+
+# ---------- registry (built once at import) ----------
+def _fold(s: str) -> str:
+    """Casefolded, accents stripped: "Français" and "francais" compare equal."""
+    return "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch)).casefold()
+
+def _bigrams(s: str) -> Set[str]:
+    s = f" {s} "
+    return {s[i:i + 2] for i in range(len(s) - 1)}
+
+class LanguageIndex:
+    """
+    O(1) code lookup and validation, labels and app_commands.Choice objects built once, and ranked
+    autocomplete: exact code, code prefix, name prefix, word prefix ("simp" → Chinese (Simplified)),
+    substring, then typo-tolerant bigram matches. Ties keep list order (most used languages first).
+    English and native names are both searched. Prefixes come from bisecting one sorted key list;
+    results are cached per query.
+    """
+    def __init__(self, languages: List[dict], limit: int = 25):
+        self.limit = limit
+        self.codes: Tuple[str, ...] = tuple(l["code"] for l in languages)
+        self.code_set: FrozenSet[str] = frozenset(self.codes)
+        self.order = {c: i for i, c in enumerate(self.codes)}
+        self.labels: Dict[str, str] = {l["code"]: f'{l["flag"]} {l["name"]} ({l["code"]})' for l in languages}
+        self.choices = {c: app_commands.Choice(name=self.labels[c], value=c) for c in self.codes}
+        self._names = {l["code"]: _fold(l["name"]) for l in languages}
+        native = {c: _fold(NATIVE_NAMES[c]) for c in self.codes if c in NATIVE_NAMES}
+
+        keys = []   # (key, tier, code)
+        for code in self.codes:
+            keys.append((code, 1, code))
+            for name in {self._names[code], native.get(code, "")} - {""}:
+                keys.append((name, 2, code))
+                keys.extend((w, 3, code) for w in re.findall(r"\w+", name)[1:])
+        keys.sort()
+        self._keys = [k for k, _t, _c in keys]
+        self._key_info = [(t, c) for _k, t, c in keys]
+        self._grams: Dict[str, List[str]] = {}
+        for code, name in self._names.items():
+            for g in _bigrams(name):
+                self._grams.setdefault(g, []).append(code)
+        self._gram_count = {code: len(_bigrams(name)) for code, name in self._names.items()}
+        self._cached = lru_cache(maxsize=4096)(self._search)
+
+    def label(self, code: str) -> str:
+        return self.labels.get(code) or f"🏳️ {code} — Unknown"
+
+    def search(self, query: str) -> List[app_commands.Choice]:
+        return list(self._cached(_fold((query or "").strip())))
+
+    def _search(self, q: str) -> Tuple[app_commands.Choice, ...]:
+        if not q:
+            return tuple(self.choices[c] for c in self.codes[:self.limit])
+        best: Dict[str, Tuple[int, float]] = {}
+
+        def put(code: str, tier: int, score: float = 0.0):
+            if code not in best or (tier, score) < best[code]:
+                best[code] = (tier, score)
+
+        if q in self.code_set:
+            put(q, 0)
+        i = bisect_left(self._keys, q)
+        while i < len(self._keys) and self._keys[i].startswith(q):
+            put(*self._key_info[i][::-1])
+            i += 1
+        if len(best) < self.limit:
+            for code, name in self._names.items():
+                if q in name:
+                    put(code, 4)
+        if len(best) < self.limit and len(q) >= 3:
+            shared: Dict[str, int] = {}
+            grams = _bigrams(q)
+            for g in grams:
+                for code in self._grams.get(g, ()):
+                    shared[code] = shared.get(code, 0) + 1
+            for code, n in shared.items():
+                dice = 2 * n / (len(grams) + self._gram_count[code])
+                if dice >= 0.5:
+                    put(code, 5, -dice)
+        ranked = sorted(best, key=lambda c: (*best[c], self.order[c]))
+        return tuple(self.choices[c] for c in ranked[:self.limit])
+
+_INDEX = LanguageIndex(SUPPORTED_LANGUAGES)
+CODES = _INDEX.codes
+CODE_SET = _INDEX.code_set
+
+def is_supported(code: str) -> bool:
+    return code in CODE_SET
+
 def label(code: str) -> str:
-    lang = next((x for x in SUPPORTED_LANGUAGES if x["code"] == code), None)
-    if not lang: return f"🏳️ {code} — Unknown"
-    return f'{lang["flag"]} {lang["name"]} ({lang["code"]})'
+    return _INDEX.label(code)
+
+def codes() -> List[str]:
+    """A fresh list on every call, as before the registry was compiled; callers may extend it."""
+    return list(CODES)
 
-def codes():
-    return [x["code"] for x in SUPPORTED_LANGUAGES]
+def search_choices(query: str) -> List[app_commands.Choice]:
+    """Ranked autocomplete choices (at most 25, Discord's limit) for what the user typed so far."""
+    return _INDEX.search(query)
@@ -0,0 +1,221 @@
+# utils/language_samples.py
+# Seed text for the offline detector's Latin-script n-gram profiles (utils/langdetect.py).
+# Same everyday content in each language keeps the profiles comparable.
+SEED_TEXT = {
+    "en": (
+        "I think we should meet tomorrow at the station and talk about what happened. "
+        "Please read the rules before you post anything in this channel. "
+        "Thank you so much for your help, it was really kind of you. Where are you going this weekend? "
+        "The weather is nice and we would like to go outside with our friends. "
+        "This is one of the best games I have ever played, but the new update has some problems. "
+        "I don't know if that is true, but he said that he would not come today."
+    ),
+    "de": (
+        "Ich glaube, wir sollten uns morgen am Bahnhof treffen und darüber sprechen, was passiert ist. "
+        "Bitte lies die Regeln, bevor du etwas in diesem Kanal schreibst. "
+        "Vielen Dank für deine Hilfe, das war wirklich nett von dir. Wohin fährst du am Wochenende? "
+        "Das Wetter ist schön und wir möchten mit unseren Freunden nach draußen gehen. "
+        "Das ist eines der besten Spiele, die ich je gespielt habe, aber das neue Update hat einige Probleme. "
+        "Ich weiß nicht, ob das stimmt, aber er hat gesagt, dass er heute nicht kommt."
+    ),
+    "fr": (
+        "Je pense que nous devrions nous retrouver demain à la gare pour parler de ce qui s'est passé. "
+        "Merci de lire les règles avant de publier quoi que ce soit dans ce salon. "
+        "Merci beaucoup pour ton aide, c'était vraiment gentil de ta part. Où est-ce que tu vas ce week-end ? "
+        "Il fait beau et nous aimerions sortir avec nos amis. "
+        "C'est l'un des meilleurs jeux auxquels j'ai jamais joué, mais la nouvelle mise à jour a quelques problèmes. "
+        "Je ne sais pas si c'est vrai, mais il a dit qu'il ne viendrait pas aujourd'hui."
+    ),
+    "es": (
+        "Creo que deberíamos vernos mañana en la estación y hablar de lo que pasó. "
+        "Por favor, lee las reglas antes de publicar algo en este canal. "
+        "Muchas gracias por tu ayuda, fue muy amable de tu parte. ¿Adónde vas este fin de semana? "
+        "Hace buen tiempo y nos gustaría salir con nuestros amigos. "
+        "Es uno de los mejores juegos que he jugado nunca, pero la nueva actualización tiene algunos problemas. "
+        "No sé si eso es verdad, pero él dijo que hoy no vendría."
+    ),
+    "pt": (
+        "Acho que devíamos nos encontrar amanhã na estação e conversar sobre o que aconteceu. "
+        "Por favor, leia as regras antes de publicar qualquer coisa neste canal. "
+        "Muito obrigado pela sua ajuda, foi muito gentil da sua parte. Para onde você vai neste fim de semana? "
+        "O tempo está bom e gostaríamos de sair com os nossos amigos. "
+        "É um dos melhores jogos que já joguei, mas a nova atualização tem alguns problemas. "
+        "Não sei se isso é verdade, mas ele disse que não vem hoje."
+    ),
+    "it": (
+        "Penso che dovremmo vederci domani alla stazione e parlare di quello che è successo. "
+        "Per favore, leggi le regole prima di pubblicare qualcosa in questo canale. "
+        "Grazie mille per il tuo aiuto, è stato davvero gentile da parte tua. Dove vai questo fine settimana? "
+        "Il tempo è bello e vorremmo uscire con i nostri amici. "
+        "È uno dei migliori giochi a cui abbia mai giocato, ma il nuovo aggiornamento ha alcuni problemi. "
+        "Non so se sia vero, ma lui ha detto che oggi non viene."
+    ),
+    "tr": (
+        "Bence yarın istasyonda buluşup olanlar hakkında konuşmalıyız. "
+        "Lütfen bu kanala bir şey yazmadan önce kuralları oku. "
+        "Yardımın için çok teşekkür ederim, gerçekten çok naziksin. Bu hafta sonu nereye gidiyorsun? "
+        "Hava güzel ve arkadaşlarımızla dışarı çıkmak istiyoruz. "
+        "Bu şimdiye kadar oynadığım en iyi oyunlardan biri, ama yeni güncellemenin bazı sorunları var. "
+        "Bunun doğru olup olmadığını bilmiyorum ama bugün gelmeyeceğini söyledi."
+    ),
+    "pl": (
+        "Myślę, że powinniśmy spotkać się jutro na dworcu i porozmawiać o tym, co się stało. "
+        "Proszę, przeczytaj zasady, zanim cokolwiek napiszesz na tym kanale. "
+        "Bardzo dziękuję za pomoc, to było naprawdę miłe z twojej strony. Dokąd jedziesz w ten weekend? "
+        "Pogoda jest ładna i chcielibyśmy wyjść z naszymi przyjaciółmi. "
+        "To jedna z najlepszych gier, w jakie kiedykolwiek grałem, ale nowa aktualizacja ma kilka problemów. "
+        "Nie wiem, czy to prawda, ale powiedział, że dzisiaj nie przyjdzie."
+    ),
+    "sv": (
+        "Jag tycker att vi borde träffas i morgon på stationen och prata om vad som hände. "
+        "Läs reglerna innan du skriver något i den här kanalen. "
+        "Tack så mycket för din hjälp, det var verkligen snällt av dig. Vart ska du åka i helgen? "
+        "Vädret är fint och vi vill gärna gå ut med våra vänner. "
+        "Det är ett av de bästa spelen jag någonsin har spelat, men den nya uppdateringen har några problem. "
+        "Jag vet inte om det är sant, men han sa att han inte kommer i dag."
+    ),
+    "ro": (
+        "Cred că ar trebui să ne întâlnim mâine la gară și să vorbim despre ce s-a întâmplat. "
+        "Te rog să citești regulile înainte de a posta ceva pe acest canal. "
+        "Mulțumesc mult pentru ajutor, a fost foarte drăguț din partea ta. Unde mergi în acest weekend? "
+        "Vremea este frumoasă și am vrea să ieșim cu prietenii noștri. "
+        "Este unul dintre cele mai bune jocuri pe care le-am jucat vreodată, dar noua actualizare are câteva probleme. "
+        "Nu știu dacă este adevărat, dar el a spus că nu vine astăzi."
+    ),
+    "nl": (
+        "Ik denk dat we morgen op het station moeten afspreken en praten over wat er gebeurd is. "
+        "Lees alsjeblieft de regels voordat je iets in dit kanaal plaatst. "
+        "Heel erg bedankt voor je hulp, dat was echt aardig van je. Waar ga je dit weekend naartoe? "
+        "Het weer is mooi en we willen graag met onze vrienden naar buiten gaan. "
+        "Het is een van de beste spellen die ik ooit heb gespeeld, maar de nieuwe update heeft een paar problemen. "
+        "Ik weet niet of dat waar is, maar hij zei dat hij vandaag niet komt."
+    ),
+    "fi": (
+        "Minusta meidän pitäisi tavata huomenna asemalla ja puhua siitä, mitä tapahtui. "
+        "Lue säännöt ennen kuin kirjoitat mitään tälle kanavalle. "
+        "Kiitos paljon avustasi, se oli todella ystävällistä sinulta. Minne olet menossa tänä viikonloppuna? "
+        "Sää on kaunis ja haluaisimme lähteä ulos ystäviemme kanssa. "
+        "Tämä on yksi parhaista peleistä, joita olen koskaan pelannut, mutta uudessa päivityksessä on joitakin ongelmia. "
+        "En tiedä, onko se totta, mutta hän sanoi, ettei tule tänään."
+    ),
+    "cs": (
+        "Myslím, že bychom se měli zítra sejít na nádraží a promluvit si o tom, co se stalo. "
+        "Prosím, přečti si pravidla, než cokoli napíšeš do tohoto kanálu. "
+        "Moc děkuji za tvou pomoc, bylo to od tebe opravdu milé. Kam jedeš tento víkend? "
+        "Počasí je hezké a rádi bychom šli ven s našimi přáteli. "
+        "Je to jedna z nejlepších her, jaké jsem kdy hrál, ale nová aktualizace má několik problémů. "
+        "Nevím, jestli je to pravda, ale říkal, že dnes nepřijde."
+    ),
+    "da": (
+        "Jeg synes, vi skal mødes i morgen på stationen og tale om, hvad der skete. "
+        "Læs venligst reglerne, før du skriver noget i denne kanal. "
+        "Mange tak for din hjælp, det var virkelig sødt af dig. Hvor skal du hen i weekenden? "
+        "Vejret er godt, og vi vil gerne gå ud med vores venner. "
+        "Det er et af de bedste spil, jeg nogensinde har spillet, men den nye opdatering har nogle problemer. "
+        "Jeg ved ikke, om det er sandt, men han sagde, at han ikke kommer i dag."
+    ),
+    "no": (
+        "Jeg synes vi burde møtes i morgen på stasjonen og snakke om hva som skjedde. "
+        "Vennligst les reglene før du skriver noe i denne kanalen. "
+        "Tusen takk for hjelpen, det var veldig snilt av deg. Hvor skal du i helgen? "
+        "Været er fint, og vi har lyst til å gå ut med vennene våre. "
+        "Det er et av de beste spillene jeg noen gang har spilt, men den nye oppdateringen har noen problemer. "
+        "Jeg vet ikke om det er sant, men han sa at han ikke kommer i dag."
+    ),
+    "hu": (
+        "Szerintem holnap találkoznunk kellene az állomáson, és beszélnünk arról, ami történt. "
+        "Kérlek, olvasd el a szabályokat, mielőtt bármit írsz ebbe a csatornába. "
+        "Nagyon köszönöm a segítségedet, igazán kedves volt tőled. Hová mész ezen a hétvégén? "
+        "Szép az idő, és szeretnénk kimenni a barátainkkal. "
+        "Ez az egyik legjobb játék, amivel valaha játszottam, de az új frissítésnek van néhány problémája. "
+        "Nem tudom, hogy igaz-e, de azt mondta, hogy ma nem jön."
+    ),
+    "id": (
+        "Saya pikir kita harus bertemu besok di stasiun dan membicarakan apa yang terjadi. "
+        "Tolong baca peraturannya sebelum kamu memposting sesuatu di saluran ini. "
+        "Terima kasih banyak atas bantuanmu, kamu sangat baik. Kamu mau pergi ke mana akhir pekan ini? "
+        "Cuacanya bagus dan kami ingin keluar bersama teman-teman kami. "
+        "Ini adalah salah satu game terbaik yang pernah saya mainkan, tetapi pembaruan yang baru memiliki beberapa masalah. "
+        "Saya tidak tahu apakah itu benar, tapi dia bilang dia tidak datang hari ini."
+    ),
+    "ms": (
+        "Saya rasa kita patut berjumpa esok di stesen dan bercakap tentang apa yang berlaku. "
+        "Sila baca peraturan sebelum anda menghantar apa-apa di saluran ini. "
+        "Terima kasih banyak atas bantuan anda, anda sangat baik hati. Awak hendak pergi ke mana hujung minggu ini? "
+        "Cuaca baik dan kami mahu keluar bersama kawan-kawan kami. "
+        "Ini ialah salah satu permainan terbaik yang pernah saya main, tetapi kemas kini baharu itu mempunyai beberapa masalah. "
+        "Saya tidak pasti sama ada itu betul, tetapi dia kata dia tidak akan datang hari ini."
+    ),
+    "vi": (
+        "Tôi nghĩ chúng ta nên gặp nhau vào ngày mai ở nhà ga và nói chuyện về những gì đã xảy ra. "
+        "Vui lòng đọc các quy tắc trước khi đăng bất cứ điều gì trong kênh này. "
+        "Cảm ơn bạn rất nhiều vì đã giúp đỡ, bạn thật sự rất tốt bụng. Cuối tuần này bạn đi đâu? "
+        "Thời tiết đẹp và chúng tôi muốn ra ngoài với bạn bè. "
+        "Đây là một trong những trò chơi hay nhất mà tôi từng chơi, nhưng bản cập nhật mới có một số vấn đề. "
+        "Tôi không biết điều đó có đúng không, nhưng anh ấy nói hôm nay sẽ không đến."
+    ),
+    "hr": (
+        "Mislim da bismo se trebali sutra naći na kolodvoru i razgovarati o tome što se dogodilo. "
+        "Molim te, pročitaj pravila prije nego što bilo što objaviš u ovom kanalu. "
+        "Puno ti hvala na pomoći, to je bilo stvarno lijepo od tebe. Kamo ideš ovaj vikend? "
+        "Vrijeme je lijepo i željeli bismo izaći s našim prijateljima. "
+        "To je jedna od najboljih igara koje sam ikada igrao, ali novo ažuriranje ima nekoliko problema. "
+        "Ne znam je li to istina, ali rekao je da danas neće doći."
+    ),
+    "sk": (
+        "Myslím, že by sme sa mali zajtra stretnúť na stanici a porozprávať sa o tom, čo sa stalo. "
+        "Prosím, prečítaj si pravidlá predtým, ako niečo napíšeš do tohto kanála. "
+        "Veľmi pekne ďakujem za tvoju pomoc, bolo to od teba naozaj milé. Kam ideš tento víkend? "
+        "Počasie je pekné a radi by sme išli von s našimi priateľmi. "
+        "Je to jedna z najlepších hier, aké som kedy hral, ale nová aktualizácia má niekoľko problémov. "
+        "Neviem, či je to pravda, ale povedal, že dnes nepríde."
+    ),
+    "sl": (
+        "Mislim, da bi se morali jutri dobiti na postaji in se pogovoriti o tem, kar se je zgodilo. "
+        "Prosim, preberi pravila, preden karkoli objaviš v tem kanalu. "
+        "Najlepša hvala za tvojo pomoč, to je bilo res prijazno od tebe. Kam greš ta vikend? "
+        "Vreme je lepo in radi bi šli ven z našimi prijatelji. "
+        "To je ena najboljših iger, kar sem jih kdaj igral, vendar ima nova posodobitev nekaj težav. "
+        "Ne vem, ali je to res, ampak rekel je, da danes ne bo prišel."
+    ),
+    "et": (
+        "Ma arvan, et me peaksime homme jaamas kohtuma ja rääkima sellest, mis juhtus. "
+        "Palun loe reeglid läbi, enne kui sellesse kanalisse midagi postitad. "
+        "Suur tänu abi eest, see oli sinust tõesti kena. Kuhu sa sel nädalavahetusel lähed? "
+        "Ilm on ilus ja me tahaksime oma sõpradega välja minna. "
+        "See on üks parimaid mänge, mida ma kunagi mänginud olen, aga uuel uuendusel on mõned probleemid. "
+        "Ma ei tea, kas see on tõsi, aga ta ütles, et ta täna ei tule."
+    ),
+    "lv": (
+        "Es domāju, ka mums vajadzētu rīt satikties stacijā un parunāt par to, kas notika. "
+        "Lūdzu, izlasi noteikumus, pirms kaut ko publicē šajā kanālā. "
+        "Liels paldies par palīdzību, tas bija ļoti jauki no tavas puses. Kur tu brauc šajā nedēļas nogalē? "
+        "Laiks ir skaists, un mēs gribētu iziet ārā kopā ar draugiem. "
+        "Šī ir viena no labākajām spēlēm, ko esmu jebkad spēlējis, bet jaunajam atjauninājumam ir dažas problēmas. "
+        "Es nezinu, vai tā ir taisnība, bet viņš teica, ka šodien nenāks."
+    ),
+    "lt": (
+        "Manau, kad rytoj turėtume susitikti stotyje ir pasikalbėti apie tai, kas nutiko. "
+        "Prašau, perskaityk taisykles prieš ką nors paskelbdamas šiame kanale. "
+        "Labai ačiū už pagalbą, tai buvo tikrai malonu iš tavo pusės. Kur važiuoji šį savaitgalį? "
+        "Oras gražus, ir mes norėtume išeiti su savo draugais. "
+        "Tai vienas geriausių žaidimų, kuriuos kada nors žaidžiau, bet naujas atnaujinimas turi keletą problemų. "
+        "Nežinau, ar tai tiesa, bet jis sakė, kad šiandien neateis."
+    ),
+    "sw": (
+        "Nadhani tunapaswa kukutana kesho kwenye kituo na kuzungumza kuhusu kilichotokea. "
+        "Tafadhali soma sheria kabla ya kuandika chochote katika chaneli hii. "
+        "Asante sana kwa msaada wako, ulikuwa mwema sana. Unaenda wapi mwishoni mwa wiki hii? "
+        "Hali ya hewa ni nzuri na tungependa kutoka nje na marafiki zetu. "
+        "Huu ni mmoja wa michezo bora zaidi ambayo nimewahi kucheza, lakini sasisho jipya lina matatizo kadhaa. "
+        "Sijui kama hiyo ni kweli, lakini alisema hatakuja leo."
+    ),
+    "yo": (
+        "Mo rò pé ó yẹ ká pàdé ní ibùdókọ̀ ní ọ̀la ká sì sọ̀rọ̀ nípa ohun tó ṣẹlẹ̀. "
+        "Jọ̀wọ́ ka àwọn òfin kí o tó kọ ohunkóhun sínú ikanni yìí. "
+        "Ẹ ṣé púpọ̀ fún ìrànlọ́wọ́ rẹ, o ṣe dáadáa gan-an. Níbo ni o ń lọ ní òpin ọ̀sẹ̀ yìí? "
+        "Ojú ọjọ́ dára, a sì fẹ́ jáde pẹ̀lú àwọn ọ̀rẹ́ wa. "
+        "Èyí jẹ́ ọ̀kan lára àwọn eré tó dára jù lọ tí mo ti ṣe rí, ṣùgbọ́n àtúnṣe tuntun ní àwọn ìṣòro kan. "
+        "Mi ò mọ̀ bóyá òótọ́ ni, ṣùgbọ́n ó sọ pé òun kò ní wá lónìí."
+    ),
+}
@@ -0,0 +1,94 @@
+# utils/masking.py
+# Protect spans the model must not touch (code, URLs, mentions, custom emoji, numeric data) by swapping
+# them for compact placeholders before translation and restoring them afterwards.
+import re
+from typing import List, Tuple
+
+OPEN, CLOSE = "⟦", "⟧"
+PLACEHOLDER_HINT = f"Keep every {OPEN}n{CLOSE} placeholder exactly as it is."
+
+_PATTERNS = [
+    re.compile(r"```.*?(?:```|\Z)", re.S),                      # fenced code (unterminated runs to the end)
+    re.compile(r"`[^`\n]+`"),                                   # inline code
+    re.compile(r"<a?:\w+:\d+>"),                                # custom emoji
+    re.compile(r"<(?:@[!&]?|#)\d+>|<t:-?\d+(?::[tTdDfFR])?>|</[\w -]+:\d+>"),  # mentions, timestamps, commands
+    re.compile(r"https?://[^\s<>]+[^\s<>.,:;!?)\]'\"]"),        # URLs (without trailing punctuation)
+]
+_PLACEHOLDER_RE = re.compile(re.escape(OPEN) + r"\s*(\d+)\s*" + re.escape(CLOSE))
+_LETTER_RE = re.compile(r"[^\W\d_]")
+MIN_DATA_LINE = 8   # letterless lines at least this long (CSV rows, tables, ids) are protected
+
+def _data_lines(text: str):
+    """Spans of consecutive lines without letters (numeric CSV rows, separators, id lists)."""
+    start = None
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        body = line.strip()
+        if body and not _LETTER_RE.search(body) and (len(body) >= MIN_DATA_LINE or start is not None):
+            if start is None:
+                start = pos
+            end = pos + len(line.rstrip("\r\n"))
+        elif body or start is None:
+            if start is not None:
+                yield start, end
+            start = None
+        pos += len(line)
+    if start is not None:
+        yield start, end
+
+def mask(text: str) -> Tuple[str, List[str]]:
+    """(masked text, protected spans). Placeholder i stands for spans[i]; text already using ⟦ ⟧ is left alone."""
+    if not text or OPEN in text or CLOSE in text:
+        return text, []
+    taken: List[Tuple[int, int]] = []
+
+    def free(a: int, b: int) -> bool:
+        return all(b <= x or a >= y for x, y in taken)
+
+    for pat in _PATTERNS:
+        for m in pat.finditer(text):
+            if free(m.start(), m.end()):
+                taken.append((m.start(), m.end()))
+    for a, b in _data_lines(text):
+        if free(a, b):
+            taken.append((a, b))
+
+    spans, out, pos = [], [], 0
+    for a, b in sorted(taken):
+        token = f"{OPEN}{len(spans)}{CLOSE}"
+        if b - a <= len(token):
+            continue    # nothing to save
+        out.append(text[pos:a])
+        out.append(token)
+        spans.append(text[a:b])
+        pos = b
+    out.append(text[pos:])
+    return "".join(out), spans
+
+def unmask(text: str, spans: List[str], partial: bool = False) -> Tuple[str, int]:
+    """
+    (restored text, number of placeholders the model dropped). Dropped spans are appended on their
+    own lines so nothing the author wrote is lost; `partial` (streamed prefixes) skips that step.
+    """
+    if not spans:
+        return text, 0
+    seen = set()
+
+    def put(m):
+        i = int(m.group(1))
+        if i >= len(spans):
+            return m.group(0)
+        seen.add(i)
+        return spans[i]
+
+    out = _PLACEHOLDER_RE.sub(put, text)
+    if partial:
+        return out, 0
+    lost = [s for i, s in enumerate(spans) if i not in seen]
+    if lost:
+        out = "\n".join([out.rstrip(), *lost])
+    return out, len(lost)
+
+def only_protected(masked: str) -> bool:
+    """True when nothing translatable is left once placeholders are removed."""
+    return not _LETTER_RE.search(_PLACEHOLDER_RE.sub("", masked))
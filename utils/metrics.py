@@ -0,0 +1,36 @@
+# utils/metrics.py
+# Tiny in-process latency histograms for the owner dashboard and benchmarks.
+import random
+from typing import Dict, List
+
+class LatencyHistogram:
+    """Keeps a bounded reservoir sample; percentiles are computed on demand."""
+    def __init__(self, size: int = 2048):
+        self.size = size
+        self.samples: List[float] = []
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            i = random.randrange(self.count)
+            if i < self.size:
+                self.samples[i] = seconds
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        s = sorted(self.samples)
+        return s[min(len(s) - 1, int(len(s) * p / 100.0))]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p99_ms": round(self.percentile(99) * 1000, 1),
+        }
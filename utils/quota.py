@@ -0,0 +1,114 @@
+# utils/quota.py
+# Hierarchical token buckets (user → guild → global) for translation requests and estimated tokens.
+import time
+from typing import Dict, Optional
+
+from utils.config import (
+    QUOTA_USER_REQ_PER_MIN, QUOTA_USER_TOKENS_PER_MIN,
+    QUOTA_GUILD_REQ_PER_MIN, QUOTA_GUILD_TOKENS_PER_MIN,
+    QUOTA_GLOBAL_REQ_PER_MIN, QUOTA_GLOBAL_TOKENS_PER_MIN,
+)
+
+class _Bucket:
+    """Two buckets in one object: requests and tokens, both refilled per minute up to their burst."""
+    __slots__ = ("req", "tok", "ts")
+
+    def __init__(self, req: float, tok: float, now: float):
+        self.req, self.tok, self.ts = req, tok, now
+
+class _Level:
+    __slots__ = ("name", "req_rate", "tok_rate", "buckets")
+
+    def __init__(self, name: str, req_per_min: int, tok_per_min: int):
+        self.name = name
+        self.req_rate = req_per_min / 60.0
+        self.tok_rate = tok_per_min / 60.0
+        self.buckets: Dict[int, _Bucket] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.req_rate > 0 or self.tok_rate > 0
+
+    def _refill(self, key: int, now: float) -> _Bucket:
+        b = self.buckets.get(key)
+        if b is None:
+            b = self.buckets[key] = _Bucket(self.req_rate * 60, self.tok_rate * 60, now)
+            return b
+        dt = now - b.ts
+        if dt > 0:
+            b.req = min(self.req_rate * 60, b.req + dt * self.req_rate)
+            b.tok = min(self.tok_rate * 60, b.tok + dt * self.tok_rate)
+            b.ts = now
+        return b
+
+    def wait(self, key: int, tokens: int, now: float) -> float:
+        """Seconds until this level can afford 1 request + `tokens` (0.0 = now)."""
+        b = self._refill(key, now)
+        w = 0.0
+        if self.req_rate > 0 and b.req < 1:
+            w = max(w, (1 - b.req) / self.req_rate)
+        if self.tok_rate > 0:
+            need = min(tokens, self.tok_rate * 60)  # oversized requests wait for a full bucket, not forever
+            if b.tok < need:
+                w = max(w, (need - b.tok) / self.tok_rate)
+        return w
+
+    def take(self, key: int, tokens: int):
+        b = self.buckets[key]
+        if self.req_rate > 0:
+            b.req -= 1
+        if self.tok_rate > 0:
+            b.tok = max(-self.tok_rate * 60, b.tok - tokens)
+
+    def prune(self, now: float):
+        """
+        Drop buckets that have refilled completely by `now` — they hold no state worth keeping.
+        A bucket in debt (tokens below zero) stays until the debt is paid back, however idle.
+        """
+        full = [k for k, b in self.buckets.items()
+                if b.req + (now - b.ts) * self.req_rate >= self.req_rate * 60
+                and b.tok + (now - b.ts) * self.tok_rate >= self.tok_rate * 60]
+        for k in full:
+            del self.buckets[k]
+
+class QuotaManager:
+    """
+    check(guild_id, user_id, tokens) charges the user, guild and global buckets together
+    or none of them. Returns None when allowed, else the seconds to wait.
+    """
+    def __init__(self, prune_every: int = 1000):
+        self.levels = [
+            _Level("user", QUOTA_USER_REQ_PER_MIN, QUOTA_USER_TOKENS_PER_MIN),
+            _Level("guild", QUOTA_GUILD_REQ_PER_MIN, QUOTA_GUILD_TOKENS_PER_MIN),
+            _Level("global", QUOTA_GLOBAL_REQ_PER_MIN, QUOTA_GLOBAL_TOKENS_PER_MIN),
+        ]
+        self.prune_every = prune_every
+        self.allowed = 0
+        self.throttled: Dict[str, int] = {lvl.name: 0 for lvl in self.levels}
+
+    def check(self, guild_id: int, user_id: int, tokens: int) -> Optional[float]:
+        now = time.monotonic()
+        keys = (user_id, guild_id, 0)
+        for lvl, key in zip(self.levels, keys):
+            if not lvl.enabled:
+                continue
+            w = lvl.wait(key, tokens, now)
+            if w > 0:
+                self.throttled[lvl.name] += 1
+                return w
+        for lvl, key in zip(self.levels, keys):
+            if lvl.enabled:
+                lvl.take(key, tokens)
+        self.allowed += 1
+        if self.allowed % self.prune_every == 0:
+            for lvl in self.levels:
+                lvl.prune(now)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            **{f"throttled_{k}": v for k, v in self.throttled.items()},
+            "tracked_users": len(self.levels[0].buckets),
+            "tracked_guilds": len(self.levels[1].buckets),
+        }
@@ -0,0 +1,160 @@
+# utils/rank_index.py
+# Per-guild order statistics over XP: rank and percentile of a member by binary search, no table scan.
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+_MSG_BITS = 24                      # messages break xp ties; capped at 16.7M per member
+_MSG_MAX = (1 << _MSG_BITS) - 1
+_XP_MAX = (1 << (63 - _MSG_BITS)) - 1
+
+def rank_key(xp: int, messages: int) -> int:
+    """(xp, messages) packed into one int64 that sorts like the leaderboard (ascending = lower rank)."""
+    return (min(max(0, xp), _XP_MAX) << _MSG_BITS) | min(max(0, messages), _MSG_MAX)
+
+class _Fenwick:
+    """Prefix sums of block sizes in O(log n)."""
+    __slots__ = ("tree",)
+
+    def __init__(self, sizes):
+        tree = [0] + list(sizes)
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self.tree = tree
+
+    def add(self, i: int, delta: int):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of the first i sizes."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+_LOAD = 1024   # keys per block; blocks split at twice this
+
+class RankIndex:
+    """
+    One guild: every member's key in sorted blocks of array('q') (8 bytes a key), the last key of
+    each block, a Fenwick tree over block sizes, and user_id -> key. rank() is two bisects and a
+    Fenwick prefix sum (O(log n)); update() moves at most one block's tail, so a flush stays cheap
+    in a guild of a million members. Members with the same xp and messages share a rank
+    (competition ranking: 1, 2, 2, 4).
+    """
+    __slots__ = ("blocks", "maxes", "sizes", "by_user", "size")
+
+    def __init__(self, rows: Iterable[Tuple[int, int, int]] = ()):
+        """rows: (user_id, xp, messages), in any order."""
+        self.by_user: Dict[int, int] = {uid: rank_key(xp, msgs) for uid, xp, msgs in rows}
+        keys = sorted(self.by_user.values())
+        self.blocks = [array("q", keys[i:i + _LOAD]) for i in range(0, len(keys), _LOAD)]
+        self.size = len(keys)
+        self._reindex()
+
+    def _reindex(self):
+        self.maxes = [b[-1] for b in self.blocks]
+        self.sizes = _Fenwick(len(b) for b in self.blocks)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _insert(self, key: int):
+        if not self.blocks:
+            self.blocks.append(array("q", [key]))
+            self._reindex()
+            return
+        i = min(bisect_left(self.maxes, key), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, key)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * _LOAD:
+            self.blocks[i:i + 1] = [block[:_LOAD], block[_LOAD:]]
+            self._reindex()
+        else:
+            self.sizes.add(i, 1)
+
+    def _remove(self, key: int):
+        i = bisect_left(self.maxes, key)
+        block = self.blocks[i]
+        del block[bisect_left(block, key)]
+        if block:
+            self.maxes[i] = block[-1]
+            self.sizes.add(i, -1)
+        else:
+            del self.blocks[i]
+            self._reindex()
+
+    def _count_below(self, key: int, inclusive: bool) -> int:
+        find = bisect_right if inclusive else bisect_left
+        i = find(self.maxes, key)   # blocks before i lie wholly below (or at) key
+        within = find(self.blocks[i], key) if i < len(self.blocks) else 0
+        return self.sizes.prefix(i) + within
+
+    def update(self, user_id: int, d_xp: int, d_messages: int):
+        old = self.by_user.get(user_id)
+        if old is None:
+            xp = msgs = 0
+            self.size += 1
+        else:
+            xp, msgs = old >> _MSG_BITS, old & _MSG_MAX
+            self._remove(old)
+        new = self.by_user[user_id] = rank_key(xp + d_xp, msgs + d_messages)
+        self._insert(new)
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, int]]:
+        """(rank, members) with rank 1 = top, or None for a member with no XP row."""
+        key = self.by_user.get(user_id)
+        if key is None:
+            return None
+        return self.size - self._count_below(key, inclusive=True) + 1, self.size
+
+    def percentile(self, user_id: int) -> Optional[float]:
+        """Share of members ranked strictly below, 0-100."""
+        key = self.by_user.get(user_id)
+        if key is None:
+            return None
+        return 100.0 * self._count_below(key, inclusive=False) / self.size
+
+class GuildRanks:
+    """
+    RankIndex per guild, built on first use and kept for the `max_guilds` most recently used guilds
+    (an evicted guild is rebuilt from the xp table on its next lookup). The owner of the XP writes
+    (XPAggregator) calls apply() after every committed flush.
+    """
+    def __init__(self, max_guilds: int):
+        self.max_guilds = max(1, max_guilds)
+        self._guilds: "OrderedDict[int, RankIndex]" = OrderedDict()
+        self.builds = self.evictions = 0
+
+    def get(self, guild_id: int) -> Optional[RankIndex]:
+        idx = self._guilds.get(guild_id)
+        if idx is not None:
+            self._guilds.move_to_end(guild_id)
+        return idx
+
+    def put(self, guild_id: int, idx: RankIndex) -> RankIndex:
+        self._guilds[guild_id] = idx
+        self.builds += 1
+        while len(self._guilds) > self.max_guilds:
+            self._guilds.popitem(last=False)
+            self.evictions += 1
+        return idx
+
+    def apply(self, deltas: Iterable[Tuple[int, int, int, int]]):
+        """deltas: (guild_id, user_id, xp, messages); guilds without a built index are skipped."""
+        for gid, uid, d_xp, d_msgs in deltas:
+            idx = self._guilds.get(gid)
+            if idx is not None:
+                idx.update(uid, d_xp, d_msgs)
+
+    def stats(self) -> dict:
+        return {"guilds": len(self._guilds), "members": sum(len(i) for i in self._guilds.values()),
+                "builds": self.builds, "evictions": self.evictions}
@@ -0,0 +1,112 @@
+# utils/resilience.py
+# Failure handling for the model provider: error classification, jittered backoff, circuit breaker.
+import asyncio, random, time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import openai
+
+from utils.config import BREAKER_FAILURES, BREAKER_COOLDOWN
+
+class ProviderUnavailable(Exception):
+    """The circuit breaker is open: the provider failed repeatedly and is not being called right now."""
+    def __init__(self, retry_in: float):
+        super().__init__(f"translation provider unavailable, retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+class BackendError(Exception):
+    """An HTTP-style failure from a non-OpenAI backend (e.g. injected by the local backend)."""
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(f"{status_code} {message}".strip())
+        self.status_code = status_code
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from a Retry-After / retry-after-ms header on an API error, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+def is_transient(exc: BaseException) -> bool:
+    """Worth retrying, and a sign of provider trouble: timeouts, connection errors, 408/409/429/5xx."""
+    if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, (openai.APIStatusError, BackendError)):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class CircuitBreaker:
+    """
+    closed → open after `failures` consecutive transient errors; open fails fast for `cooldown` seconds,
+    then half-open lets one probe call through: success closes, failure re-opens.
+    """
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.failures = max(1, failures)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.opens = self.fast_fails = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.cooldown > 0
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def check(self):
+        """Raise ProviderUnavailable instead of calling an unhealthy provider."""
+        if not self.enabled or self.state == "closed":
+            return
+        if self.state == "open" and self.retry_in() <= 0:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        self.fast_fails += 1
+        raise ProviderUnavailable(self.retry_in())
+
+    def abandon(self):
+        """The call ended without an answer either way (cancelled): let another probe through."""
+        self._probing = False
+
+    def success(self):
+        self.consecutive = 0
+        self._probing = False
+        self.state = "closed"
+
+    def failure(self):
+        self.consecutive += 1
+        self._probing = False
+        if self.enabled and (self.state == "half_open" or self.consecutive >= self.failures):
+            if self.state != "open":
+                self.opens += 1
+                print(f"[translator] circuit breaker open for {self.cooldown:g}s after {self.consecutive} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "opens": self.opens, "fast_fails": self.fast_fails}
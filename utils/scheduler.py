@@ -0,0 +1,197 @@
+# utils/scheduler.py
+# Central translation job queue: priority lanes, deficit round-robin across guilds, bounded with shedding.
+import asyncio, time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from utils.config import SCHED_WORKERS, SCHED_MAX_QUEUE, SCHED_MAX_WAIT, SCHED_QUANTUM
+from utils.metrics import LatencyHistogram
+
+# Highest priority first. Interactive = slash commands / context menus, reaction = 🔃 DMs,
+# speculative = pre-translation of fresh messages nobody asked for yet.
+LANES = ("interactive", "reaction", "speculative")
+# Background lanes only use idle workers and are the first to be refused under load.
+BACKGROUND = ("speculative",)
+
+class SchedulerBusy(Exception):
+    """Raised to the submitter when its job is shed (queue full or waited too long)."""
+
+class _Job:
+    __slots__ = ("fn", "cost", "future", "enqueued")
+
+    def __init__(self, fn: Callable[[], Awaitable], cost: int, future: asyncio.Future):
+        self.fn, self.cost, self.future = fn, cost, future
+        self.enqueued = time.monotonic()
+
+class _Lane:
+    def __init__(self, name: str):
+        self.name = name
+        self.queues: Dict[int, Deque[_Job]] = {}   # guild_id -> jobs
+        self.deficit: Dict[int, int] = {}
+        self.active: Deque[int] = deque()          # guilds with work, in round-robin order
+        self.depth = 0
+        self.submitted = self.completed = self.shed = 0
+        self.wait = LatencyHistogram()
+
+    def push(self, guild_id: int, job: _Job):
+        q = self.queues.get(guild_id)
+        if q is None:
+            q = self.queues[guild_id] = deque()
+            self.deficit[guild_id] = 0
+            self.active.append(guild_id)
+        q.append(job)
+        self.depth += 1
+
+    def pop(self, quantum: int) -> Optional[_Job]:
+        """Deficit round-robin: each visit a guild earns `quantum` cost units to spend on its jobs."""
+        while self.active:
+            gid = self.active[0]
+            q = self.queues[gid]
+            if self.deficit[gid] >= q[0].cost:
+                job = q.popleft()
+                self.deficit[gid] -= job.cost
+                self.depth -= 1
+                if not q:
+                    self.active.popleft()
+                    del self.queues[gid], self.deficit[gid]
+                return job
+            self.deficit[gid] += quantum
+            self.active.rotate(-1)
+        return None
+
+class TranslationScheduler:
+    """
+    submit(lane, guild_id, fn, cost) queues fn() and returns its result once a worker ran it.
+    - lanes are served by priority; every `starve_after` picks a lower lane with work gets one turn
+    - within a lane, guilds share workers by deficit round-robin weighted by `cost` (estimated tokens)
+    - at most `max_queue` jobs wait (interactive gets a small reserve); jobs older than `max_wait` are shed
+    - background lanes run only when no foreground work waits and a quarter of the workers are idle;
+      otherwise they are refused at submit, and shed after `background_max_wait`
+    """
+    def __init__(self, workers: int = SCHED_WORKERS, max_queue: int = SCHED_MAX_QUEUE,
+                 max_wait: float = SCHED_MAX_WAIT, quantum: int = SCHED_QUANTUM, starve_after: int = 4,
+                 background_max_wait: float = 5.0):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.max_wait = max_wait
+        self.quantum = max(1, quantum)
+        self.starve_after = starve_after
+        self.background_max_wait = background_max_wait
+        self.lanes: Dict[str, _Lane] = {name: _Lane(name) for name in LANES}
+        self._order: List[_Lane] = [self.lanes[n] for n in LANES if n not in BACKGROUND]
+        self._background: List[_Lane] = [self.lanes[n] for n in BACKGROUND]
+        self._streak = 0
+        self._ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+
+    @property
+    def depth(self) -> int:
+        return sum(l.depth for l in self._order)
+
+    def idle(self) -> bool:
+        """Room for background work: nothing foreground waiting and a quarter of the workers free."""
+        return not self.depth and self.running + sum(l.depth for l in self._background) <= self.workers * 3 // 4
+
+    async def submit(self, lane: str, guild_id: int, fn: Callable[[], Awaitable], cost: int = 1):
+        ln = self.lanes[lane]
+        if ln in self._background:
+            if not self.idle():
+                ln.shed += 1
+                raise SchedulerBusy("no idle capacity for background work")
+        else:
+            limit = self.max_queue + (self.max_queue // 10 if ln is self._order[0] else 0)
+            if self.depth >= limit:
+                ln.shed += 1
+                raise SchedulerBusy("translation queue is full")
+        if not self._tasks:
+            self.start()
+        job = _Job(fn, max(1, int(cost)), asyncio.get_running_loop().create_future())
+        ln.push(guild_id or 0, job)
+        ln.submitted += 1
+        self._ready.set()
+        return await job.future
+
+    def _next(self):
+        """(lane, job) to run next, or (None, None)."""
+        top = self._order[0]
+        lower = [l for l in self._order[1:] if l.depth]
+        if top.depth and not (lower and self._streak >= self.starve_after):
+            self._streak += 1
+            return top, top.pop(self.quantum)
+        self._streak = 0
+        for lane in (lower or self._order) + self._background:
+            job = lane.pop(self.quantum)
+            if job:
+                return lane, job
+        return None, None
+
+    async def _worker(self):
+        while True:
+            lane, job = self._next()
+            if job is None:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            if job.future.done():         # submitter gave up while queued
+                continue
+            waited = time.monotonic() - job.enqueued
+            lane.wait.record(waited)
+            if waited > (self.background_max_wait if lane in self._background else self.max_wait):
+                lane.shed += 1
+                job.future.set_exception(SchedulerBusy("waited too long in the translation queue"))
+                continue
+            await self._run(lane, job)
+
+    async def _run(self, lane: _Lane, job: _Job):
+        self.running += 1
+        task = asyncio.ensure_future(job.fn())
+        abandoned = []
+
+        def on_done(f: asyncio.Future):
+            if f.cancelled():
+                abandoned.append(True)
+                task.cancel()
+        job.future.add_done_callback(on_done)
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.cancel()
+            # absorb only a submitter giving up; the worker itself being cancelled (stop(), shutdown) ends it
+            if not abandoned:
+                raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self.running -= 1
+            lane.completed += 1
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for lane in self._order + self._background:
+            while lane.depth:
+                job = lane.pop(1 << 30)
+                if job and not job.future.done():
+                    job.future.cancel()
+
+    def stats(self) -> dict:
+        out = {"workers": self.workers, "running": self.running}
+        for l in self._order + self._background:
+            w = l.wait.stats()
+            out.update({
+                f"{l.name}_depth": l.depth, f"{l.name}_done": l.completed, f"{l.name}_shed": l.shed,
+                f"{l.name}_wait_p50_ms": w["p50_ms"], f"{l.name}_wait_p99_ms": w["p99_ms"],
+            })
+        return out
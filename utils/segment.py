@@ -0,0 +1,89 @@
+# utils/segment.py
+# Split long text into model-sized chunks on paragraph/sentence boundaries; join results back in order.
+import re
+from typing import List, Tuple
+
+from utils.translator import estimate_tokens
+
+_PARA_RE = re.compile(r"(\n\s*\n)")
+_SENT_RE = re.compile(r"(?<=[.!?。！？…])(\s+)")
+
+def _hard_split(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    out = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        cut = cut if cut > max_chars // 2 else max_chars
+        out.append((text[:cut], ""))
+        text = text[cut:]
+    out.append((text, ""))
+    return out
+
+def _pieces(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """(piece, separator-after) at the finest boundary needed to fit max_tokens."""
+    parts = _PARA_RE.split(text)
+    out: List[Tuple[str, str]] = []
+    for i in range(0, len(parts), 2):
+        para, sep = parts[i], (parts[i + 1] if i + 1 < len(parts) else "")
+        if estimate_tokens(para) <= max_tokens:
+            out.append((para, sep))
+            continue
+        sents = _SENT_RE.split(para)
+        for j in range(0, len(sents), 2):
+            sent = sents[j]
+            ssep = sents[j + 1] if j + 1 < len(sents) else sep
+            if estimate_tokens(sent) <= max_tokens:
+                out.append((sent, ssep))
+            else:
+                hard = _hard_split(sent, max_tokens * 4)
+                hard[-1] = (hard[-1][0], ssep)
+                out.extend(hard)
+    return out
+
+def split_text(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """
+    Returns [(chunk, separator), ...] with every chunk within `max_tokens` (estimated).
+    "".join(chunk + sep) reproduces the input, so translated chunks can be rejoined in order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [(text, "")]
+    chunks: List[Tuple[str, str]] = []
+    buf, buf_tokens = "", 0
+    for piece, sep in _pieces(text, max_tokens):
+        t = estimate_tokens(piece + sep)
+        if buf and buf_tokens + t > max_tokens:
+            body = buf.rstrip()
+            chunks.append((body, buf[len(body):]))
+            buf, buf_tokens = "", 0
+        buf += piece + sep
+        buf_tokens += t
+    if buf:
+        body = buf.rstrip()
+        chunks.append((body, buf[len(body):]))
+    return [(c, s) for c, s in chunks if c.strip()] or [(text, "")]
+
+def join_chunks(translated: List[str], chunks: List[Tuple[str, str]]) -> str:
+    return "".join(t + sep for t, (_c, sep) in zip(translated, chunks)).strip()
+
+_SENT_BOUNDARY_RE = re.compile(r"\s*\n\s*|(?<=[.!?…])\s+|(?<=[。！？])\s*")
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """
+    [(sentence, separator), ...] split on line breaks and sentence punctuation (CJK without spaces).
+    "".join(s + sep) reproduces the input; leading whitespace is kept on the first sentence.
+    """
+    out: List[Tuple[str, str]] = []
+    pos = 0
+    for m in _SENT_BOUNDARY_RE.finditer(text or ""):
+        if m.end() == m.start() and m.start() == len(text):
+            break
+        if m.start() > pos:
+            out.append((text[pos:m.start()], m.group()))
+        elif out:
+            prev, sep = out[-1]
+            out[-1] = (prev, sep + m.group())
+        elif m.group():
+            out.append(("", m.group()))
+        pos = m.end()
+    if pos < len(text or ""):
+        out.append((text[pos:], ""))
+    return out
@@ -0,0 +1,63 @@
+# utils/singleflight.py
+# Merge identical concurrent calls: the first caller runs the work, the rest await the same result.
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies share one key."""
+    return " ".join((text or "").split())
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    do(key, fn) runs fn() once per key while it is in flight.
+    - errors propagate to every waiter; the key is released so the next call retries
+    - a cancelled waiter only stops waiting; the shared call is cancelled when nobody is left
+    """
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0    # leader executions
+        self.merged = 0   # callers that joined an existing flight
+        self.errors = 0   # leader executions that raised
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda t, k=key, f=flight: self._done(k, f, t))
+            self.calls += 1
+        else:
+            self.merged += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _done(self, key, flight: _Flight, task: asyncio.Task):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        total = self.calls + self.merged
+        return {
+            "calls": self.calls,
+            "merged": self.merged,
+            "errors": self.errors,
+            "in_flight": len(self._flights),
+            "merge_ratio": round(self.merged / total, 3) if total else 0.0,
+        }
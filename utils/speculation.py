@@ -0,0 +1,143 @@
+# utils/speculation.py
+# Decides which fresh messages to pre-translate, and into which languages, from what users actually request.
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Tuple
+
+from utils.config import (
+    SPEC_MAX_TARGETS, SPEC_MIN_REACT_PCT, SPEC_MIN_HIT_PCT, SPEC_WARMUP,
+    SPEC_TOKENS_PER_MIN, SPEC_MAX_TOKENS,
+)
+
+_HALVE_AT = 1000   # counters are halved past this, so old behaviour fades out
+
+class _Seen:
+    __slots__ = ("guild_id", "channel_id", "speculated", "requested")
+
+    def __init__(self, guild_id: int, channel_id: int):
+        self.guild_id, self.channel_id = guild_id, channel_id
+        self.speculated: set = set()
+        self.requested: set = set()
+
+class Speculator:
+    """
+    observe() every message in an opted-in translation channel, plan() which targets to pre-translate,
+    requested() for every reaction translation. Learns, with decaying counters:
+    - per channel: share of messages that get at least one translation request
+    - per guild: which target languages are requested, and how often a pre-translation was used
+    plan() returns [] until a channel and guild have warmed up, when the channel is cold, for long
+    messages, and when the guild's token budget is spent.
+    """
+    def __init__(self, max_targets: int = SPEC_MAX_TARGETS, min_react_pct: int = SPEC_MIN_REACT_PCT,
+                 min_hit_pct: int = SPEC_MIN_HIT_PCT, warmup: int = SPEC_WARMUP,
+                 tokens_per_min: int = SPEC_TOKENS_PER_MIN, max_tokens: int = SPEC_MAX_TOKENS,
+                 track: int = 5000):
+        self.max_targets = max_targets
+        self.min_react = min_react_pct / 100.0
+        self.min_hit = min_hit_pct / 100.0
+        self.warmup = max(1, warmup)
+        self.rate = tokens_per_min / 60.0
+        self.max_tokens = max_tokens
+        self.track = track
+        self.recent: "OrderedDict[int, _Seen]" = OrderedDict()     # message id -> what happened to it
+        self.channels: Dict[Tuple[int, int], List[float]] = {}      # (guild, channel) -> [messages, requested]
+        self.demand: Dict[int, Counter] = {}                        # guild -> target -> requests
+        self.usage: Dict[Tuple[int, str], List[float]] = {}         # (guild, target) -> [speculated, used]
+        self.budget: Dict[int, Tuple[float, float]] = {}            # guild -> (tokens, ts)
+        self.planned = self.speculated = self.hits = self.wasted = 0
+        self.over_budget = self.dropped = 0
+
+    @staticmethod
+    def _bump(pair: List[float], i: int):
+        pair[i] += 1
+        if pair[0] > _HALVE_AT:
+            pair[0] /= 2
+            pair[1] /= 2
+
+    def observe(self, guild_id: int, channel_id: int, message_id: int):
+        self.recent[message_id] = _Seen(guild_id, channel_id)
+        self._bump(self.channels.setdefault((guild_id, channel_id), [0.0, 0.0]), 0)
+        while len(self.recent) > self.track:
+            _mid, old = self.recent.popitem(last=False)
+            self.wasted += len(old.speculated - old.requested)
+
+    def targets(self, guild_id: int) -> List[str]:
+        """Most requested languages in the guild, minus those whose pre-translations go unused."""
+        demand = self.demand.get(guild_id)
+        if not demand or sum(demand.values()) < self.warmup:
+            return []
+        out = []
+        for lang, _n in demand.most_common():
+            spec, used = self.usage.get((guild_id, lang), (0.0, 0.0))
+            if spec >= self.warmup and used / spec < self.min_hit:
+                continue
+            out.append(lang)
+            if len(out) >= self.max_targets:
+                break
+        return out
+
+    def _afford(self, guild_id: int, cost: int) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        tokens, ts = self.budget.get(guild_id, (self.rate * 60, now))
+        tokens = min(self.rate * 60, tokens + (now - ts) * self.rate)
+        if tokens < cost:
+            self.budget[guild_id] = (tokens, now)
+            return False
+        self.budget[guild_id] = (tokens - cost, now)
+        return True
+
+    def plan(self, guild_id: int, channel_id: int, message_id: int, tokens: int) -> List[str]:
+        seen = self.recent.get(message_id)
+        if seen is None or tokens > self.max_tokens:
+            return []
+        messages, requested = self.channels.get((guild_id, channel_id), (0.0, 0.0))
+        if messages < self.warmup or requested / messages < self.min_react:
+            return []
+        targets = self.targets(guild_id)
+        if not targets:
+            return []
+        if not self._afford(guild_id, tokens * len(targets)):
+            self.over_budget += 1
+            return []
+        self.planned += 1
+        return targets
+
+    def started(self, guild_id: int, message_id: int, target: str):
+        """A pre-translation was actually submitted (it may still be shed by the scheduler)."""
+        seen = self.recent.get(message_id)
+        if seen is not None:
+            seen.speculated.add(target)
+        self.speculated += 1
+        self._bump(self.usage.setdefault((guild_id, target), [0.0, 0.0]), 0)
+
+    def requested(self, guild_id: int, channel_id: int, message_id: int, target: str) -> bool:
+        """Record a user's translation request; True when it was pre-translated."""
+        demand = self.demand.setdefault(guild_id, Counter())
+        demand[target] += 1
+        if sum(demand.values()) > _HALVE_AT:
+            for k in list(demand):
+                demand[k] //= 2
+                if not demand[k]:
+                    del demand[k]
+
+        seen = self.recent.get(message_id)
+        if seen is None:
+            return False
+        if not seen.requested:
+            self._bump(self.channels.setdefault((guild_id, channel_id), [0.0, 0.0]), 1)
+        hit = target in seen.speculated and target not in seen.requested
+        seen.requested.add(target)
+        if hit:
+            self.hits += 1
+            self._bump(self.usage.setdefault((guild_id, target), [0.0, 0.0]), 1)
+        return hit
+
+    def stats(self) -> dict:
+        return {
+            "planned": self.planned, "speculated": self.speculated, "hits": self.hits,
+            "hit_rate": round(self.hits / self.speculated, 3) if self.speculated else 0.0,
+            "wasted": self.wasted, "over_budget": self.over_budget, "dropped": self.dropped,
+            "channels": len(self.channels),
+        }
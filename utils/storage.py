@@ -0,0 +1,336 @@
+# utils/storage.py
+# Storage backends behind utils/database.py: the interface, and a pure in-memory implementation.
+# SQLiteStorage (the persistent one) lives in utils/database.py next to its connection pool.
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from utils.config_cache import GuildConfig, DEFAULT_GUILD_CONFIG
+
+XPRow = Tuple[int, int, int, int, int]   # user_id, xp, messages, translations, voice_seconds
+
+class Storage(ABC):
+    """
+    Raw persistence for XP, user prefs, guild settings / channels / meta, level roles and the L2
+    translation cache. No caching here: utils/database.py keeps the config caches in front of
+    whichever backend STORAGE_BACKEND selects, and invalidates them after each setter.
+    Every data method is abstract: a backend missing one fails when it is created.
+    """
+    name = "base"
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.closed = False
+
+    async def ensure_schema(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+    # ---------- XP ----------
+    @abstractmethod
+    async def add_message_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        ...
+
+    @abstractmethod
+    async def add_translation_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        ...
+
+    @abstractmethod
+    async def add_voice_seconds(self, guild_id: int, user_id: int, seconds: int) -> None:
+        ...
+
+    @abstractmethod
+    async def apply_xp_deltas(self, rows: List[Tuple[int, int, int, int, int, int]]) -> None:
+        """rows: (guild_id, user_id, xp, messages, translations, voice_seconds) deltas, applied atomically."""
+        ...
+
+    @abstractmethod
+    async def get_xp(self, guild_id: int, user_id: int) -> Tuple[int, int, int, int]:
+        ...
+
+    @abstractmethod
+    async def get_rank_rows(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        """(user_id, xp, messages) for every member of a guild, in any order."""
+        ...
+
+    @abstractmethod
+    async def get_xp_leaderboard(self, guild_id: int, limit: int = 10,
+                                 after: Optional[Tuple[int, int, int]] = None) -> List[XPRow]:
+        """Ranked by xp DESC, messages DESC, user_id; `after` is the previous page's last (xp, messages, user_id)."""
+        ...
+
+    # ---------- user prefs ----------
+    @abstractmethod
+    async def set_user_lang(self, user_id: int, code: str) -> None:
+        ...
+
+    @abstractmethod
+    async def get_user_lang(self, user_id: int) -> Optional[str]:
+        ...
+
+    # ---------- guild language / channels / meta ----------
+    @abstractmethod
+    async def load_guild_config(self, guild_id: int) -> GuildConfig:
+        ...
+
+    @abstractmethod
+    async def load_guild_configs(self) -> Dict[int, GuildConfig]:
+        """Every guild with any setting, channel or meta row."""
+        ...
+
+    @abstractmethod
+    async def set_server_lang(self, guild_id: int, code: str) -> None:
+        ...
+
+    @abstractmethod
+    async def allow_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        ...
+
+    @abstractmethod
+    async def remove_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        ...
+
+    @abstractmethod
+    async def set_error_channel(self, guild_id: int, channel_id: Optional[int]) -> None:
+        ...
+
+    @abstractmethod
+    async def set_bot_emote(self, guild_id: int, emote: str) -> None:
+        ...
+
+    @abstractmethod
+    async def set_speculation(self, guild_id: int, enabled: bool) -> None:
+        ...
+
+    # ---------- level roles ----------
+    @abstractmethod
+    async def upsert_role_table(self, guild_id: int, mapping: List[Tuple[int, int, int]]) -> None:
+        """mapping: (lvl_start, lvl_end, role_id); replaces the guild's table."""
+        ...
+
+    @abstractmethod
+    async def get_role_table(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        ...
+
+    @abstractmethod
+    async def delete_role_table(self, guild_id: int) -> int:
+        ...
+
+    # ---------- persistent translation cache ----------
+    @abstractmethod
+    async def get_cached_translation(self, key: str, touch_after: int = 3600) -> Optional[Tuple[bytes, Optional[str]]]:
+        ...
+
+    @abstractmethod
+    async def put_cached_translation(self, key: str, target: str, model: str, detected: Optional[str],
+                                     value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_cached_translation(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def prune_translation_cache(self, max_bytes: int, max_age: int) -> int:
+        ...
+
+class _XPTable:
+    """
+    One guild's xp rows as four array('q') columns; user_id -> slot. `ranked` is the leaderboard
+    order as (-xp, -messages, user_id), sorted on the first page read after a write.
+    """
+    __slots__ = ("slots", "users", "cols", "ranked")
+
+    def __init__(self):
+        self.slots: Dict[int, int] = {}
+        self.users = array("q")
+        self.cols = [array("q") for _ in range(4)]   # xp, messages, translations, voice_seconds
+        self.ranked: Optional[List[Tuple[int, int, int]]] = None
+
+    def add(self, user_id: int, xp: int = 0, messages: int = 0, translations: int = 0, voice_seconds: int = 0):
+        i = self.slots.get(user_id)
+        if i is None:
+            i = self.slots[user_id] = len(self.users)
+            self.users.append(user_id)
+            for col in self.cols:
+                col.append(0)
+        for col, d in zip(self.cols, (xp, messages, translations, voice_seconds)):
+            col[i] += d
+        self.ranked = None
+
+    def row(self, i: int) -> XPRow:
+        return (self.users[i], *(col[i] for col in self.cols))
+
+class MemoryStorage(Storage):
+    """
+    Everything in dicts and arrays, in this process: nothing touches disk and nothing survives a
+    restart. Meant for benchmarks, tests and trying the bot out; behaves like SQLiteStorage.
+    """
+    name = "memory"
+
+    def __init__(self, path: str = ":memory:"):
+        super().__init__(path)
+        self.xp: Dict[int, _XPTable] = {}
+        self.user_langs: Dict[int, str] = {}
+        self.guilds: Dict[int, dict] = {}                 # guild_id -> {server_lang, error_channel, emote, speculate}
+        self.channels: Dict[int, set] = {}
+        self.roles: Dict[int, List[Tuple[int, int, int]]] = {}
+        self.translations: Dict[str, list] = {}           # key -> [value, detected, used_at, target, model]
+        self.ops = 0
+
+    def stats(self) -> dict:
+        return {**super().stats(), "ops": self.ops,
+                "xp_rows": sum(len(t.users) for t in self.xp.values()), "cached_translations": len(self.translations)}
+
+    def _table(self, guild_id: int) -> _XPTable:
+        t = self.xp.get(guild_id)
+        if t is None:
+            t = self.xp[guild_id] = _XPTable()
+        return t
+
+    # ---------- XP ----------
+    async def add_message_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        self.ops += 1
+        self._table(guild_id).add(user_id, xp=max(0, int(delta)), messages=1)
+
+    async def add_translation_xp(self, guild_id: int, user_id: int, delta: int) -> None:
+        self.ops += 1
+        self._table(guild_id).add(user_id, xp=max(0, int(delta)), translations=1)
+
+    async def add_voice_seconds(self, guild_id: int, user_id: int, seconds: int) -> None:
+        if seconds <= 0:
+            return
+        self.ops += 1
+        self._table(guild_id).add(user_id, voice_seconds=int(seconds))
+
+    async def apply_xp_deltas(self, rows: List[Tuple[int, int, int, int, int, int]]) -> None:
+        self.ops += 1
+        for gid, uid, *d in rows:
+            self._table(gid).add(uid, *d)
+
+    async def get_xp(self, guild_id: int, user_id: int) -> Tuple[int, int, int, int]:
+        self.ops += 1
+        t = self.xp.get(guild_id)
+        i = t.slots.get(user_id) if t else None
+        return (0, 0, 0, 0) if i is None else tuple(col[i] for col in t.cols)
+
+    async def get_rank_rows(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        self.ops += 1
+        t = self.xp.get(guild_id)
+        return list(zip(t.users, t.cols[0], t.cols[1])) if t else []
+
+    async def get_xp_leaderboard(self, guild_id: int, limit: int = 10,
+                                 after: Optional[Tuple[int, int, int]] = None) -> List[XPRow]:
+        self.ops += 1
+        t = self.xp.get(guild_id)
+        if not t:
+            return []
+        if t.ranked is None:
+            t.ranked = sorted(zip((-x for x in t.cols[0]), (-m for m in t.cols[1]), t.users))
+        start = 0 if after is None else bisect_right(t.ranked, (-after[0], -after[1], after[2]))
+        return [t.row(t.slots[uid]) for _x, _m, uid in t.ranked[start:start + int(limit)]]
+
+    # ---------- user prefs ----------
+    async def set_user_lang(self, user_id: int, code: str) -> None:
+        self.ops += 1
+        self.user_langs[user_id] = code
+
+    async def get_user_lang(self, user_id: int) -> Optional[str]:
+        self.ops += 1
+        return self.user_langs.get(user_id)
+
+    # ---------- guild language / channels / meta ----------
+    def _config(self, guild_id: int) -> GuildConfig:
+        g = self.guilds.get(guild_id, {})
+        return DEFAULT_GUILD_CONFIG._replace(channels=frozenset(self.channels.get(guild_id, ())), **g)
+
+    async def load_guild_config(self, guild_id: int) -> GuildConfig:
+        self.ops += 1
+        return self._config(guild_id)
+
+    async def load_guild_configs(self) -> Dict[int, GuildConfig]:
+        self.ops += 1
+        return {gid: self._config(gid) for gid in set(self.guilds) | set(self.channels)}
+
+    def _set(self, guild_id: int, **fields):
+        self.ops += 1
+        self.guilds.setdefault(guild_id, {}).update(fields)
+
+    async def set_server_lang(self, guild_id: int, code: str) -> None:
+        self._set(guild_id, server_lang=code or None)
+
+    async def allow_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        self.ops += 1
+        self.channels.setdefault(guild_id, set()).add(channel_id)
+
+    async def remove_translation_channel(self, guild_id: int, channel_id: int) -> None:
+        self.ops += 1
+        chans = self.channels.get(guild_id)
+        if chans:
+            chans.discard(channel_id)
+            if not chans:
+                del self.channels[guild_id]
+
+    async def set_error_channel(self, guild_id: int, channel_id: Optional[int]) -> None:
+        self._set(guild_id, error_channel=int(channel_id) if channel_id is not None else None)
+
+    async def set_bot_emote(self, guild_id: int, emote: str) -> None:
+        self._set(guild_id, emote=emote or None)
+
+    async def set_speculation(self, guild_id: int, enabled: bool) -> None:
+        self._set(guild_id, speculate=bool(enabled))
+
+    # ---------- level roles ----------
+    async def upsert_role_table(self, guild_id: int, mapping: List[Tuple[int, int, int]]) -> None:
+        self.ops += 1
+        self.roles[guild_id] = [(int(ls), int(le), int(rid)) for ls, le, rid in mapping]
+
+    async def get_role_table(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        self.ops += 1
+        return sorted(self.roles.get(guild_id, ()), key=lambda r: r[0])
+
+    async def delete_role_table(self, guild_id: int) -> int:
+        self.ops += 1
+        return len(self.roles.pop(guild_id, ()))
+
+    # ---------- persistent translation cache ----------
+    async def get_cached_translation(self, key: str, touch_after: int = 3600) -> Optional[Tuple[bytes, Optional[str]]]:
+        self.ops += 1
+        entry = self.translations.get(key)
+        if entry is None:
+            return None
+        now = int(time.time())
+        if now - entry[2] >= touch_after:
+            entry[2] = now
+        return entry[0], entry[1]
+
+    async def put_cached_translation(self, key: str, target: str, model: str, detected: Optional[str],
+                                     value: bytes) -> None:
+        self.ops += 1
+        self.translations[key] = [bytes(value), detected, int(time.time()), target, model]
+
+    async def delete_cached_translation(self, key: str) -> None:
+        self.ops += 1
+        self.translations.pop(key, None)
+
+    async def prune_translation_cache(self, max_bytes: int, max_age: int) -> int:
+        self.ops += 1
+        cutoff = int(time.time()) - int(max_age)
+        drop = [k for k, e in self.translations.items() if e[2] < cutoff]
+        for k in drop:
+            del self.translations[k]
+        running, over = 0, []
+        for k, e in sorted(self.translations.items(), key=lambda kv: (-kv[1][2], kv[0])):
+            running += len(e[0])
+            if running > max_bytes:
+                over.append(k)
+        for k in over:
+            del self.translations[k]
+        return len(drop) + len(over)
@@ -0,0 +1,175 @@
+# utils/trace.py
+# Anonymized gateway traces: record message / reaction / voice-state events, read them back, and
+# synthesize stand-in text so a replay exercises the translation pipeline like the original traffic.
+import asyncio, gzip, json, random, re, time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+from utils.config import TRACE_MAX_EVENTS
+from utils.langdetect import detect
+from utils.language_samples import SEED_TEXT
+from utils.masking import mask
+from utils.segment import split_sentences
+
+VERSION = 1
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+class _Pseudonyms:
+    """Raw value -> 1, 2, 3… in first-seen order. The mapping itself is never written out."""
+    def __init__(self):
+        self._ids: Dict[object, int] = {}
+
+    def __call__(self, raw) -> int:
+        if raw is None:
+            return 0
+        return self._ids.setdefault(raw, len(self._ids) + 1)
+
+    def get(self, raw):
+        return self._ids.get(raw)
+
+class TraceRecorder:
+    """
+    Events as compact JSON arrays, `dt` in ms since the previous event:
+      ["m", dt, guild, channel, author, message, lang, protected, sentences]
+      ["r", dt, guild, channel, user, message, emoji, lang, protected, sentences]
+      ["v", dt, guild, member, channel_before, channel_after]
+    Every id, emoji and sentence becomes a small pseudonym; text is kept only as its detected language,
+    the number of masked spans and [[sentence id, chars], ...] so repeats (whole messages or single
+    sentences) stay repeats. Bot authors, DMs and attachments are not recorded.
+    """
+    def __init__(self, max_events: int = TRACE_MAX_EVENTS, clock=time.monotonic):
+        self.max_events = max_events
+        self.clock = clock
+        self.started_at = datetime.now(timezone.utc)
+        self.events: List[list] = []
+        self.dropped = 0
+        self._last = clock()
+        self._ids, self._emoji, self._sentences = _Pseudonyms(), _Pseudonyms(), _Pseudonyms()
+        self._guilds: Dict[int, int] = {}   # pseudonym -> raw id, for the settings snapshot
+        self._reactors = set()
+
+    @property
+    def full(self) -> bool:
+        return len(self.events) >= self.max_events
+
+    def _dt(self) -> int:
+        now = self.clock()
+        dt = int((now - self._last) * 1000)
+        self._last = now
+        return dt
+
+    def _text(self, text: str) -> list:
+        masked, spans = mask(text or "")
+        guess = detect(masked)
+        sents = [[self._sentences(" ".join(s.casefold().split())), len(s)]
+                 for s, _sep in split_sentences(masked) if s.strip()]
+        return [guess.lang, len(spans), sents]
+
+    def _guild(self, raw: int) -> int:
+        gid = self._ids(raw)
+        self._guilds[gid] = raw
+        return gid
+
+    def _add(self, event: list):
+        if self.full:
+            self.dropped += 1
+            return
+        self.events.append(event)
+
+    def message(self, msg):
+        if msg.author.bot or not msg.guild:
+            return
+        self._add(["m", self._dt(), self._guild(msg.guild.id), self._ids(msg.channel.id),
+                   self._ids(msg.author.id), self._ids(msg.id), *self._text(msg.content)])
+
+    def reaction(self, reaction, user):
+        msg = reaction.message
+        if user.bot or not msg.guild:
+            return
+        self._reactors.add(user.id)
+        self._add(["r", self._dt(), self._guild(msg.guild.id), self._ids(msg.channel.id), self._ids(user.id),
+                   self._ids(msg.id), self._emoji(str(reaction.emoji)), *self._text(msg.content)])
+
+    def voice(self, member, before, after):
+        guild = getattr(member, "guild", None)
+        if member.bot or not guild:
+            return
+        self._add(["v", self._dt(), self._guild(guild.id), self._ids(member.id),
+                   self._ids(getattr(before.channel, "id", None)), self._ids(getattr(after.channel, "id", None))])
+
+    async def _config(self) -> dict:
+        """Settings of the guilds and users seen, so a replay starts from the same configuration."""
+        from utils import database
+        guilds = {}
+        for gid, raw in self._guilds.items():
+            emote = await database.get_bot_emote(raw) or "🔃"
+            guilds[gid] = {
+                "channels": [self._ids(c) for c in (await database.get_translation_channels(raw) or [])],
+                "server_lang": await database.get_server_lang(raw),
+                "emoji": self._emoji.get(emote),   # None: the configured emote was never used
+                "speculate": await database.get_speculation(raw),
+            }
+        users = {}
+        for raw in self._reactors:
+            lang = await database.get_user_lang(raw)
+            if lang:
+                users[self._ids(raw)] = lang
+        return {"guilds": guilds, "users": users}
+
+    async def save(self, path: str) -> int:
+        """
+        Write the trace (gzip'd JSON lines, header first); returns the number of events.
+        The header is read on the loop, the file is written in a worker thread (up to TRACE_MAX_EVENTS
+        lines would otherwise stall the gateway). Stop recording into this recorder first.
+        """
+        header = {"v": VERSION, "started": self.started_at.isoformat(timespec="seconds"),
+                  "events": len(self.events), "dropped": self.dropped, **await self._config()}
+        await asyncio.to_thread(_write_trace, path, header, self.events)
+        return len(self.events)
+
+def _write_trace(path: str, header: dict, events: List[list]):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for e in events:
+            f.write(json.dumps(e, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+def read_trace(path: str) -> Tuple[dict, Iterator[list]]:
+    """(header, events). JSON object keys are strings, so guild/user ids in the header are converted back."""
+    f = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(f.readline())
+    if header.get("v") != VERSION:
+        f.close()
+        raise ValueError(f"unsupported trace version {header.get('v')!r}")
+    header["guilds"] = {int(k): v for k, v in header.get("guilds", {}).items()}
+    header["users"] = {int(k): v for k, v in header.get("users", {}).items()}
+
+    def events():
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    return header, events()
+
+_words_cache: Dict[str, List[str]] = {}
+
+def _words(lang: str) -> List[str]:
+    if lang not in _words_cache:
+        # scripts without seed text fall back to English words: same lengths and repeats, wrong language
+        _words_cache[lang] = _WORD_RE.findall(SEED_TEXT.get(lang, SEED_TEXT["en"]).lower())
+    return _words_cache[lang]
+
+def _sentence(lang: str, sid: int, chars: int) -> str:
+    rng = random.Random(f"{lang}:{sid}")
+    words, out, n = _words(lang), [], 0
+    while n < max(1, chars - 1):
+        w = rng.choice(words)
+        out.append(w)
+        n += len(w) + 1
+    s = " ".join(out)
+    return s[:1].upper() + s[1:] + "."
+
+def synth_text(lang: str, protected: int, sentences: list) -> str:
+    """Deterministic stand-in for a recorded text: same sentence ids give the same sentences."""
+    text = " ".join(_sentence(lang, sid, chars) for sid, chars in sentences)
+    links = " ".join(f"https://example.com/r/{i}" for i in range(protected))
+    return f"{text} {links}".strip()
@@ -0,0 +1,218 @@
+# utils/translation_memory.py
+# Sentence-level translation memory: repeated sentences (rules, greetings, templates) are reused
+# across messages even when the whole text differs.
+import re, zlib
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.config import TM_MAX_ENTRIES, TM_FUZZY, TM_FUZZY_MIN_PCT
+from utils.segment import split_sentences
+from utils.translator import estimate_tokens
+
+# values that are copied verbatim into translations: custom emoji, mentions, URLs, numbers
+_SLOT_RE = re.compile(r"<a?:\w+:\d+>|<[@#][!&]?\d+>|https?://\S+|\d+(?:[.,:]\d+)*")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_WORD_RE = re.compile(r"\w+")
+_SLOT = "\x00"
+
+MAX_SENTENCE_CHARS = 1000
+FUZZY_MIN_CHARS = 20     # shorter sentences only match exactly
+_PERMS = 24              # MinHash signature length
+_BANDS = 6               # LSH bands of _PERMS // _BANDS rows
+_BUCKET_MAX = 32         # candidates kept per LSH bucket
+_VERIFY_MAX = 8          # candidates checked per lookup
+_EMPTY = 1 << 32
+
+def _skeleton(sentence: str) -> Tuple[str, List[str]]:
+    """Case/whitespace-folded sentence with slot values replaced by a marker, plus the values (as written)."""
+    text = " ".join(sentence.split())
+    slots = _SLOT_RE.findall(text)
+    return (_SLOT_RE.sub(_SLOT, text) if slots else text).casefold(), slots
+
+def _signature(skel: str) -> Tuple[int, ...]:
+    """One-permutation MinHash over character trigrams; empty bins borrow from the next filled one."""
+    bins = [_EMPTY] * _PERMS
+    for i in range(max(1, len(skel) - 2)):
+        h = zlib.crc32(skel[i:i + 3].encode("utf-8"))
+        b = h % _PERMS
+        if h < bins[b]:
+            bins[b] = h
+    sig = list(bins)
+    for i in range(_PERMS):
+        step = 1
+        while sig[i] == _EMPTY and step < _PERMS:
+            v = bins[(i + step) % _PERMS]
+            if v != _EMPTY:
+                sig[i] = v + step * _EMPTY
+            step += 1
+    return tuple(sig)
+
+def _bands(sig: Tuple[int, ...]):
+    rows = _PERMS // _BANDS
+    return [(i, sig[i * rows:(i + 1) * rows]) for i in range(_BANDS)]
+
+def _near(a: str, b: str, known=()) -> bool:
+    """
+    Same sentence up to typos: same word count, every changed word is a small edit of the original,
+    and question/exclamation marks agree. Adding or dropping a word ("not") never matches, and
+    neither does a changed word found in `known`: "vote" for "note" is a different sentence, not a typo.
+    """
+    wa, wb = _WORD_RE.findall(a), _WORD_RE.findall(b)
+    if len(wa) != len(wb) or sorted(c for c in a if c in "?!") != sorted(c for c in b if c in "?!"):
+        return False
+    for x, y in zip(wa, wb):
+        if x != y and (min(len(x), len(y)) < 4 or SequenceMatcher(None, x, y).ratio() < 0.75 or x in known):
+            return False
+    return SequenceMatcher(None, a, b).ratio() * 100 >= TM_FUZZY_MIN_PCT
+
+def _fill(translation: str, old: List[str], new: List[str]) -> Optional[str]:
+    """Swap a stored template's slot values for the new ones; None if they can't be placed safely."""
+    if len(old) != len(new):
+        return None
+    swaps = [(o, n) for o, n in zip(old, new) if o != n]
+    for i, (o, _n) in enumerate(swaps):
+        if translation.count(o) != 1:
+            return None
+        translation = translation.replace(o, f"\x01{i}\x01")
+    for i, (_o, n) in enumerate(swaps):
+        translation = translation.replace(f"\x01{i}\x01", n)
+    return translation
+
+def has_letters(sentence: str) -> bool:
+    """Sentences without letters (numbers, masked URLs/code) are passed through, never translated."""
+    return _LETTER_RE.search(sentence) is not None
+
+def covers(segments, hits) -> bool:
+    """True if memory answered at least one sentence with letters; passthrough lines alone don't count."""
+    return any(h is not None and has_letters(s) for (s, _sep), h in zip(segments, hits))
+
+class _Entry:
+    __slots__ = ("skel", "slots", "translation", "detected", "sig")
+
+    def __init__(self, skel, slots, translation, detected, sig):
+        self.skel, self.slots, self.translation, self.detected, self.sig = skel, slots, translation, detected, sig
+
+class TranslationMemory:
+    """
+    match(text, target) splits `text` into sentences and returns, per sentence, a stored translation or None.
+    - exact: same sentence after whitespace/case folding
+    - template: same sentence with different mentions/emoji/URLs/numbers (values are swapped in)
+    - fuzzy (off by default, TM_FUZZY=1): MinHash/LSH candidates over character trigrams, verified as
+      "same sentence up to typos"; a changed word the memory has seen in any learned sentence is a real
+      word, so the sentence goes to the model
+    - sentences without letters pass through untranslated
+    learn(text, target, translated, detected) stores sentence pairs when source and translation split
+    into the same number of sentences. Bounded LRU of `max_entries` sentences; no lock (sync between awaits).
+    """
+    def __init__(self, max_entries: int = TM_MAX_ENTRIES, fuzzy: bool = bool(TM_FUZZY)):
+        self.max_entries = max(1, max_entries)
+        self.fuzzy = fuzzy
+        self.entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()  # (target, skeleton) -> entry
+        self.buckets: Dict[Tuple[str, int, tuple], Set[str]] = {}
+        self.vocab: Counter = Counter()   # words of the stored fuzzy-indexed sentences
+        self.sentences = self.exact = self.template = self.fuzzy_hits = self.passthrough = 0
+        self.tokens_saved = self.learned = self.unaligned = 0
+
+    def match(self, text: str, target: str):
+        """(segments, hits): segments from split_sentences, hits[i] = (translation, detected) or None."""
+        segments = split_sentences(text)
+        hits = [self._lookup(s, target) for s, _sep in segments]
+        return segments, hits
+
+    def _lookup(self, sentence: str, target: str):
+        self.sentences += 1
+        if not _LETTER_RE.search(sentence):
+            self.passthrough += 1
+            return sentence, "unknown"
+        if len(sentence) > MAX_SENTENCE_CHARS:
+            return None
+        skel, slots = _skeleton(sentence)
+        entry = self.entries.get((target, skel))
+        if entry is not None:
+            out = entry.translation if entry.slots == slots else _fill(entry.translation, entry.slots, slots)
+            if out is not None:
+                self.entries.move_to_end((target, skel))
+                if entry.slots == slots:
+                    self.exact += 1
+                else:
+                    self.template += 1
+                self.tokens_saved += estimate_tokens(sentence)
+                return out, entry.detected
+        if self.fuzzy and len(skel) >= FUZZY_MIN_CHARS:
+            entry = self._nearest(target, skel)
+            if entry is not None:
+                out = _fill(entry.translation, entry.slots, slots)
+                if out is not None:
+                    self.fuzzy_hits += 1
+                    self.tokens_saved += estimate_tokens(sentence)
+                    return out, entry.detected
+        return None
+
+    def _nearest(self, target: str, skel: str) -> Optional[_Entry]:
+        votes = Counter()
+        for band in _bands(_signature(skel)):
+            votes.update(self.buckets.get((target,) + band, ()))
+        # sharing a single band is mostly noise; verify the strongest few candidates only
+        for cand, n in votes.most_common(_VERIFY_MAX):
+            if n < 2:
+                break
+            entry = self.entries.get((target, cand))
+            if entry is not None and _near(skel, cand, self.vocab):
+                return entry
+        return None
+
+    def learn(self, text: str, target: str, translated: str, detected: str):
+        src, dst = split_sentences(text), split_sentences(translated)
+        if len(src) != len(dst):
+            if len(src) != 1:
+                self.unaligned += 1
+                return
+            dst = [(translated.strip(), "")]
+        for (s, _a), (t, _b) in zip(src, dst):
+            if _LETTER_RE.search(s) and t.strip():
+                self._put(s, target, t.strip(), detected)
+
+    def _put(self, sentence: str, target: str, translation: str, detected: str):
+        if len(sentence) > MAX_SENTENCE_CHARS:
+            return
+        skel, slots = _skeleton(sentence)
+        key = (target, skel)
+        old = self.entries.pop(key, None)
+        sig = old.sig if old else (_signature(skel) if self.fuzzy and len(skel) >= FUZZY_MIN_CHARS else None)
+        self.entries[key] = _Entry(skel, slots, translation, detected, sig)
+        self.learned += 1
+        if sig is not None and old is None:
+            self.vocab.update(_WORD_RE.findall(skel))
+            for band in _bands(sig):
+                bucket = self.buckets.setdefault((target,) + band, set())
+                if len(bucket) < _BUCKET_MAX:
+                    bucket.add(skel)
+        while len(self.entries) > self.max_entries:
+            (t, s), ev = self.entries.popitem(last=False)
+            if ev.sig is not None:
+                for w in _WORD_RE.findall(s):
+                    self.vocab[w] -= 1
+                    if not self.vocab[w]:
+                        del self.vocab[w]
+                for band in _bands(ev.sig):
+                    bucket = self.buckets.get((t,) + band)
+                    if bucket is not None:
+                        bucket.discard(s)
+                        if not bucket:
+                            del self.buckets[(t,) + band]
+
+    def clear(self):
+        self.entries.clear()
+        self.buckets.clear()
+        self.vocab.clear()
+
+    def stats(self) -> dict:
+        hits = self.exact + self.template + self.fuzzy_hits   # passthrough lines were never the model's
+        return {
+            "entries": len(self.entries), "sentences": self.sentences,
+            "hit_ratio": round(hits / self.sentences, 3) if self.sentences else 0.0,
+            "exact": self.exact, "template": self.template, "fuzzy": self.fuzzy_hits,
+            "passthrough": self.passthrough, "tokens_saved": self.tokens_saved,
+            "learned": self.learned, "unaligned": self.unaligned,
+        }
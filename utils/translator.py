@@ -0,0 +1,224 @@
+# utils/translator.py
+# Async translation engine: one shared keep-alive HTTP pool, bounded concurrency, per-call timeouts.
+import json, asyncio
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from utils.config import (
+    OPENAI_MODEL, OPENAI_BASE_URL,
+    TRANSLATE_CONCURRENCY, TRANSLATE_TIMEOUT, TRANSLATE_POOL_SIZE,
+    TRANSLATE_RETRIES, RETRY_BASE_MS, RETRY_MAX_WAIT, TRANSLATE_HEDGE_PCT, HEDGE_MIN_MS,
+)
+from utils.language_data import is_supported
+from utils.masking import PLACEHOLDER_HINT
+from utils.backends import ChatBackend, OpenAIBackend
+from utils.resilience import CircuitBreaker, backoff, is_transient, retry_after
+
+SYSTEM_PROMPT = ("You are a precise translator. Detect the source language (ISO 639-1) and translate to the requested target. "
+                 + PLACEHOLDER_HINT)
+STREAM_SYSTEM_PROMPT = "You are a precise translator. " + PLACEHOLDER_HINT
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) for budgets and caps."""
+    return len(text or "") // 4 + 1
+
+def parse_reply(raw: str) -> dict:
+    """Best-effort JSON extraction from a model reply."""
+    raw = (raw or "").strip()
+    for candidate in (raw, raw[raw.find("{"):raw.rfind("}") + 1]):
+        try:
+            data = json.loads(candidate)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            return data
+    return {"translated": raw, "detected": "unknown"}
+
+def clean_detected(code) -> str:
+    code = str(code or "unknown").strip().lower()
+    return code if is_supported(code) else "unknown"
+
+class TranslationEngine:
+    """
+    Shared async client for all translation paths (/translate, reactions, context menu).
+    Never blocks the event loop; at most `concurrency` model calls are in flight.
+    Transient errors (timeouts, 429, 5xx) are retried with jittered backoff or the server's Retry-After;
+    repeated failures open a circuit breaker that fails fast (ProviderUnavailable) until a probe succeeds.
+    With `hedge_pct`, a call slower than that latency percentile gets a duplicate; the first answer wins.
+    Calls go to `backend` (utils.backends); without one, an OpenAIBackend is built from api_key/base_url.
+    """
+    def __init__(self, api_key: Optional[str] = None, model: str = OPENAI_MODEL,
+                 base_url: Optional[str] = OPENAI_BASE_URL,
+                 concurrency: int = TRANSLATE_CONCURRENCY, timeout: float = TRANSLATE_TIMEOUT,
+                 pool_size: int = TRANSLATE_POOL_SIZE, retries: int = TRANSLATE_RETRIES,
+                 hedge_pct: int = TRANSLATE_HEDGE_PCT, breaker: Optional[CircuitBreaker] = None,
+                 backend: Optional[ChatBackend] = None):
+        self.model = model
+        self.timeout = float(timeout)
+        self.backend = backend or OpenAIBackend(api_key=api_key, model=model, base_url=base_url,
+                                                timeout=self.timeout, pool_size=pool_size)
+        self.retries = max(0, retries)
+        self.retry_base = RETRY_BASE_MS / 1000.0
+        self.retry_cap = float(RETRY_MAX_WAIT)
+        self.hedge_pct = hedge_pct
+        self.breaker = breaker or CircuitBreaker()
+        self.sem = asyncio.Semaphore(max(1, int(concurrency)))
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = self.retried = self.hedges = self.hedge_wins = 0
+        self.recent = deque(maxlen=200)   # latencies of recent successful calls, for the hedge threshold
+        self._hedge_after = None
+        self._samples = 0
+
+    async def complete(self, system: str, user: str) -> str:
+        """One chat completion with retries, the circuit breaker and (optionally) hedging."""
+        attempt = 0
+        while True:
+            self.breaker.check()
+            try:
+                out = await self._hedged(system, user)
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    self.breaker.success()   # the provider answered; the request itself is bad
+                    raise
+                self.errors += 1
+                self.breaker.failure()
+                wait = retry_after(e)
+                wait = backoff(attempt, self.retry_base, self.retry_cap) if wait is None \
+                    else wait + backoff(0, self.retry_base, self.retry_base)
+                if attempt >= self.retries or wait > self.retry_cap or self.breaker.state == "open":
+                    raise
+                attempt += 1
+                self.retried += 1
+                await asyncio.sleep(wait)
+                continue
+            self.breaker.success()
+            return out
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_pct <= 0 or len(self.recent) < 20:
+            return None
+        if self._hedge_after is None:
+            ordered = sorted(self.recent)
+            self._hedge_after = max(HEDGE_MIN_MS / 1000.0,
+                                    ordered[min(len(ordered) - 1, len(ordered) * self.hedge_pct // 100)])
+        return self._hedge_after
+
+    async def _hedged(self, system: str, user: str) -> str:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._once(system, user)
+        first = asyncio.ensure_future(self._once(system, user))
+        second = None
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done or self.sem.locked():   # answered in time, or no spare capacity to hedge with
+                return await first
+            self.hedges += 1
+            second = asyncio.ensure_future(self._once(system, user))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None:
+                        self.hedge_wins += t is second
+                        return t.result()
+            return await first   # both failed: surface the original error
+        finally:
+            for t in (first, second):
+                if t is not None and not t.done():
+                    t.cancel()
+
+    async def _once(self, system: str, user: str) -> str:
+        """One chat completion under the concurrency limit and a hard timeout."""
+        async with self.sem:
+            self.in_flight += 1
+            self.calls += 1
+            started = asyncio.get_running_loop().time()
+            try:
+                text = await asyncio.wait_for(self.backend.chat(system, user), timeout=self.timeout)
+            finally:
+                self.in_flight -= 1
+            self.recent.append(asyncio.get_running_loop().time() - started)
+            self._samples += 1
+            if self._samples % 16 == 0:
+                self._hedge_after = None
+        return text.strip()
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        """Streamed chat completion: yields content deltas as they arrive. Not retried (output is live)."""
+        self.breaker.check()
+        try:
+            async for delta in self._stream(system, user):
+                yield delta
+        except Exception as e:
+            if is_transient(e):
+                self.errors += 1
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+            raise
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        self.breaker.success()
+
+    async def _stream(self, system: str, user: str) -> AsyncIterator[str]:
+        async with self.sem:
+            self.in_flight += 1
+            self.calls += 1
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout
+            deltas = self.backend.stream(system, user).__aiter__()
+            try:
+                while True:
+                    try:
+                        # the whole stream, not each chunk, must finish within TRANSLATE_TIMEOUT
+                        delta = await asyncio.wait_for(deltas.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                    except StopAsyncIteration:
+                        break
+                    yield delta
+            finally:
+                self.in_flight -= 1
+                await deltas.aclose()
+
+    async def stream_translate(self, text: str, target_lang: str) -> AsyncIterator[str]:
+        """Plain-text translation stream (no JSON wrapper, so partial output is displayable)."""
+        user = (
+            f"Translate the text to {target_lang}. Reply with the translation only, no quotes or notes.\n"
+            f"Text:\n{text}"
+        )
+        async for delta in self.stream(STREAM_SYSTEM_PROMPT, user):
+            yield delta
+
+    async def translate(self, text: str, target_lang: str) -> Tuple[str, str]:
+        user = (
+            "Return STRICT JSON: {\"translated\":\"...\",\"detected\":\"xx\"}\n"
+            f"Target: {target_lang}\nText:\n{text}"
+        )
+        data = parse_reply(await self.complete(SYSTEM_PROMPT, user))
+        return str(data.get("translated", "")).strip(), clean_detected(data.get("detected"))
+
+    async def translate_many(self, text: str, targets: List[str]) -> Tuple[Dict[str, str], str]:
+        """One call for several targets. Returns ({target: translated}, detected); missing targets are omitted."""
+        user = (
+            "Return STRICT JSON: {\"detected\":\"xx\",\"translations\":{\"<target>\":\"...\"}} "
+            "with one entry per target.\n"
+            f"Targets: {', '.join(targets)}\nText:\n{text}"
+        )
+        data = parse_reply(await self.complete(SYSTEM_PROMPT, user))
+        out = data.get("translations")
+        out = out if isinstance(out, dict) else {}
+        return ({t: str(out[t]).strip() for t in targets if isinstance(out.get(t), str)},
+                clean_detected(data.get("detected")))
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "calls": self.calls, "in_flight": self.in_flight, "errors": self.errors,
+                "retried": self.retried, "hedges": self.hedges, "hedge_wins": self.hedge_wins,
+                **{f"breaker_{k}": v for k, v in self.breaker.stats().items()}}
+
+    async def close(self):
+        await self.backend.close()
@@ -0,0 +1,122 @@
+# utils/xp_aggregator.py
+# Write-behind XP: per-(guild, user) deltas collected in memory, flushed in one transaction.
+import asyncio, time
+from typing import Dict, List, Tuple
+
+from utils import database
+from utils.config import XP_FLUSH_SECONDS, XP_FLUSH_MAX, RANK_INDEX_GUILDS
+from utils.rank_index import GuildRanks, RankIndex
+
+_FIELDS = 4   # xp, messages, translations, voice_seconds (the xp table's order)
+
+class XPAggregator:
+    """
+    add() is synchronous and O(1); every `interval` seconds, or once `max_pending` users have deltas,
+    everything is written with one executemany UPSERT in one transaction. A failed flush keeps its
+    deltas for the next one. get_xp() adds unflushed deltas to what is on disk and leaderboard()
+    flushes first, so reads are exact. Up to `interval` seconds of XP is lost on a hard crash;
+    cogs flush on unload and bot.py on shutdown.
+    """
+    def __init__(self, interval: float = XP_FLUSH_SECONDS, max_pending: int = XP_FLUSH_MAX):
+        self.interval = interval
+        self.max_pending = max(1, max_pending)
+        self.pending: Dict[Tuple[int, int], List[int]] = {}
+        self.ranks = GuildRanks(RANK_INDEX_GUILDS)   # kept in step with every committed flush
+        self._lock = asyncio.Lock()
+        self._loop_task = None
+        self._size_flush = None
+        self.flushes = self.rows = self.errors = 0
+        self.last_flush_ms = 0.0
+
+    def add(self, guild_id: int, user_id: int, xp: int = 0, messages: int = 0,
+            translations: int = 0, voice_seconds: int = 0):
+        d = self.pending.get((guild_id, user_id))
+        if d is None:
+            d = self.pending[(guild_id, user_id)] = [0] * _FIELDS
+        d[0] += max(0, int(xp))
+        d[1] += messages
+        d[2] += translations
+        d[3] += max(0, int(voice_seconds))
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+        if len(self.pending) >= self.max_pending and (self._size_flush is None or self._size_flush.done()):
+            self._size_flush = asyncio.create_task(self.flush())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass   # counted and retried by flush()
+
+    async def flush(self) -> int:
+        """Write all pending deltas now; returns the number of rows written."""
+        async with self._lock:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, {}
+            t0 = time.perf_counter()
+            try:
+                await database.apply_xp_deltas([(g, u, *d) for (g, u), d in batch.items()])
+            except Exception as e:
+                self.errors += 1
+                for key, d in batch.items():   # keep them for the next flush
+                    cur = self.pending.setdefault(key, [0] * _FIELDS)
+                    for i in range(_FIELDS):
+                        cur[i] += d[i]
+                print(f"[xp] flush of {len(batch)} rows failed: {e}")
+                raise
+            self.ranks.apply((g, u, d[0], d[1]) for (g, u), d in batch.items())
+            self.flushes += 1
+            self.rows += len(batch)
+            self.last_flush_ms = round((time.perf_counter() - t0) * 1000, 1)
+            return len(batch)
+
+    async def close(self):
+        """Stop the timer and flush what is left (cog unload / shutdown)."""
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
+        await self.flush()
+
+    # ---------- exact reads ----------
+    async def get_xp(self, guild_id: int, user_id: int) -> Tuple[int, int, int, int]:
+        async with self._lock:
+            row = await database.get_xp(guild_id, user_id)
+            d = self.pending.get((guild_id, user_id))
+        return tuple(a + b for a, b in zip(row, d)) if d else row
+
+    async def leaderboard(self, guild_id: int, limit: int = 10, after=None):
+        """
+        database.get_xp_leaderboard after writing this guild's pending deltas, so ranks are exact and
+        keyset cursors stay valid. Only flushes when the guild has something pending.
+        """
+        if any(g == guild_id for g, _u in self.pending):
+            await self.flush()
+        return await database.get_xp_leaderboard(guild_id, limit=limit, after=after)
+
+    async def rank(self, guild_id: int, user_id: int):
+        """
+        (rank, members, percentile) of a member, or None if they have no XP yet. Pending deltas for the
+        guild are flushed first; the guild's index is built from the xp table on first use (under the
+        flush lock, so no flush lands between the read and the build).
+        """
+        if any(g == guild_id for g, _u in self.pending):
+            await self.flush()
+        idx = self.ranks.get(guild_id)
+        if idx is None:
+            async with self._lock:
+                idx = self.ranks.get(guild_id)
+                if idx is None:
+                    rows = await database.get_rank_rows(guild_id)
+                    idx = self.ranks.put(guild_id, await asyncio.to_thread(RankIndex, rows))   # ~1 s per 1M members
+        found = idx.rank(user_id)
+        return None if found is None else (*found, idx.percentile(user_id))
+
+    def stats(self) -> dict:
+        return {"pending": len(self.pending), "flushes": self.flushes, "rows": self.rows,
+                "errors": self.errors, "last_flush_ms": self.last_flush_ms, "rank_index": self.ranks.stats()}
+
+# shared by Events, Translate and XPSystem; module-level so it survives cog reloads
+xp_aggregator = XPAggregator()